@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+GENCAD Parser Benchmark
+
+This script measures gencad_parser.py stage by stage on synthetic boards
+written by generate_gencad.py, and checks that the parser still reproduces
+the NIOKR_*.csv and NIOKR2_*.csv files in this directory byte for byte
+(line endings aside).
+
+The stages are section extraction, parsing of each eagerly parsed section,
+pin placement, every export_* method and export_all, which writes the
+same files in one pass (as bench_all_*). Wall and CPU time come from a
+plain run; the peak of traced Python allocations of each stage comes from a
+second run under tracemalloc, which would otherwise distort the timings.
+Results are written as JSON so that revisions can be compared.
+
+Usage:
+    python benchmark_gencad.py [--sizes 100 10000 ...] [--output benchmark.json]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import subprocess
+from collections import defaultdict
+
+from gencad import get_numpy, process_file
+from gencad.parser import DEFAULT_EXPORT_FORMATS, EAGER_SECTIONS, TOPOLOGIES, GencadParser
+from generate_gencad import generate_file
+
+logger = logging.getLogger("GencadBenchmark")
+
+DEFAULT_SIZES = (100, 1000, 10000, 100000)
+
+# Reference boards and the outputs committed for them, relative to this directory
+REFERENCE_BOARDS = (
+    ('NIOKR.cad', 'NIOKR'),
+    (os.path.join(os.pardir, 'NIOKR2.cad'), 'NIOKR2'),
+)
+REFERENCE_OUTPUTS = ('pins', 'connections', 'netlist', 'board_outline', 'houdini')
+
+
+def benchmark_stages(path, workdir, topology='all-pairs'):
+    """
+    Build the benchmarked stages for one GENCAD file.
+
+    The stages share one parser and must run in order.
+
+    Args:
+        path (str): GENCAD file
+        workdir (str): Directory for the exported files
+        topology (str): Connection topology for the connection exports
+
+    Returns:
+        tuple: (parser, list of (stage name, callable))
+    """
+    parser = GencadParser(path, cache=None)
+    sections = defaultdict(list)
+    handlers = parser._section_handlers()
+
+    def extract():
+        with open(path, 'rb') as file:
+            for section, line in parser._iter_sections(file, EAGER_SECTIONS):
+                sections[section].append(line)
+
+    def parse_section(section):
+        table, fallback = handlers[section]
+        parser._current_name = None
+        parser._dispatch_lines(sections.pop(section, ()), table, fallback)
+
+    def output(suffix):
+        return os.path.join(workdir, f"bench_{suffix}")
+
+    stages = [('extract_sections', extract)]
+    stages.extend((f"parse_{section.lower()}", lambda section=section: parse_section(section))
+                  for section in EAGER_SECTIONS)
+    stages.append(('place_pins', parser._calculate_pin_positions))
+    stages.extend([
+        ('export_to_csv', lambda: parser.export_to_csv(output('pins.csv'))),
+        ('export_connections_to_csv',
+         lambda: parser.export_connections_to_csv(output('connections.csv'), topology=topology)),
+        ('export_netlist_to_csv', lambda: parser.export_netlist_to_csv(output('netlist.csv'))),
+        ('export_board_outline_to_csv', lambda: parser.export_board_outline_to_csv(output('board_outline.csv'))),
+        ('export_outline_loops_to_csv', lambda: parser.export_outline_loops_to_csv(output('outline_loops.csv'))),
+        ('export_houdini_csv', lambda: parser.export_houdini_csv(output('houdini.csv'))),
+        ('export_houdini_ply', lambda: parser.export_houdini_ply(output('houdini.ply'), topology=topology)),
+    ])
+    formats = DEFAULT_EXPORT_FORMATS + ('ply',)
+    if get_numpy() is not None:
+        stages.append(('export_npz', lambda: parser.export_npz(output('houdini.npz'), topology=topology)))
+        formats += ('npz',)
+    stages.append(('export_all', lambda: parser.export_all(workdir, 'bench_all', formats, topology=topology)))
+    return parser, stages
+
+
+def run_benchmark(path, workdir, topology='all-pairs', memory=True):
+    """
+    Time every stage on one GENCAD file, and optionally measure its memory.
+
+    Args:
+        path (str): GENCAD file
+        workdir (str): Directory for the exported files
+        topology (str): Connection topology for the connection exports
+        memory (bool): Also measure the traced peak memory of every stage
+
+    Returns:
+        dict: Pin/net/component counts, file size and per-stage measurements
+        (wall and cpu in seconds, peak_bytes when memory is measured)
+    """
+    parser, stages = benchmark_stages(path, workdir, topology)
+    results = {}
+    for name, stage in stages:
+        wall, cpu = time.perf_counter(), time.process_time()
+        stage()
+        results[name] = {
+            'wall': time.perf_counter() - wall,
+            'cpu': time.process_time() - cpu
+        }
+
+    run = {
+        'file': path,
+        'file_bytes': os.path.getsize(path),
+        'pins': len(parser.pins),
+        'nets': len(parser.signals),
+        'components': len(parser.components),
+        'transform_cache_hits': parser.transform_cache.hits,
+        'transform_cache_misses': parser.transform_cache.misses,
+        'stages': results,
+        'total_wall': sum(result['wall'] for result in results.values())
+    }
+    del parser, stages
+
+    if memory:
+        parser, stages = benchmark_stages(path, workdir, topology)
+        tracemalloc.start()
+        try:
+            for name, stage in stages:
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                stage()
+                current, peak = tracemalloc.get_traced_memory()
+                results[name]['peak_bytes'] = peak - before
+                results[name]['retained_bytes'] = current - before
+        finally:
+            tracemalloc.stop()
+    return run
+
+
+def check_reference_outputs(directory):
+    """
+    Parse the reference boards and compare the outputs with the committed CSV files.
+
+    Line endings are normalized before comparing, since the committed files
+    may have been checked out with LF while the csv module writes CRLF.
+
+    Args:
+        directory (str): Directory containing the committed NIOKR_*.csv files
+
+    Returns:
+        dict: Output file name -> 'ok', 'differs' or 'missing'
+    """
+    results = {}
+    workdir = tempfile.mkdtemp(prefix='gencad_regress_')
+    try:
+        for board, base_name in REFERENCE_BOARDS:
+            source = os.path.join(directory, board)
+            if not os.path.isfile(source):
+                logger.warning(f"Reference board not found: {source}")
+                continue
+            copy = os.path.join(workdir, f"{base_name}.cad")
+            shutil.copyfile(source, copy)
+            summary = process_file(copy)
+            if summary['error']:
+                raise RuntimeError(f"Parsing {source} failed: {summary['error']}")
+
+            for suffix in REFERENCE_OUTPUTS:
+                name = f"{base_name}_{suffix}.csv"
+                expected = os.path.join(directory, name)
+                if not os.path.isfile(expected):
+                    results[name] = 'missing'
+                    continue
+                with open(expected, 'rb') as a, open(os.path.join(workdir, name), 'rb') as b:
+                    same = a.read().replace(b'\r\n', b'\n') == b.read().replace(b'\r\n', b'\n')
+                results[name] = 'ok' if same else 'differs'
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def _revision(directory):
+    """
+    Get the git revision of the working tree, if available.
+
+    Args:
+        directory (str): Directory inside the repository
+
+    Returns:
+        str: Commit hash with a -dirty suffix for modified trees, or None
+    """
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=directory, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    """
+    Main function to run the benchmark.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark gencad_parser.py on synthetic boards.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help='Approximate pin counts of the synthetic boards (default: %(default)s)')
+    parser.add_argument('--output', default='benchmark.json', help='JSON results file (default: %(default)s)')
+    parser.add_argument('--topology', choices=TOPOLOGIES, default='all-pairs',
+                        help='Connection topology of the connection exports (default: %(default)s)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed of the generator (default: %(default)s)')
+    parser.add_argument('--no-memory', action='store_true', help='Only measure time, skip the tracemalloc run')
+    parser.add_argument('--no-regress', action='store_true',
+                        help='Skip the comparison with the committed NIOKR_*.csv files')
+    parser.add_argument('--workdir', help='Keep the generated boards and exports in this directory')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    # The parser logs every export; keep the benchmark output readable
+    logging.getLogger("GencadParser").setLevel(logging.WARNING)
+
+    directory = os.path.dirname(os.path.abspath(__file__))
+    np = get_numpy()
+    results = {
+        'revision': _revision(directory),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__ if np is not None else None,
+        'platform': platform.platform(),
+        'topology': args.topology,
+        'regression': None,
+        'runs': []
+    }
+
+    failed = False
+    if not args.no_regress:
+        results['regression'] = check_reference_outputs(directory)
+        for name, status in results['regression'].items():
+            print(f"{status:8} {name}")
+        failed = any(status != 'ok' for status in results['regression'].values())
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='gencad_bench_')
+    os.makedirs(workdir, exist_ok=True)
+    try:
+        for size in args.sizes:
+            path = os.path.join(workdir, f"synthetic_{size}.cad")
+            generate_file(path, size, seed=args.seed)
+            run = run_benchmark(path, workdir, args.topology, memory=not args.no_memory)
+            run['requested_pins'] = size
+            results['runs'].append(run)
+
+            print(f"\n{run['pins']} pins, {run['nets']} nets, {run['components']} components, "
+                  f"{run['file_bytes']} bytes: {run['total_wall']:.3f}s")
+            for name, stage in run['stages'].items():
+                peak = f"{stage['peak_bytes'] / (1024 * 1024):10.2f} MiB" if 'peak_bytes' in stage else ""
+                print(f"  {name:30} {stage['wall']:9.4f}s {stage['cpu']:9.4f}s cpu {peak}")
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(args.output, 'w') as out:
+        json.dump(results, out, indent=2)
+    print(f"\nResults written to {args.output}")
+    if failed:
+        print("Outputs differ from the committed NIOKR_*.csv files")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
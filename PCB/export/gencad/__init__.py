@@ -0,0 +1,147 @@
+"""
+GENCAD Parser
+
+Library for reading GENCAD files (.cad): pin placements, names and
+connections, the board outline and the remaining sections on demand.
+Specctra DSN files (.dsn) are read into the same model by DsnParser.
+    
+    import gencad
+    board = gencad.load("NIOKR.cad")
+    board.get_pin("L-D3", "1")
+
+Importing the package has no side effects (in particular it does not
+configure logging) and only imports a submodule when one of its names is
+first used. The command line tool lives in gencad.cli and runs with
+python -m gencad or the gencad_parser.py script.
+"""
+
+import importlib
+
+# Public name -> submodule defining it, imported on first access
+_EXPORTS = {
+    'GencadParser': 'parser',
+    'Board': 'parser',
+    'TOPOLOGIES': 'parser',
+    'EAGER_SECTIONS': 'parser',
+    'LAZY_SECTIONS': 'parser',
+    'CACHED_SECTIONS': 'parser',
+    'EXPORT_FORMATS': 'parser',
+    'DEFAULT_EXPORT_FORMATS': 'parser',
+    'DsnParser': 'dsn',
+    'DSN_EXTENSIONS': 'dsn',
+    'parser_class': 'dsn',
+    'DxfWriter': 'dxf',
+    'DXF_VERSIONS': 'dxf',
+    'dxf_layer_name': 'dxf',
+    'diff_boards': 'diff',
+    'diff_files': 'diff',
+    'export_diff_csv': 'diff',
+    'export_delta_houdini_csv': 'diff',
+    'export_delta_ply': 'diff',
+    'COMPONENT_CHANGES': 'diff',
+    'PIN_CHANGES': 'diff',
+    'NET_CHANGES': 'diff',
+    'DEFAULT_DIFF_TOLERANCE': 'diff',
+    'net_metrics': 'metrics',
+    'NET_METRIC_FIELDS': 'metrics',
+    'cross_check': 'fabcheck',
+    'export_fab_check': 'fabcheck',
+    'find_fab_files': 'fabcheck',
+    'read_excellon': 'fabcheck',
+    'read_gerber': 'fabcheck',
+    'gerber_side': 'fabcheck',
+    'DEFAULT_FAB_TOLERANCE': 'fabcheck',
+    'FAB_STATUSES': 'fabcheck',
+    'ParseCache': 'cache',
+    'TransformCache': 'cache',
+    'DEFAULT_CACHE_SIZE': 'cache',
+    'DEFAULT_TRANSFORM_CACHE_SIZE': 'cache',
+    'Profiler': 'profiling',
+    'PinRow': 'pins',
+    'PinTable': 'pins',
+    'PinSpatialIndex': 'pins',
+    'PinStage': 'stages',
+    'SwapDiodePins': 'stages',
+    'RemapLayers': 'stages',
+    'OffsetPins': 'stages',
+    'ExcludeComponents': 'stages',
+    'PinPipeline': 'stages',
+    'PIN_STAGES': 'stages',
+    'make_stage': 'stages',
+    'parse_stage': 'stages',
+    'load_stages': 'stages',
+    'default_stages': 'stages',
+    'applied_stages_path': 'stages',
+    'read_applied_stages': 'stages',
+    'MM_PER_UNIT': 'geometry',
+    'NM_PER_UNIT': 'geometry',
+    'nm_per_unit': 'geometry',
+    'USER_UNITS': 'geometry',
+    'euclidean_mst': 'geometry',
+    'nearest_neighbour_chain': 'geometry',
+    'tessellate_arc': 'geometry',
+    'tessellate_circle': 'geometry',
+    'chain_segments': 'geometry',
+    'polygon_area': 'geometry',
+    'point_in_polygon': 'geometry',
+    'simplify_polyline': 'geometry',
+    'expand_input_files': 'batch',
+    'process_file': 'batch',
+    'print_summary': 'batch',
+    'write_profile': 'batch',
+    'watch': 'batch',
+    'RowWriter': 'writers',
+    'get_numpy': '_numpy',
+}
+
+__all__ = ['load'] + list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+def load(path, cache=None, sections=None, stages=None, profiler=None, output_units=None):
+    """
+    Parse a GENCAD file, or a Specctra DSN file (.dsn) with DsnParser.
+    
+    Args:
+        path (str): Path to the GENCAD or DSN file
+        cache: ParseCache to reuse parsed sections, True for one in the default
+            directory, or None/False to always parse
+        sections (iterable): Sections to parse (default: EAGER_SECTIONS), e.g.
+            ('HEADER', 'BOARD') for the outline only; GENCAD files only
+        stages (list): PinStage objects applied to the placed pins (default: the
+            L-D* diode swap for GENCAD files, none for DSN files)
+        profiler (Profiler): Profiler to report stages and counters to
+        output_units (str): Units of the pin coordinates and of all exports,
+            a key of MM_PER_UNIT (default: the units of the file)
+    
+    Returns:
+        Board: The parsed board
+    
+    Raises:
+        FileNotFoundError: If the file is not found
+        ValueError: If a section name or the output units are unknown or a DSN file is malformed
+    """
+    from .dsn import DsnParser, parser_class
+    if cache is True:
+        from .cache import ParseCache
+        cache = ParseCache()
+    cls = parser_class(path)
+    if cls is DsnParser:
+        board = DsnParser(path, stages=stages, profiler=profiler, output_units=output_units)
+    else:
+        board = cls(path, cache=cache or None, stages=stages, profiler=profiler, sections=sections,
+                    output_units=output_units)
+    board.parse()
+    return board
@@ -0,0 +1,7 @@
+"""
+Run the GENCAD parser command line tool with python -m gencad.
+"""
+
+from .cli import main
+
+main()
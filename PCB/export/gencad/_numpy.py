@@ -0,0 +1,28 @@
+"""
+Lazy access to the optional NumPy dependency.
+
+Importing NumPy takes longer than parsing a typical board, so the modules
+of this package only import it, through get_numpy(), on code paths that are
+large enough to benefit from it.
+"""
+
+_numpy = None
+_imported = False
+
+
+def get_numpy():
+    """
+    Import NumPy on first use.
+    
+    Returns:
+        module: The numpy module, or None if it is not installed
+    """
+    global _numpy, _imported
+    if not _imported:
+        try:
+            import numpy
+        except ImportError:  # NumPy is optional; every caller has a pure Python fallback
+            numpy = None
+        _numpy = numpy
+        _imported = True
+    return _numpy
@@ -0,0 +1,294 @@
+"""
+Batch processing: the <base>_*.csv output set of one file, profiles and watch mode.
+"""
+
+import os
+import sys
+import json
+import glob
+import time
+import hashlib
+import logging
+
+from ._numpy import get_numpy
+from .dsn import parser_class
+from .fabcheck import DEFAULT_FAB_TOLERANCE, FAB_STATUSES, export_fab_check
+from .parser import DEFAULT_EXPORT_FORMATS, EXPORT_FORMATS
+from .profiling import Profiler
+from .stages import applied_stages_path
+
+logger = logging.getLogger("GencadParser")
+
+
+def expand_input_files(patterns):
+    """
+    Expand glob patterns in the list of input files.
+    
+    Arguments without glob characters are kept as they are, so missing files
+    are still reported. Duplicates are dropped, keeping the first occurrence.
+    
+    Args:
+        patterns (list): File paths and/or glob patterns
+    
+    Returns:
+        list: Input file paths
+    """
+    files = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern))
+            if not matches:
+                logger.warning(f"No files match {pattern}")
+            files.extend(matches)
+        else:
+            files.append(pattern)
+    return list(dict.fromkeys(files))
+
+
+def process_file(input_file, topology='all-pairs', binary=(), cache=None, clearance=None, simplify=None,
+                 stages=None, profile=False, profile_memory=True, cprofile=False, threads=False, drill_files=(),
+                 copper_files=(), fab_tolerance=DEFAULT_FAB_TOLERANCE, dxf=None, net_metrics=False,
+                 houdini_schema='connections', units=None):
+    """
+    Parse one GENCAD or DSN file and write its <base>_*.csv output set next to it.
+    
+    This is the unit of work of the batch mode and runs in worker processes,
+    so it reports errors in the returned summary instead of raising.
+    
+    Args:
+        input_file (str): Path to the GENCAD file, or a Specctra DSN file (.dsn)
+        topology (str): Connection topology per net, see GencadParser.iter_connections
+        binary (tuple): Binary formats to write in addition to the CSVs ('ply', 'npz')
+        cache (ParseCache): Parse cache, or None to always parse
+        clearance (float): Also export pin pairs on different nets closer than
+            this distance (output units) to <base>_clearance.csv
+        simplify (float): Douglas-Peucker tolerance (output units) for the outline loops, or None
+        stages (list): PinStage objects applied before export (default: default_stages()
+            for GENCAD files, none for DSN files); every call counts with fresh copies,
+            so repeated runs from watch or a batch do not accumulate
+        profile (bool): Measure every parse and export stage, see Profiler
+        profile_memory (bool): Trace peak memory per stage when profiling
+        cprofile (bool): Also run cProfile when profiling
+        threads (bool): Write the CSV files on background threads, see GencadParser.export_all
+        drill_files (tuple): Excellon files to cross-check the pins against
+        copper_files (tuple): Copper Gerber files to cross-check the pins against; with
+            either, the mismatches are written to <base>_fab_check.csv
+        fab_tolerance (float): Maximum pin to drill hit/pad distance in mm
+        dxf (str): Also write <base>_board.dxf in this DXF version ('R12' or 'R2000'), or None
+        net_metrics (bool): Also write the per-net wirelength metrics to <base>_net_metrics.csv
+        houdini_schema (str): 'connections' for <base>_houdini.csv with per-pin connection
+            lists, 'net' for the net-indexed <base>_houdini_net_pins.csv and
+            <base>_houdini_nets.csv instead, or 'both'
+        units (str): Units of all outputs, a key of MM_PER_UNIT (default: the units of the file)
+    
+    Returns:
+        dict: Summary with the file, pin/net/component counts, output paths
+        (all and rewritten), transform cache hits/misses, parse/export/total
+        times in seconds, the fab check counts or None, the net metrics
+        totals or None, an error message or
+        None, and the counters (and with profile, the stage measurements) of
+        Profiler.results()
+    """
+    summary = {
+        'file': input_file, 'pins': 0, 'nets': 0, 'components': 0, 'outputs': [],
+        'changed_outputs': [], 'transform_cache_hits': 0, 'transform_cache_misses': 0,
+        'parse_time': 0.0, 'export_time': 0.0, 'total_time': 0.0, 'fab_check': None, 'net_metrics': None,
+        'error': None, 'profile': None
+    }
+    start = time.perf_counter()
+    profiler = Profiler(enabled=profile, memory=profile_memory, cprofile=cprofile)
+    profiler.start()
+    
+    def export(method, *args, **kwargs):
+        with profiler.stage(method.__name__):
+            method(*args, **kwargs)
+    
+    try:
+        # Output file paths
+        output_dir = os.path.dirname(os.path.abspath(input_file))
+        base_name = os.path.splitext(os.path.basename(input_file))[0]
+        
+        logger.info(f"Starting GENCAD parser for file: {input_file}")
+        
+        # Check if input file exists
+        if not os.path.isfile(input_file):
+            logger.error(f"Input file not found: {input_file}")
+            summary['error'] = f"Input file not found: {input_file}"
+            return summary
+        
+        # Stage counts must not carry over from earlier runs (watch, sequential batches)
+        if stages is not None:
+            stages = [stage.fresh() for stage in stages]
+        
+        # Parse the GENCAD or DSN file
+        parser = parser_class(input_file)(input_file, cache=cache, stages=stages, profiler=profiler,
+                                          output_units=units)
+        parser.parse()
+        summary['parse_time'] = time.perf_counter() - start
+        summary['pins'] = len(parser.pins)
+        summary['nets'] = len(parser.signals)
+        summary['components'] = len(parser.components)
+        summary['transform_cache_hits'] = parser.transform_cache.hits
+        summary['transform_cache_misses'] = parser.transform_cache.misses
+        
+        # Export data to CSV files
+        export_start = time.perf_counter()
+        formats = DEFAULT_EXPORT_FORMATS + tuple(fmt for fmt in ('ply', 'npz') if fmt in binary)
+        if houdini_schema == 'net':
+            formats = tuple(fmt for fmt in formats if fmt != 'houdini')
+        if houdini_schema in ('net', 'both'):
+            formats += ('houdini_net_pins', 'houdini_nets')
+        if dxf:
+            formats += ('dxf',)
+        with profiler.stage('export_all'):
+            paths = parser.export_all(output_dir, base_name, formats, topology=topology, simplify=simplify,
+                                      threads=threads, dxf_version=dxf or 'R2000')
+        outputs = list(paths.values())
+        outputs += [applied_stages_path(paths[fmt]) for fmt in ('houdini', 'houdini_net_pins') if fmt in paths]
+        
+        if clearance is not None:
+            outputs.append(os.path.join(output_dir, f"{base_name}_clearance.csv"))
+            export(parser.export_clearance_violations_to_csv, outputs[-1], clearance)
+        if net_metrics:
+            outputs.append(os.path.join(output_dir, f"{base_name}_{EXPORT_FORMATS['net_metrics']}"))
+            summary['net_metrics'] = parser.export_net_metrics_csv(outputs[-1])
+        if drill_files or copper_files:
+            outputs.append(os.path.join(output_dir, f"{base_name}_fab_check.csv"))
+            with profiler.stage('export_fab_check'):
+                summary['fab_check'] = export_fab_check(parser, outputs[-1], drill_files, copper_files,
+                                                        fab_tolerance)
+        
+        summary['outputs'] = outputs
+        summary['changed_outputs'] = parser.changed_outputs
+        summary['export_time'] = time.perf_counter() - export_start
+        profiler.count('outputs_changed', len(parser.changed_outputs))
+        logger.info(f"GENCAD parsing completed successfully for {input_file}")
+    except Exception as e:
+        logger.error(f"Error processing {input_file}: {str(e)}", exc_info=True)
+        summary['error'] = str(e)
+    finally:
+        profiler.stop()
+        summary['total_time'] = time.perf_counter() - start
+        summary['profile'] = profiler.results()
+    
+    return summary
+
+
+def print_summary(summary):
+    """
+    Print the result of process_file for one input file.
+    
+    Args:
+        summary (dict): Summary returned by process_file
+    """
+    if summary['error']:
+        print(f"Error: {summary['file']}: {summary['error']}")
+        return
+    print(f"{summary['file']}: {summary['pins']} pins, {summary['nets']} nets, "
+          f"{summary['components']} components "
+          f"(parse {summary['parse_time']:.3f}s, export {summary['export_time']:.3f}s, "
+          f"total {summary['total_time']:.3f}s)")
+    print(f"Transform cache: {summary['transform_cache_hits']} hits, "
+          f"{summary['transform_cache_misses']} misses")
+    fab_check = summary.get('fab_check')
+    if fab_check:
+        print(f"Fab check: {fab_check.get('ok', 0)} of {fab_check.get('checked', 0)} checked pins matched, "
+              + ", ".join(f"{fab_check.get(status, 0)} {status}" for status in FAB_STATUSES))
+    metrics = summary.get('net_metrics')
+    if metrics:
+        print(f"Net metrics: {metrics['nets']} nets ({metrics['routed_nets']} with 2+ pins, "
+              f"{metrics['multi_layer_nets']} on several layers), HPWL {metrics['hpwl']:.4f}, "
+              f"MST length {metrics['mst_length']:.4f}")
+    changed = set(summary['changed_outputs'])
+    print("Output files: \n" + "\n".join(
+        f"- {path}" + ("" if path in changed else " (unchanged)") for path in summary['outputs']
+    ))
+
+
+def write_profile(path, summaries):
+    """
+    Write the profiles of process_file runs to a JSON file.
+    
+    Args:
+        path (str): Output path
+        summaries (list): Summaries returned by process_file with profile=True
+    """
+    files = []
+    for summary in summaries:
+        profile = summary['profile'] or {}
+        files.append({
+            'file': summary['file'],
+            'error': summary['error'],
+            'parse_time': summary['parse_time'],
+            'export_time': summary['export_time'],
+            'total_time': summary['total_time'],
+            **profile
+        })
+    np = get_numpy()
+    with open(path, 'w') as out:
+        json.dump({'python': sys.version.split()[0], 'numpy': np.__version__ if np is not None else None,
+                   'files': files}, out, indent=2)
+
+
+def _file_digest(path):
+    """
+    Hash the content of a file.
+    
+    Args:
+        path (str): File path
+    
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.blake2b()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def watch(input_files, interval=1.0, **options):
+    """
+    Re-export input files whenever their content changes, until interrupted.
+    
+    Files are polled with os.stat every interval seconds. A change is only
+    processed once the file's size and modification time have stayed the
+    same for one more poll (so a file still being written by KiCad is not
+    parsed), and only if the content hash differs from the last run.
+    Outputs are written atomically and only when their content changed.
+    
+    Args:
+        input_files (list): Paths of the GENCAD files to watch
+        interval (float): Polling interval in seconds
+        **options: Keyword arguments passed on to process_file
+    """
+    processed = {}  # path -> (stat key, content digest) of the last run
+    pending = {}  # path -> stat key seen on the previous poll
+    
+    print(f"Watching {len(input_files)} file(s), press Ctrl+C to stop")
+    try:
+        while True:
+            for input_file in input_files:
+                try:
+                    stat = os.stat(input_file)
+                except OSError:
+                    continue
+                stat_key = (stat.st_mtime_ns, stat.st_size)
+                last = processed.get(input_file)
+                if last is not None and last[0] == stat_key:
+                    continue
+                if last is not None and pending.get(input_file) != stat_key:
+                    # Changed since the previous poll: wait for it to settle
+                    pending[input_file] = stat_key
+                    continue
+                
+                pending.pop(input_file, None)
+                digest = _file_digest(input_file)
+                processed[input_file] = (stat_key, digest)
+                if last is not None and last[1] == digest:
+                    logger.info(f"{input_file} was touched but its content is unchanged")
+                    continue
+                print_summary(process_file(input_file, **options))
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("Stopped watching")
@@ -0,0 +1,202 @@
+"""
+Caches: parsed GENCAD sections on disk and transformed shapes in memory.
+"""
+
+import os
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger("GencadParser")
+
+# Bump whenever the parsed form of a cached section changes
+CACHE_VERSION = 2
+
+DEFAULT_CACHE_SIZE = 64 * 1024 * 1024
+
+
+class ParseCache:
+    """
+    On-disk cache of parsed GENCAD sections keyed by a hash of their content.
+    
+    Each entry is one pickled section result. Entries are touched when they
+    are reused, and the least recently used ones are evicted once the cache
+    directory grows past max_bytes. hashlib and pickle are imported on first
+    use, so importing the parser stays cheap when no cache is configured.
+    
+    Attributes:
+        directory (str): Cache directory
+        max_bytes (int): Size limit of the cache directory
+        hits (int): Number of sections restored from the cache
+        misses (int): Number of sections that had to be parsed
+    """
+    
+    def __init__(self, directory=None, max_bytes=DEFAULT_CACHE_SIZE):
+        """
+        Initialize the parse cache.
+        
+        Args:
+            directory (str): Cache directory (default: $XDG_CACHE_HOME/gencad_parser
+                or ~/.cache/gencad_parser)
+            max_bytes (int): Size limit of the cache directory
+        """
+        if directory is None:
+            base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+            directory = os.path.join(base, 'gencad_parser')
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+    
+    def key(self, section, lines):
+        """
+        Compute the cache key of a section.
+        
+        Args:
+            section (str): Section name
+            lines (list): Stripped, non-empty lines of the section
+            
+        Returns:
+            str: Cache key
+        """
+        import hashlib
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"{CACHE_VERSION}:{section}\n".encode())
+        digest.update("\n".join(lines).encode())
+        return f"{section.lower()}-{digest.hexdigest()}"
+    
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.pickle')
+    
+    def load(self, key):
+        """
+        Load a cached section result.
+        
+        Args:
+            key (str): Cache key
+            
+        Returns:
+            The cached value, or None on a miss (or an unreadable entry)
+        """
+        import pickle
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as cachefile:
+                value = pickle.load(cachefile)
+            os.utime(path)
+        except FileNotFoundError:
+            value = None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {str(e)}")
+            value = None
+        
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+    
+    def store(self, key, value):
+        """
+        Store a section result and evict old entries if over the size limit.
+        
+        Args:
+            key (str): Cache key
+            value: Picklable section result
+        """
+        import pickle
+        path = self._path(key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as cachefile:
+                pickle.dump(value, cachefile, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            self._evict()
+        except OSError as e:
+            logger.warning(f"Could not write cache entry {path}: {str(e)}")
+    
+    def _evict(self):
+        """
+        Delete least recently used entries until the cache fits max_bytes.
+        """
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith('.pickle'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+
+DEFAULT_TRANSFORM_CACHE_SIZE = 1024
+
+
+class TransformCache:
+    """
+    Bounded LRU cache of transformed shape pin offsets.
+    
+    Keys are (shape, rotation, mirror_x, mirror_y, flip) tuples, values are
+    the mirrored and rotated pin offsets with the resulting pin layers.
+    
+    Attributes:
+        max_entries (int): Maximum number of entries
+        hits (int): Number of lookups served from the cache
+        misses (int): Number of lookups that had to be computed
+    """
+    
+    def __init__(self, max_entries=DEFAULT_TRANSFORM_CACHE_SIZE):
+        """
+        Initialize an empty transform cache.
+        
+        Args:
+            max_entries (int): Maximum number of entries
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+    
+    def get(self, key):
+        """
+        Look up an entry and mark it as most recently used.
+        
+        Args:
+            key (tuple): Shape and orientation
+            
+        Returns:
+            The cached offsets, or None on a miss
+        """
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return value
+    
+    def put(self, key, value):
+        """
+        Add an entry, evicting the least recently used one if the cache is full.
+        
+        Args:
+            key (tuple): Shape and orientation
+            value: Transformed offsets
+        """
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,219 @@
+"""
+Command line interface of the GENCAD parser.
+"""
+
+import os
+import logging
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from .batch import expand_input_files, print_summary, process_file, watch, write_profile
+from .cache import DEFAULT_CACHE_SIZE, ParseCache
+from .diff import DEFAULT_DIFF_TOLERANCE, diff_files
+from .dxf import DXF_VERSIONS
+from .fabcheck import DEFAULT_FAB_TOLERANCE, find_fab_files
+from .geometry import NM_PER_UNIT
+from .parser import TOPOLOGIES
+from .stages import PIN_STAGES, load_stages, parse_stage
+
+logger = logging.getLogger("GencadParser")
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def configure_logging(log_file=None, level=logging.INFO):
+    """
+    Configure logging for the command line tool.
+    
+    Messages always go to the console; they are only written to a file
+    when one is given.
+    
+    Args:
+        log_file (str): Path of a log file to append to, or None
+        level (int): Logging level
+    """
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file))
+    logging.basicConfig(level=level, format=LOG_FORMAT, handlers=handlers)
+
+
+def diff_main(argv=None):
+    """
+    Compare two board revisions: python gencad_diff.py OLD NEW.
+    
+    Args:
+        argv (list): Command line arguments (default: sys.argv[1:])
+    """
+    try:
+        parser = argparse.ArgumentParser(prog='gencad_diff.py',
+                                         description='Compare two GENCAD (or Specctra .dsn) board revisions.')
+        parser.add_argument('old_file', help='Old revision')
+        parser.add_argument('new_file', help='New revision')
+        parser.add_argument('--output-dir', help='Output directory (default: the directory of NEW)')
+        parser.add_argument('--base-name', help='Output file prefix (default: <old>_vs_<new>)')
+        parser.add_argument('--delta', choices=('csv', 'ply', 'none'), default='csv',
+                            help='Format of the changed pins file <base>_delta_houdini.* (default: %(default)s)')
+        parser.add_argument('--tolerance', type=int, default=DEFAULT_DIFF_TOLERANCE, metavar='NM',
+                            help='Largest coordinate difference in nanometres that is not a move '
+                                 '(default: %(default)s)')
+        parser.add_argument('--units', type=str.upper, choices=tuple(NM_PER_UNIT), metavar='UNITS',
+                            help='Units of the report and delta: ' + ', '.join(NM_PER_UNIT) +
+                                 ' (default: the units of OLD)')
+        parser.add_argument('--no-stages', action='store_true',
+                            help='Do not post-process the placed pins of either board')
+        parser.add_argument('--log-level', default='INFO', choices=('DEBUG', 'INFO', 'WARNING', 'ERROR'),
+                            help='Logging level (default: %(default)s)')
+        args = parser.parse_args(argv)
+        configure_logging(level=getattr(logging, args.log_level))
+        
+        diff, paths = diff_files(args.old_file, args.new_file, args.output_dir, args.base_name,
+                                 None if args.delta == 'none' else args.delta,
+                                 stages=[] if args.no_stages else None, tolerance=args.tolerance, units=args.units)
+        for kind in ('components', 'pins', 'nets'):
+            counts = Counter(change for row in diff[kind] for change in row['change'].split('|'))
+            details = ", ".join(f"{count} {change}" for change, count in sorted(counts.items()))
+            print(f"{kind.capitalize()} changed: {len(diff[kind])}" + (f" ({details})" if details else ""))
+        print("Output files:")
+        for path in paths:
+            print(f"- {path}")
+    
+    except Exception as e:
+        logger.error(f"Error in diff: {str(e)}", exc_info=True)
+        print(f"Error: {str(e)}")
+
+
+def main():
+    """
+    Main function to parse GENCAD files and export data to CSV files.
+    """
+    try:
+        # Parse command line arguments
+        parser = argparse.ArgumentParser(description='Parse GENCAD files and export pin placements, names, and connections to CSV files.')
+        parser.add_argument('input_files', nargs='*', metavar='input_file',
+                            help='Paths or glob patterns of the GENCAD (or Specctra .dsn) files '
+                                 '(default: NIOKR.cad next to this script)')
+        parser.add_argument('-j', '--jobs', type=int, default=None,
+                            help='Number of files parsed in parallel (default: number of CPUs)')
+        parser.add_argument('--topology', choices=TOPOLOGIES, default='all-pairs',
+                            help='How the pins of each net are connected in the connections CSV (default: all-pairs)')
+        parser.add_argument('--binary', action='append', choices=('ply', 'npz'), default=[],
+                            help='Also write the Houdini pin data as binary PLY and/or NumPy .npz (repeatable)')
+        parser.add_argument('--dxf', nargs='?', const='R2000', choices=tuple(DXF_VERSIONS), metavar='VERSION',
+                            help='Also write pins, ratsnest and outline to <base>_board.dxf, '
+                                 'as R12 or R2000 (default: R2000)')
+        parser.add_argument('--houdini-schema', choices=('connections', 'net', 'both'), default='connections',
+                            help='Houdini CSV layout: per-pin connection lists (<base>_houdini.csv), net ids with '
+                                 'a nets table (<base>_houdini_net_pins.csv, <base>_houdini_nets.csv), or both '
+                                 '(default: %(default)s)')
+        parser.add_argument('--net-metrics', action='store_true',
+                            help='Also write HPWL, MST length, bounding box and layer spread per net '
+                                 'to <base>_net_metrics.csv')
+        parser.add_argument('--units', type=str.upper, choices=tuple(NM_PER_UNIT), metavar='UNITS',
+                            help='Units of all outputs: ' + ', '.join(NM_PER_UNIT) + ' (default: the units of each file)')
+        parser.add_argument('--clearance', type=float, metavar='MIN_DIST',
+                            help='Also export pins on different nets closer than MIN_DIST (output units) to <base>_clearance.csv')
+        parser.add_argument('--simplify', type=float, metavar='TOL',
+                            help='Douglas-Peucker tolerance (output units) for <base>_outline_loops.csv')
+        parser.add_argument('--drill', action='append', default=[], metavar='FILE',
+                            help='Excellon drill file to cross-check the pins against, repeatable')
+        parser.add_argument('--copper', action='append', default=[], metavar='FILE',
+                            help='Copper Gerber file to cross-check the pins against, repeatable')
+        parser.add_argument('--fab-dir', metavar='DIR',
+                            help='Cross-check against the drill files and copper Gerbers in this directory')
+        parser.add_argument('--fab-tolerance', type=float, default=DEFAULT_FAB_TOLERANCE, metavar='MM',
+                            help='Maximum pin to drill hit/pad distance of the cross-check (default: %(default)s)')
+        parser.add_argument('--threads', action='store_true',
+                            help='Write the CSV files of each input on background threads')
+        parser.add_argument('--stage', action='append', type=parse_stage, dest='stages', metavar='NAME[:PATTERN[:ARGS]]',
+                            help=f"Pin post-processing stage ({', '.join(PIN_STAGES)}), repeatable; "
+                                 "replaces the default swap-diodes:L-D*")
+        parser.add_argument('--stages', dest='stages_file', metavar='JSON',
+                            help='Load pin stages from a JSON list of {"stage": NAME, "pattern": ..., ...}')
+        parser.add_argument('--no-stages', action='store_true',
+                            help='Do not post-process the placed pins (not even the diode swap)')
+        parser.add_argument('--no-cache', action='store_true',
+                            help='Parse every section even if an unchanged copy is in the parse cache')
+        parser.add_argument('--cache-dir', help='Parse cache directory (default: ~/.cache/gencad_parser)')
+        parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE // (1024 * 1024),
+                            help='Parse cache size limit in MiB (default: %(default)s)')
+        parser.add_argument('--profile', metavar='OUT_JSON',
+                            help='Write wall/CPU time and peak memory per stage and counters to OUT_JSON')
+        parser.add_argument('--profile-no-memory', action='store_true',
+                            help='Do not trace memory with --profile (tracing slows the run down)')
+        parser.add_argument('--cprofile', action='store_true',
+                            help='Include the top cProfile entries in the --profile output')
+        parser.add_argument('--log-file', help='Also append log messages to this file')
+        parser.add_argument('--log-level', default='INFO', choices=('DEBUG', 'INFO', 'WARNING', 'ERROR'),
+                            help='Logging level (default: %(default)s)')
+        parser.add_argument('--watch', action='store_true',
+                            help='Keep running and re-export whenever an input file changes')
+        parser.add_argument('--interval', type=float, default=1.0,
+                            help='Polling interval of --watch in seconds (default: %(default)s)')
+        args = parser.parse_args()
+        configure_logging(args.log_file, getattr(logging, args.log_level))
+        
+        # Get the input file paths
+        input_files = expand_input_files(args.input_files)
+        if not args.input_files:
+            # Default to the board next to gencad_parser.py, the parent directory of this package
+            script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            input_files = [os.path.join(script_dir, "NIOKR.cad")]
+        if not input_files:
+            print("Error: No input files found")
+            return
+        
+        stages = None
+        if args.no_stages:
+            stages = []
+        elif args.stages or args.stages_file:
+            stages = (args.stages or []) + (load_stages(args.stages_file) if args.stages_file else [])
+        
+        drill_files, copper_files = list(args.drill), list(args.copper)
+        if args.fab_dir:
+            found_drills, found_copper = find_fab_files(args.fab_dir)
+            drill_files += found_drills
+            copper_files += found_copper
+        
+        cache = None
+        if not args.no_cache:
+            cache = ParseCache(args.cache_dir, args.cache_size * 1024 * 1024)
+        options = {
+            'topology': args.topology, 'binary': tuple(args.binary), 'cache': cache,
+            'clearance': args.clearance, 'simplify': args.simplify, 'stages': stages,
+            'profile': bool(args.profile), 'profile_memory': not args.profile_no_memory, 'cprofile': args.cprofile,
+            'threads': args.threads, 'drill_files': tuple(drill_files), 'copper_files': tuple(copper_files),
+            'fab_tolerance': args.fab_tolerance, 'dxf': args.dxf, 'net_metrics': args.net_metrics,
+            'houdini_schema': args.houdini_schema, 'units': args.units
+        }
+        
+        if args.watch:
+            watch(input_files, interval=args.interval, **options)
+            return
+        
+        jobs = min(args.jobs or os.cpu_count() or 1, len(input_files))
+        if jobs > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures = [pool.submit(process_file, input_file, **options) for input_file in input_files]
+                summaries = [future.result() for future in futures]
+        else:
+            summaries = [process_file(input_file, **options) for input_file in input_files]
+        
+        failed = [summary for summary in summaries if summary['error']]
+        for summary in summaries:
+            print_summary(summary)
+        
+        if args.profile:
+            write_profile(args.profile, summaries)
+            print(f"Profile written to {args.profile}")
+        
+        if not failed:
+            logger.info("GENCAD parsing completed successfully")
+            print("GENCAD parsing completed successfully")
+        elif len(summaries) > 1:
+            print(f"{len(failed)} of {len(summaries)} files failed")
+    
+    except Exception as e:
+        logger.error(f"Error in main function: {str(e)}", exc_info=True)
+        print(f"Error: {str(e)}")
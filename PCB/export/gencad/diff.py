@@ -0,0 +1,361 @@
+"""
+Comparison of two board revisions and export of the changed pins.
+"""
+
+import os
+import csv
+import struct
+import logging
+from collections import Counter
+
+from .parser import HOUDINI_FIELDS
+from .stages import applied_stages_path
+
+logger = logging.getLogger("GencadParser")
+
+# Largest coordinate difference, in nanometres, that is not a move
+DEFAULT_DIFF_TOLERANCE = 0
+
+# Component changes, see diff_boards
+COMPONENT_CHANGES = ('added', 'removed', 'moved', 'rotated', 'side', 'shape', 'device')
+
+# Pin changes, see diff_boards; bit i of the binary change mask is PIN_CHANGES[i]
+PIN_CHANGES = ('added', 'removed', 'moved', 'layer', 'net')
+
+# Net changes, see diff_boards
+NET_CHANGES = ('added', 'removed', 'pins')
+
+# Columns of the diff report
+DIFF_REPORT_FIELDS = ('kind', 'name', 'change', 'old_x', 'old_y', 'new_x', 'new_y', 'old_rotation',
+                      'new_rotation', 'old_layer', 'new_layer', 'old_signal', 'new_signal', 'old_pins', 'new_pins')
+
+
+def _rotation_changed(a, b, tolerance):
+    delta = (a - b) % 360.0
+    return min(delta, 360.0 - delta) > tolerance
+
+
+def diff_boards(old, new, tolerance=DEFAULT_DIFF_TOLERANCE, angle_tolerance=1e-6):
+    """
+    Compare the components, placed pins and nets of two boards.
+    
+    Components, pins and nets are matched by name through the boards' own
+    dictionaries ((component, pin) for pins, via pin_index), so the
+    comparison is linear in the size of the boards. Coordinates are
+    compared as integer nanometres, so boards in different units compare
+    without float noise; they are reported in the output units of the old
+    board.
+    
+    Changes, joined with '|' when several apply:
+    - components: added, removed, moved, rotated, side (layer or flip),
+      shape, device
+    - pins: added, removed, moved, layer, net (signal changed)
+    - nets: added, removed, pins (the set of member pins changed)
+    
+    Args:
+        old (GencadParser): Old revision
+        new (GencadParser): New revision
+        tolerance (int): Largest coordinate difference that is not a move, in nanometres
+        angle_tolerance (float): Largest rotation difference that is not a rotation, in degrees
+    
+    Returns:
+        dict: 'components', 'pins' and 'nets' lists of report rows (see
+        DIFF_REPORT_FIELDS; pin rows also carry old_id and new_id, -1 if
+        absent) and 'counts', mapping '<kind>_<change>' to a number
+    """
+    from_nm = old.pins.from_nm  # Nanometres to the old board's output units, for the report
+    counts = Counter()
+    
+    def moved(x1, y1, x2, y2):
+        return abs(x1 - x2) > tolerance or abs(y1 - y2) > tolerance
+    
+    def position(comp, board):
+        # Components are kept in the units of their file
+        scale = board.nm_per_file_unit
+        return round(comp.get('x', 0.0) * scale), round(comp.get('y', 0.0) * scale)
+    
+    def record(rows, kind, changes, **values):
+        for change in changes:
+            counts[f"{kind}_{change}"] += 1
+        row = dict.fromkeys(DIFF_REPORT_FIELDS, '')
+        row.update(values, kind=kind, change='|'.join(changes))
+        rows.append(row)
+        return row
+    
+    # Components
+    components = []
+    for name, comp in old.components.items():
+        other = new.components.get(name)
+        old_x, old_y = position(comp, old)
+        old_values = {'old_x': from_nm(old_x), 'old_y': from_nm(old_y),
+                      'old_rotation': comp.get('rotation', 0.0), 'old_layer': comp.get('layer', '')}
+        if other is None:
+            record(components, 'component', ['removed'], name=name, **old_values)
+            continue
+        x, y = position(other, new)
+        changes = []
+        if moved(old_x, old_y, x, y):
+            changes.append('moved')
+        if _rotation_changed(old_values['old_rotation'], other.get('rotation', 0.0), angle_tolerance):
+            changes.append('rotated')
+        if comp.get('layer') != other.get('layer') or comp.get('flip') != other.get('flip'):
+            changes.append('side')
+        for key in ('shape', 'device'):
+            if comp.get(key) != other.get(key):
+                changes.append(key)
+        if changes:
+            record(components, 'component', changes, name=name, new_x=from_nm(x), new_y=from_nm(y),
+                   new_rotation=other.get('rotation', 0.0),
+                   new_layer=other.get('layer', ''), **old_values)
+    for name, comp in new.components.items():
+        if name not in old.components:
+            x, y = position(comp, new)
+            record(components, 'component', ['added'], name=name, new_x=from_nm(x), new_y=from_nm(y),
+                   new_rotation=comp.get('rotation', 0.0),
+                   new_layer=comp.get('layer', ''))
+    
+    # Pins
+    pins = []
+    old_pins, new_pins = old.pins, new.pins
+    old_strings, new_strings = old_pins.strings, new_pins.strings
+    old_x_nm, old_y_nm, new_x_nm, new_y_nm = old_pins.x_nm, old_pins.y_nm, new_pins.x_nm, new_pins.y_nm
+    new_index = new.pin_index
+    for key, old_row in old.pin_index.items():
+        old_values = {'old_x': from_nm(old_x_nm[old_row]), 'old_y': from_nm(old_y_nm[old_row]),
+                      'old_layer': old_strings[old_pins.layer_ids[old_row]],
+                      'old_signal': old_strings[old_pins.signal_ids[old_row]]}
+        name = f"{key[0]}:{key[1]}"
+        new_row = new_index.get(key)
+        if new_row is None:
+            record(pins, 'pin', ['removed'], name=name, old_id=old_row, new_id=-1, **old_values)
+            continue
+        new_values = {'new_x': from_nm(new_x_nm[new_row]), 'new_y': from_nm(new_y_nm[new_row]),
+                      'new_layer': new_strings[new_pins.layer_ids[new_row]],
+                      'new_signal': new_strings[new_pins.signal_ids[new_row]]}
+        changes = []
+        if moved(old_x_nm[old_row], old_y_nm[old_row], new_x_nm[new_row], new_y_nm[new_row]):
+            changes.append('moved')
+        if old_values['old_layer'] != new_values['new_layer']:
+            changes.append('layer')
+        if old_values['old_signal'] != new_values['new_signal']:
+            changes.append('net')
+        if changes:
+            record(pins, 'pin', changes, name=name, old_id=old_row, new_id=new_row, **old_values, **new_values)
+    old_index = old.pin_index
+    for key, new_row in new_index.items():
+        if key not in old_index:
+            record(pins, 'pin', ['added'], name=f"{key[0]}:{key[1]}", old_id=-1, new_id=new_row,
+                   new_x=from_nm(new_x_nm[new_row]), new_y=from_nm(new_y_nm[new_row]),
+                   new_layer=new_strings[new_pins.layer_ids[new_row]],
+                   new_signal=new_strings[new_pins.signal_ids[new_row]])
+    
+    # Nets
+    nets = []
+    for name, members in old.signals.items():
+        other = new.signals.get(name)
+        if other is None:
+            record(nets, 'net', ['removed'], name=name, old_pins=len(members))
+        elif set(members) != set(other):
+            record(nets, 'net', ['pins'], name=name, old_pins=len(members), new_pins=len(other))
+    for name, members in new.signals.items():
+        if name not in old.signals:
+            record(nets, 'net', ['added'], name=name, new_pins=len(members))
+    
+    logger.info(f"Diff: {len(components)} components, {len(pins)} pins and {len(nets)} nets changed")
+    return {'components': components, 'pins': pins, 'nets': nets, 'counts': dict(counts)}
+
+
+def export_diff_csv(diff, board, output_path):
+    """
+    Write the rows of diff_boards to a CSV report.
+    
+    Args:
+        diff (dict): Result of diff_boards
+        board (GencadParser): Board whose _open_output writes the file (usually the new one)
+        output_path (str): Path to the output CSV file
+    """
+    with board._open_output(output_path) as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=DIFF_REPORT_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        for kind in ('components', 'nets', 'pins'):
+            writer.writerows(diff[kind])
+    logger.info(f"Exported diff report to {output_path}")
+
+
+def _delta_rows(diff, old, new):
+    """
+    Build the delta rows of the changed pins in the layout of the Houdini CSV.
+    
+    Removed pins take their values from the old board, all others from the
+    new one; connected_to/connected_ids refer to new board pin ids and are
+    only computed for the nets of changed pins.
+    
+    Args:
+        diff (dict): Result of diff_boards
+        old (GencadParser): Old revision
+        new (GencadParser): New revision
+    
+    Yields:
+        tuple: (id, old_id, change mask, x, y, z, component, pin_name, layer,
+        signal, connected_to, connected_ids)
+    """
+    bits = {change: 1 << i for i, change in enumerate(PIN_CHANGES)}
+    pins = new.pins
+    strings = pins.strings
+    connections = {}
+    
+    def connected(signal, row):
+        if signal == "unconnected":
+            return "[]", "[]"
+        members = connections.get(signal)
+        if members is None:
+            members = connections[signal] = [
+                (new.pin_index[key], f"{key[0]}:{key[1]}") for key in new.signals.get(signal, ())
+                if key in new.pin_index
+            ]
+        others = [member for member in members if member[0] != row]
+        return "|".join(label for _, label in others), f"[{','.join(str(other) for other, _ in others)}]"
+    
+    for row in diff['pins']:
+        mask = sum(bits[change] for change in row['change'].split('|'))
+        component, pin_name = row['name'].split(':', 1)
+        new_id = row['new_id']
+        if new_id < 0:
+            board, board_id = old, row['old_id']
+            to, ids = "[]", "[]"
+        else:
+            board, board_id = new, new_id
+            to, ids = connected(strings[pins.signal_ids[new_id]], new_id)
+        board_pins = board.pins
+        layer = board_pins.strings[board_pins.layer_ids[board_id]]
+        yield (new_id, row['old_id'], mask, board_pins.x[board_id], board_pins.y[board_id],
+               0.0 if layer == 'TOP' else board.bottom_z, component, pin_name, layer,
+               board_pins.strings[board_pins.signal_ids[board_id]], to, ids)
+
+
+def export_delta_houdini_csv(diff, old, new, output_path):
+    """
+    Export only the changed pins in the layout of the Houdini CSV.
+    
+    The columns are those of GencadParser.export_houdini_csv followed by
+    old_id and change. id is the pin id in the new board (-1 for removed
+    pins) and old_id the one in the old board (-1 for added pins), so a
+    scene loaded from the old Houdini export can be updated in place.
+    change lists the PIN_CHANGES of the pin joined with '|'. Coordinates
+    are in the output units of each board, which diff_files makes the same.
+    The pin stages applied to the exported components are recorded next to
+    the file as for the Houdini CSV.
+    
+    Args:
+        diff (dict): Result of diff_boards
+        old (GencadParser): Old revision
+        new (GencadParser): New revision
+        output_path (str): Path to the output CSV file
+    """
+    names = {1 << i: change for i, change in enumerate(PIN_CHANGES)}
+    components = set()
+    with new._open_output(output_path) as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(HOUDINI_FIELDS + ('old_id', 'change'))
+        for new_id, old_id, mask, *rest in _delta_rows(diff, old, new):
+            components.add(rest[3])
+            writer.writerow((new_id, *rest, old_id, '|'.join(name for bit, name in names.items() if mask & bit)))
+    
+    # Removed pins come from the old board, all others from the new one
+    applied = {**old.pipeline.applied, **new.pipeline.applied}
+    new.export_applied_stages_csv(output_path, {component: labels for component, labels in applied.items()
+                                                if component in components})
+    logger.info(f"Exported {len(diff['pins'])} changed pins to {output_path}")
+
+
+def export_delta_ply(diff, old, new, output_path):
+    """
+    Export only the changed pins as a binary little-endian PLY point cloud.
+    
+    The vertex layout is that of GencadParser.export_houdini_ply with an
+    old_id and a change bit mask (bit i set for PIN_CHANGES[i]) after id;
+    the string table and the change bits are listed in header comments.
+    Connections are not written.
+    
+    Args:
+        diff (dict): Result of diff_boards
+        old (GencadParser): Old revision
+        new (GencadParser): New revision
+        output_path (str): Path to the output PLY file
+    """
+    strings = {}
+    
+    def intern(value):
+        return strings.setdefault(value, len(strings))
+    
+    vertex = struct.Struct('<dddiiiiiii')
+    body = b''.join(
+        vertex.pack(x, y, z, new_id, old_id, mask, intern(component), intern(pin_name), intern(layer), intern(signal))
+        for new_id, old_id, mask, x, y, z, component, pin_name, layer, signal, _, _ in _delta_rows(diff, old, new)
+    )
+    header = ["ply", "format binary_little_endian 1.0",
+              f"comment source {os.path.basename(old.file_path)} {os.path.basename(new.file_path)}",
+              f"comment units {new.pin_units}"]
+    header.extend(f"comment change {1 << i} {change}" for i, change in enumerate(PIN_CHANGES))
+    header.extend(f"comment string {i} {value}" for value, i in strings.items())
+    header.extend([
+        f"element vertex {len(diff['pins'])}",
+        "property double x", "property double y", "property double z",
+        "property int id", "property int old_id", "property int change", "property int component",
+        "property int pin_name", "property int layer", "property int signal",
+        "end_header"
+    ])
+    with new._open_output(output_path, binary=True) as plyfile:
+        plyfile.write(("\n".join(header) + "\n").encode('utf-8'))
+        plyfile.write(body)
+    logger.info(f"Exported {len(diff['pins'])} changed pins to binary PLY: {output_path}")
+
+
+def diff_files(old_path, new_path, output_dir=None, base_name=None, delta='csv', stages=None,
+               tolerance=DEFAULT_DIFF_TOLERANCE, units=None):
+    """
+    Parse two board files, compare them and write the report and the delta.
+    
+    Writes <base>_diff.csv and <base>_delta_houdini.csv (with its applied
+    stages file <base>_delta_houdini_stages.csv) or .ply, where base
+    defaults to "<old name>_vs_<new name>".
+    
+    Args:
+        old_path (str): Old GENCAD or DSN file
+        new_path (str): New GENCAD or DSN file
+        output_dir (str): Output directory (default: the directory of new_path)
+        base_name (str): File name prefix
+        delta (str): 'csv', 'ply' or None for no delta file
+        stages (list): PinStage objects applied to both boards (default: see gencad.load)
+        tolerance (int): Largest coordinate difference that is not a move, in nanometres
+        units (str): Output units of both boards, a key of MM_PER_UNIT (default: the
+            units of the old file)
+    
+    Returns:
+        tuple: (result of diff_boards, list of written paths)
+    
+    Raises:
+        ValueError: If the delta format or the units are unknown
+    """
+    from . import load
+    if delta not in ('csv', 'ply', None):
+        raise ValueError(f"Unknown delta format: {delta}")
+    old = load(old_path, stages=stages, output_units=units)
+    new = load(new_path, stages=stages, output_units=old.pin_units)
+    if output_dir is None:
+        output_dir = os.path.dirname(os.path.abspath(new_path))
+    if base_name is None:
+        names = [os.path.splitext(os.path.basename(path))[0] for path in (old_path, new_path)]
+        base_name = '_vs_'.join(names)
+    
+    diff = diff_boards(old, new, tolerance)
+    paths = [os.path.join(output_dir, f"{base_name}_diff.csv")]
+    export_diff_csv(diff, new, paths[-1])
+    if delta == 'csv':
+        paths.append(os.path.join(output_dir, f"{base_name}_delta_houdini.csv"))
+        export_delta_houdini_csv(diff, old, new, paths[-1])
+        paths.append(applied_stages_path(paths[-1]))
+    elif delta == 'ply':
+        paths.append(os.path.join(output_dir, f"{base_name}_delta_houdini.ply"))
+        export_delta_ply(diff, old, new, paths[-1])
+    return diff, paths
@@ -0,0 +1,410 @@
+"""
+Specctra DSN file reader feeding the GencadParser pin and net model.
+"""
+
+import os
+import logging
+
+from .cache import DEFAULT_TRANSFORM_CACHE_SIZE
+from .parser import GencadParser
+from .sexpr import CLOSE, OPEN, child, children, read_list, skip_list, tokenize
+
+logger = logging.getLogger("GencadParser")
+
+# File name extensions read with DsnParser instead of GencadParser
+DSN_EXTENSIONS = ('.dsn',)
+
+# Top level lists of a DSN file read by parse(); all others, in particular
+# the wiring of routed designs, are skipped without being built
+DSN_SECTIONS = ('resolution', 'unit', 'structure', 'placement', 'library', 'network')
+
+
+class DsnParser(GencadParser):
+    """
+    Parser for Specctra DSN files (.dsn), as written for the autorouter.
+    
+    Fills the same shapes, components, signals and board outline structures
+    as GencadParser, so pin placement, the pin stages and every export_*
+    method work unchanged:
+    - library images become shapes, their pins keep the padstack name as pad
+    - placement entries become components; back side parts are mirrored
+      in X and flipped, which is how GENCAD describes them
+    - network nets become signals, in file order
+    - the pcb boundary path becomes the board outline segments
+    
+    The L-D* diode swap of default_stages() corrects the GENCAD export and
+    is not applied to DSN files, whose pin positions already match the
+    routing; pass stages explicitly to run any.
+    
+    Coordinates stay in the DSN unit (units is e.g. UM or MIL) unless
+    output_units is given. The file is read by a streaming S-expression
+    tokenizer; padstacks fill pads and padstacks, and the wiring is only
+    read when routes is first accessed.
+    
+    Attributes:
+        layers (list): Signal layer names in stack order
+    """
+    
+    def __init__(self, file_path, cache=None, transform_cache_size=DEFAULT_TRANSFORM_CACHE_SIZE, stages=None,
+                 profiler=None, output_units=None):
+        """
+        Initialize the DSN parser.
+        
+        Args:
+            file_path (str): Path to the DSN file
+            cache (ParseCache): Accepted for interface compatibility; DSN files are always parsed
+            transform_cache_size (int): Maximum number of cached shape transforms
+            stages (list): PinStage objects applied to the placed pins (default: none)
+            profiler (Profiler): Profiler to report stages and counters to
+            output_units (str): Units of the pin coordinates and of all exports,
+                a key of MM_PER_UNIT (default: the units of the file)
+        
+        Raises:
+            ValueError: If the output units are not known to the parser
+        """
+        super().__init__(file_path, cache=None, transform_cache_size=transform_cache_size,
+                         stages=[] if stages is None else stages, profiler=profiler, output_units=output_units)
+        self.units = "MIL"  # Specctra default unit
+        self.layers = []
+        self.section_offsets = {}
+        self._pads = {}
+        self._padstacks = {}
+        self._devices = {}
+        self._tracks = {}
+    
+    def parse(self):
+        """
+        Parse the DSN file and extract pin information.
+        
+        The top level lists in DSN_SECTIONS are built one at a time and
+        dispatched to their handlers; other lists are skipped token by token.
+        Pins are placed afterwards as for GENCAD files.
+        
+        Raises:
+            FileNotFoundError: If the DSN file is not found
+            ValueError: If the file is not a DSN (pcb ...) file
+            Exception: If there is an error parsing the file
+        """
+        handlers = {
+            'resolution': self._parse_resolution,
+            'unit': self._parse_unit,
+            'structure': self._parse_structure,
+            'placement': self._parse_placement,
+            'library': self._parse_library,
+            'network': self._parse_network,
+        }
+        try:
+            with open(self.file_path, 'r', encoding='utf-8', errors='replace') as file:
+                tokens = self._open_pcb(file)
+                for token in tokens:
+                    if token is CLOSE:
+                        break
+                    if token is not OPEN:
+                        continue
+                    keyword = next(tokens, None)
+                    handler = handlers.get(keyword)
+                    if handler is None:
+                        skip_list(tokens)
+                        continue
+                    with self.profiler.stage(f"parse_{keyword}"):
+                        handler(read_list(tokens, keyword))
+            
+            logger.info(f"Using units: {self.units}")
+            self._convert_units()
+            logger.info(f"Parsed board outline with {len(self.board_outline)} points")
+            logger.info(f"Parsed {len(self.shapes)} shapes")
+            logger.info(f"Parsed {len(self.components)} components")
+            logger.info(f"Parsed {len(self.signals)} signals")
+            
+            with self.profiler.stage('place_pins'):
+                self._calculate_pin_positions()
+            logger.info(f"Calculated positions for {len(self.pins)} pins")
+            
+            profiler = self.profiler
+            profiler.count('bytes_read', os.path.getsize(self.file_path))
+            profiler.count('pins', len(self.pins))
+            profiler.count('nets', len(self.signals))
+            profiler.count('components', len(self.components))
+            profiler.count('shapes', len(self.shapes))
+            profiler.count('outline_segments', len(self.board_outline))
+            profiler.count('transform_cache_hits', self.transform_cache.hits)
+            profiler.count('transform_cache_misses', self.transform_cache.misses)
+        
+        except FileNotFoundError:
+            logger.error(f"DSN file not found: {self.file_path}")
+            raise
+        except Exception as e:
+            logger.error(f"Error parsing file: {str(e)}", exc_info=True)
+            raise
+    
+    def _open_pcb(self, file):
+        """
+        Tokenize a DSN file and consume the opening of its pcb list.
+        
+        Args:
+            file: DSN file opened in text mode
+        
+        Returns:
+            iterator: Tokens following the pcb keyword
+        
+        Raises:
+            ValueError: If the file does not start with (pcb
+        """
+        tokens = tokenize(file)
+        if next(tokens, None) is not OPEN or next(tokens, None) != 'pcb':
+            raise ValueError(f"Not a Specctra DSN file: {self.file_path}")
+        return tokens
+    
+    def _load_section(self, section):
+        """
+        Parse a lazily parsed section; only ROUTES (the wiring) exists in DSN files.
+        
+        Args:
+            section (str): Section name
+        """
+        if section == 'ROUTES':
+            with open(self.file_path, 'r', encoding='utf-8', errors='replace') as file:
+                tokens = self._open_pcb(file)
+                for token in tokens:
+                    if token is CLOSE:
+                        break
+                    if token is OPEN:
+                        if next(tokens, None) == 'wiring':
+                            self._parse_wiring(tokens)
+                        else:
+                            skip_list(tokens)
+        logger.info(f"Parsed {len(self._routes)} entries from section {section}")
+    
+    def _parse_resolution(self, node):
+        """
+        Handle the (resolution UNIT N) list, which also sets the unit.
+        
+        Args:
+            node (list): Parsed list
+        """
+        if len(node) > 1:
+            self.units = node[1].upper()
+    
+    def _parse_unit(self, node):
+        """
+        Handle the (unit UNIT) list, which overrides the resolution unit.
+        
+        Args:
+            node (list): Parsed list
+        """
+        if len(node) > 1:
+            self.units = node[1].upper()
+    
+    def _parse_structure(self, node):
+        """
+        Handle the structure list: signal layers and the pcb boundary.
+        
+        Args:
+            node (list): Parsed list
+        """
+        for layer in children(node, 'layer'):
+            layer_type = child(layer, 'type')
+            if len(layer) > 1 and (layer_type is None or layer_type[1:2] == ['signal']):
+                self.layers.append(layer[1])
+        unit = child(node, 'unit')
+        if unit is not None:
+            self._parse_unit(unit)
+        
+        boundaries = [item[1] for item in children(node, 'boundary') if len(item) > 1 and isinstance(item[1], list)]
+        pcb = [shape for shape in boundaries if shape[1:2] == ['pcb']]
+        for shape in pcb or boundaries[:1]:
+            self._parse_boundary(shape)
+    
+    def _parse_boundary(self, shape):
+        """
+        Add the segments of a boundary path or rect to the board outline.
+        
+        Args:
+            shape (list): (path LAYER WIDTH X Y ...) or (rect LAYER X1 Y1 X2 Y2)
+        """
+        if shape[0] == 'rect' and len(shape) >= 6:
+            x1, y1, x2, y2 = map(float, shape[2:6])
+            points = [(x1, y1), (x2, y1), (x2, y2), (x1, y2)]
+        elif shape[0] in ('path', 'polygon') and len(shape) >= 7:
+            coords = [float(value) for value in shape[3:] if not isinstance(value, list)]
+            points = list(zip(coords[0::2], coords[1::2]))
+        else:
+            logger.warning(f"Unsupported boundary shape: {shape[0]}")
+            return
+        if points[0] != points[-1]:
+            points.append(points[0])
+        for (x1, y1), (x2, y2) in zip(points, points[1:]):
+            self.board_outline.append((x1, y1, x2, y2))
+    
+    def _parse_placement(self, node):
+        """
+        Handle the placement list: one (component IMAGE (place ...) ...) per image.
+        
+        Args:
+            node (list): Parsed list
+        """
+        for component in children(node, 'component'):
+            if len(component) < 2:
+                continue
+            image = component[1]
+            for place in children(component, 'place'):
+                # (place REF X Y SIDE ROTATION (PN part) ...); unplaced parts have no coordinates
+                values = [value for value in place[1:] if not isinstance(value, list)]
+                if len(values) < 3:
+                    logger.warning(f"Component {values[0] if values else '?'} is not placed")
+                    continue
+                back = len(values) > 3 and values[3] == 'back'
+                part = child(place, 'PN')
+                self.components[values[0]] = {
+                    'x': float(values[1]),
+                    'y': float(values[2]),
+                    'rotation': float(values[4]) if len(values) > 4 else 0.0,
+                    'layer': 'BOTTOM' if back else 'TOP',
+                    'shape': image,
+                    'device': part[1] if part and len(part) > 1 else image,
+                    'mirror_x': back,
+                    'mirror_y': False,
+                    'flip': back
+                }
+    
+    def _parse_library(self, node):
+        """
+        Handle the library list: padstacks first, then the images using them.
+        
+        Args:
+            node (list): Parsed list
+        """
+        bottom = self.layers[-1] if len(self.layers) > 1 else None
+        pad_layers = {}
+        for padstack in children(node, 'padstack'):
+            if len(padstack) < 2:
+                continue
+            name = padstack[1]
+            geometry = []
+            pads = []
+            for shape in children(padstack, 'shape'):
+                if len(shape) < 2 or not isinstance(shape[1], list) or len(shape[1]) < 2:
+                    continue
+                kind, layer = shape[1][0], shape[1][1]
+                geometry.append((kind.upper(), tuple(float(value) for value in shape[1][2:]
+                                                     if not isinstance(value, list))))
+                pads.append({'pad': name, 'layer': layer, 'rotation': 0.0, 'mirror': "0"})
+            self._pads[name] = {'shape': geometry[0][0] if geometry else "", 'drill': 0.0, 'geometry': geometry}
+            self._padstacks[name] = {'drill': 0.0, 'pads': pads}
+            pad_layers[name] = {pad['layer'] for pad in pads}
+        
+        for image in children(node, 'image'):
+            if len(image) < 2:
+                continue
+            pins = []
+            for pin in children(image, 'pin'):
+                # (pin PADSTACK [(rotate R)] NAME X Y)
+                values = [value for value in pin[1:] if not isinstance(value, list)]
+                if len(values) < 4:
+                    continue
+                rotate = child(pin, 'rotate')
+                pins.append({
+                    'name': values[1],
+                    'pad': values[0],
+                    'x': float(values[2]),
+                    'y': float(values[3]),
+                    'layer': 'BOTTOM' if bottom and pad_layers.get(values[0]) == {bottom} else 'TOP',
+                    'rotation': float(rotate[1]) if rotate and len(rotate) > 1 else 0.0
+                })
+            self.shapes[image[1]] = {'pins': pins}
+    
+    def _parse_network(self, node):
+        """
+        Handle the network list: (net NAME (pins REF-PIN ...)) entries.
+        
+        Args:
+            node (list): Parsed list
+        """
+        for net in children(node, 'net'):
+            if len(net) < 2:
+                continue
+            name = net[1]
+            nodes = self.signals[name]
+            for pins in children(net, 'pins'):
+                for reference in pins[1:]:
+                    if isinstance(reference, list):
+                        continue
+                    component, pin = self._split_pin_reference(reference)
+                    nodes.append((component, pin))
+                    self.signal_index.setdefault((component, pin), name)
+    
+    def _split_pin_reference(self, reference):
+        """
+        Split a REF-PIN pin reference.
+        
+        Component names may contain '-' themselves, so the rightmost split
+        whose component is placed wins; otherwise the last '-' is used.
+        
+        Args:
+            reference (str): Pin reference with quotes already removed
+        
+        Returns:
+            tuple: (component, pin)
+        """
+        end = len(reference)
+        while True:
+            end = reference.rfind('-', 0, end)
+            if end <= 0:
+                break
+            if reference[:end] in self.components:
+                return reference[:end], reference[end + 1:]
+        component, _, pin = reference.rpartition('-')
+        return component, pin
+    
+    def _parse_wiring(self, tokens):
+        """
+        Read the wiring list one wire or via at a time into the routes.
+        
+        Args:
+            tokens: Token iterator positioned after the wiring keyword
+        """
+        for token in tokens:
+            if token is CLOSE:
+                return
+            if token is not OPEN:
+                continue
+            item = read_list(tokens)
+            net = child(item, 'net')
+            if not item or net is None or len(net) < 2:
+                continue
+            route = self._routes.setdefault(net[1], {'segments': [], 'vias': []})
+            if item[0] == 'wire' and len(item) > 1 and isinstance(item[1], list) and len(item[1]) >= 7:
+                # (wire (path LAYER WIDTH X Y X Y ...) (net NAME) ...)
+                path = item[1]
+                coords = [float(value) for value in path[3:] if not isinstance(value, list)]
+                for i in range(0, len(coords) - 3, 2):
+                    route['segments'].append({
+                        'kind': 'LINE',
+                        'coords': tuple(coords[i:i + 4]),
+                        'layer': path[1],
+                        'track': path[2]
+                    })
+            elif item[0] == 'via' and len(item) >= 4:
+                # (via PADSTACK X Y (net NAME) ...)
+                route['vias'].append({
+                    'padstack': item[1],
+                    'x': float(item[2]),
+                    'y': float(item[3]),
+                    'layer': "ALL",
+                    'drill': 0.0
+                })
+
+
+def parser_class(path):
+    """
+    Choose the parser for a board file by its extension.
+    
+    Args:
+        path (str): Board file path
+    
+    Returns:
+        type: DsnParser for DSN_EXTENSIONS, GencadParser otherwise
+    """
+    if os.path.splitext(path)[1].lower() in DSN_EXTENSIONS:
+        return DsnParser
+    return GencadParser
@@ -0,0 +1,284 @@
+"""
+Streaming DXF writer.
+
+Entities are formatted straight into the output file as they are added, so
+memory does not grow with the drawing. Only the layer table, which DXF
+requires before the entities, has to be known up front.
+"""
+
+import re
+
+# Supported DXF versions and their $ACADVER
+DXF_VERSIONS = {'R12': 'AC1009', 'R2000': 'AC1015'}
+
+# $INSUNITS codes of the board units (R2000 only)
+DXF_UNITS = {'INCH': 1, 'MM': 4, 'CM': 5, 'CENTIMETER': 5, 'MIL': 9, 'MILS': 9, 'THOU': 9, 'UM': 13}
+
+# Characters not allowed in layer names, per version
+_INVALID_LAYER_CHARS = {
+    'R12': re.compile(r'[^A-Z0-9_$-]'),
+    'R2000': re.compile(r'[<>/\\":;?*|=`\x00-\x1f]'),
+}
+
+# Width of the $HANDSEED value, which is patched when the writer is closed
+_HANDSEED_WIDTH = 16
+
+# Handles of the fixed R2000 table and block structure
+_MODEL_SPACE = 0x1F
+_PAPER_SPACE = 0x1E
+_FIRST_ENTITY_HANDLE = 0x100
+
+
+def dxf_layer_name(name, version='R2000'):
+    """
+    Make a valid DXF layer name.
+    
+    R12 names are upper-cased and restricted to letters, digits, _, $ and -;
+    R2000 names only lose the characters AutoCAD rejects. Invalid characters
+    become underscores, so distinct names can map to the same layer.
+    
+    Args:
+        name (str): Layer name
+        version (str): Key of DXF_VERSIONS
+    
+    Returns:
+        str: Valid layer name
+    """
+    if version == 'R12':
+        name = name.upper()
+    return _INVALID_LAYER_CHARS[version].sub('_', name.strip()) or '_'
+
+
+class DxfWriter:
+    """
+    Write a DXF drawing entity by entity.
+    
+    The header, tables and blocks are written on creation, every entity
+    method writes its entity immediately, and close() writes the trailing
+    sections. R2000 files get handles and subclass markers; R12 files are
+    written without handles.
+    
+    Use as a context manager: leaving the block without an error closes the
+    drawing.
+    
+    Attributes:
+        entities (int): Number of entities written
+    """
+    
+    def __init__(self, handle, version='R2000', layers=None, units=None):
+        """
+        Initialize the writer and write everything up to the entities.
+        
+        Args:
+            handle: Text file opened with newline='' and seekable
+            version (str): Key of DXF_VERSIONS
+            layers (dict): Layer name -> ACI colour number; names must be valid,
+                see dxf_layer_name
+            units (str): Board units for $INSUNITS, or None for unitless
+        
+        Raises:
+            ValueError: If the version is unknown
+        """
+        if version not in DXF_VERSIONS:
+            raise ValueError(f"Unknown DXF version: {version}")
+        self._file = handle
+        self._write = handle.write
+        self.version = version
+        self._r12 = version == 'R12'
+        self._next_handle = _FIRST_ENTITY_HANDLE
+        self._handseed_pos = None
+        self.entities = 0
+        
+        layers = dict(layers or {})
+        layers.setdefault('0', 7)
+        self._header(units)
+        self._tables(layers)
+        self._blocks()
+        self._write("  0\nSECTION\n  2\nENTITIES\n")
+    
+    def _handle(self):
+        handle = self._next_handle
+        self._next_handle += 1
+        return handle
+    
+    def _entity(self, kind, layer, subclass):
+        """
+        Format the common start of an entity.
+        
+        Args:
+            kind (str): Entity type
+            layer (str): Layer name
+            subclass (str): R2000 subclass marker of the entity data
+        
+        Returns:
+            str: Group codes up to the entity data
+        """
+        self.entities += 1
+        if self._r12:
+            return f"  0\n{kind}\n  8\n{layer}\n"
+        return (f"  0\n{kind}\n  5\n{self._handle():X}\n330\n{_MODEL_SPACE:X}\n100\nAcDbEntity\n"
+                f"  8\n{layer}\n100\n{subclass}\n")
+    
+    def _header(self, units):
+        write = self._write
+        write(f"  0\nSECTION\n  2\nHEADER\n  9\n$ACADVER\n  1\n{DXF_VERSIONS[self.version]}\n")
+        if not self._r12:
+            units = (units or '').upper()
+            imperial = units in ('INCH', 'MIL', 'MILS', 'THOU')
+            write("  9\n$HANDSEED\n  5\n")
+            self._handseed_pos = self._file.tell()
+            write(f"{0:0{_HANDSEED_WIDTH}X}\n")
+            write(f"  9\n$INSUNITS\n 70\n{DXF_UNITS.get(units, 0)}\n  9\n$MEASUREMENT\n 70\n{0 if imperial else 1}\n")
+        write("  0\nENDSEC\n")
+    
+    def _table(self, name, handle, entries, subclass=None):
+        """
+        Write a symbol table.
+        
+        Args:
+            name (str): Table name
+            handle (int): Table handle
+            entries (list): (handle, record subclass, name, further group code text)
+            subclass (str): Extra table subclass marker (DIMSTYLE only)
+        """
+        write = self._write
+        if self._r12:
+            write(f"  0\nTABLE\n  2\n{name}\n 70\n{len(entries)}\n")
+            for _, _, entry_name, data in entries:
+                write(f"  0\n{name}\n  2\n{entry_name}\n 70\n0\n{data}")
+        else:
+            write(f"  0\nTABLE\n  2\n{name}\n  5\n{handle:X}\n330\n0\n100\nAcDbSymbolTable\n 70\n{len(entries)}\n")
+            if subclass:
+                write(f"100\n{subclass}\n 71\n0\n")
+            code = 105 if name == 'DIMSTYLE' else 5
+            for entry_handle, record, entry_name, data in entries:
+                write(f"  0\n{name}\n{code:>3}\n{entry_handle:X}\n330\n{handle:X}\n100\nAcDbSymbolTableRecord\n"
+                      f"100\n{record}\n  2\n{entry_name}\n 70\n0\n{data}")
+        write("  0\nENDTAB\n")
+    
+    def _tables(self, layers):
+        write = self._write
+        write("  0\nSECTION\n  2\nTABLES\n")
+        linetype = " 72\n65\n 73\n0\n 40\n0.0\n"
+        linetypes = [(0x14, 'AcDbLinetypeTableRecord', 'CONTINUOUS', f"  3\nSolid line\n{linetype}")]
+        if not self._r12:
+            linetypes[:0] = [(0x12, 'AcDbLinetypeTableRecord', 'ByBlock', f"  3\n\n{linetype}"),
+                             (0x13, 'AcDbLinetypeTableRecord', 'ByLayer', f"  3\n\n{linetype}")]
+            self._table('VPORT', 0x8, [])
+        self._table('LTYPE', 0x5, linetypes)
+        
+        # Layer records take the first handles after the fixed structure
+        layer_entries = [(self._handle(), 'AcDbLayerTableRecord', name, f" 62\n{colour}\n  6\nCONTINUOUS\n")
+                         for name, colour in layers.items()]
+        self._table('LAYER', 0x2, layer_entries)
+        if self._r12:
+            write("  0\nENDSEC\n")
+            return
+        
+        self._table('STYLE', 0x3, [(0x11, 'AcDbTextStyleTableRecord', 'Standard',
+                                    " 40\n0.0\n 41\n1.0\n 50\n0.0\n 71\n0\n 42\n2.5\n  3\ntxt\n  4\n\n")])
+        self._table('VIEW', 0x6, [])
+        self._table('UCS', 0x7, [])
+        self._table('APPID', 0x9, [(0x15, 'AcDbRegAppTableRecord', 'ACAD', "")])
+        self._table('DIMSTYLE', 0xA, [(0x16, 'AcDbDimStyleTableRecord', 'Standard', "")], 'AcDbDimStyleTable')
+        self._table('BLOCK_RECORD', 0x1, [(_MODEL_SPACE, 'AcDbBlockTableRecord', '*Model_Space', ""),
+                                          (_PAPER_SPACE, 'AcDbBlockTableRecord', '*Paper_Space', "")])
+        write("  0\nENDSEC\n")
+    
+    def _blocks(self):
+        write = self._write
+        write("  0\nSECTION\n  2\nBLOCKS\n")
+        if not self._r12:
+            for name, record, begin, end, paper in (('*Model_Space', _MODEL_SPACE, 0x20, 0x21, ''),
+                                                    ('*Paper_Space', _PAPER_SPACE, 0x1C, 0x1D, ' 67\n1\n')):
+                write(f"  0\nBLOCK\n  5\n{begin:X}\n330\n{record:X}\n100\nAcDbEntity\n{paper}  8\n0\n"
+                      f"100\nAcDbBlockBegin\n  2\n{name}\n 70\n0\n 10\n0.0\n 20\n0.0\n 30\n0.0\n  3\n{name}\n  1\n\n")
+                write(f"  0\nENDBLK\n  5\n{end:X}\n330\n{record:X}\n100\nAcDbEntity\n{paper}  8\n0\n"
+                      f"100\nAcDbBlockEnd\n")
+        write("  0\nENDSEC\n")
+    
+    def point(self, x, y, layer, z=0.0):
+        """
+        Write a POINT.
+        
+        Args:
+            x (float): X coordinate
+            y (float): Y coordinate
+            layer (str): Layer name
+            z (float): Z coordinate
+        """
+        self._write(f"{self._entity('POINT', layer, 'AcDbPoint')} 10\n{x!r}\n 20\n{y!r}\n 30\n{z!r}\n")
+    
+    def circle(self, x, y, radius, layer):
+        """
+        Write a CIRCLE.
+        
+        Args:
+            x (float): Centre X coordinate
+            y (float): Centre Y coordinate
+            radius (float): Radius
+            layer (str): Layer name
+        """
+        self._write(f"{self._entity('CIRCLE', layer, 'AcDbCircle')} 10\n{x!r}\n 20\n{y!r}\n 30\n0.0\n"
+                    f" 40\n{radius!r}\n")
+    
+    def line(self, x1, y1, x2, y2, layer):
+        """
+        Write a LINE.
+        
+        Args:
+            x1 (float): Start X coordinate
+            y1 (float): Start Y coordinate
+            x2 (float): End X coordinate
+            y2 (float): End Y coordinate
+            layer (str): Layer name
+        """
+        self._write(f"{self._entity('LINE', layer, 'AcDbLine')} 10\n{x1!r}\n 20\n{y1!r}\n 30\n0.0\n"
+                    f" 11\n{x2!r}\n 21\n{y2!r}\n 31\n0.0\n")
+    
+    def polyline(self, points, layer, closed=False):
+        """
+        Write a 2D polyline: LWPOLYLINE in R2000, POLYLINE/VERTEX/SEQEND in R12.
+        
+        Args:
+            points (list): (x, y) tuples, first point not repeated for closed polylines
+            layer (str): Layer name
+            closed (bool): Close the polyline
+        """
+        write = self._write
+        if self._r12:
+            write(f"{self._entity('POLYLINE', layer, '')} 66\n1\n 10\n0.0\n 20\n0.0\n 30\n0.0\n"
+                  f" 70\n{int(closed)}\n")
+            for x, y in points:
+                write(f"  0\nVERTEX\n  8\n{layer}\n 10\n{x!r}\n 20\n{y!r}\n 30\n0.0\n")
+            write(f"  0\nSEQEND\n  8\n{layer}\n")
+            return
+        write(f"{self._entity('LWPOLYLINE', layer, 'AcDbPolyline')} 90\n{len(points)}\n 70\n{int(closed)}\n")
+        write("".join(f" 10\n{x!r}\n 20\n{y!r}\n" for x, y in points))
+    
+    def close(self):
+        """
+        Write the trailing sections and the final handle seed.
+        """
+        write = self._write
+        write("  0\nENDSEC\n")
+        if not self._r12:
+            root, groups = self._handle(), self._handle()
+            write(f"  0\nSECTION\n  2\nOBJECTS\n"
+                  f"  0\nDICTIONARY\n  5\n{root:X}\n330\n0\n100\nAcDbDictionary\n281\n1\n  3\nACAD_GROUP\n350\n{groups:X}\n"
+                  f"  0\nDICTIONARY\n  5\n{groups:X}\n330\n{root:X}\n100\nAcDbDictionary\n281\n1\n"
+                  f"  0\nENDSEC\n")
+        write("  0\nEOF\n")
+        if self._handseed_pos is not None:
+            end = self._file.tell()
+            self._file.seek(self._handseed_pos)
+            self._write(f"{self._next_handle:0{_HANDSEED_WIDTH}X}")
+            self._file.seek(end)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        return False
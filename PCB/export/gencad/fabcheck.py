@@ -0,0 +1,483 @@
+"""
+Cross-check of placed pins against Excellon drill and RS-274X Gerber files.
+"""
+
+import os
+import re
+import csv
+import math
+import logging
+from collections import Counter
+
+from .geometry import MM_PER_UNIT
+
+logger = logging.getLogger("GencadParser")
+
+# Maximum distance between a pin and its drill hit or copper pad, in mm
+DEFAULT_FAB_TOLERANCE = 0.05
+
+# Gerber regions (G36/G37) whose bounding box is at most this large, in mm,
+# are taken as pads; larger ones are copper pours
+MAX_REGION_PAD_SIZE = 10.0
+
+# Report statuses, see cross_check
+FAB_STATUSES = ('missing_drill', 'missing_pad', 'wrong_side', 'unmatched_drill')
+
+_EXCELLON_TOOL = re.compile(r'T(\d+)(?:F[\d.]+|S[\d.]+)*C([\d.]+)')
+_EXCELLON_COORD = re.compile(r'(?:X([-+]?[\d.]+))?(?:Y([-+]?[\d.]+))?')
+_GERBER_WORD = re.compile(r'%([^%]*)%|([^*%]*)\*')
+_GERBER_COORD = re.compile(r'(?:G0?[123])?(?:X([-+]?\d+))?(?:Y([-+]?\d+))?(?:I[-+]?\d+)?(?:J[-+]?\d+)?(?:D0?([123]))?$')
+
+
+def _excellon_number(text, metric, zeros, digits):
+    """
+    Convert an Excellon coordinate to mm.
+    
+    Args:
+        text (str): Coordinate as written, with or without decimal point
+        metric (bool): Millimetre (True) or inch (False) file
+        zeros (str): 'LZ' if leading zeros are kept (trailing ones omitted),
+            'TZ' if trailing zeros are kept (leading ones omitted)
+        digits (tuple): (integer digits, decimal digits) of coordinates without a decimal point
+    
+    Returns:
+        float: Value in mm
+    """
+    if '.' in text:
+        value = float(text)
+    else:
+        sign = -1 if text.startswith('-') else 1
+        text = text.lstrip('+-')
+        integer, decimals = digits
+        if zeros == 'LZ':
+            text = text.ljust(integer + decimals, '0')
+        value = sign * int(text) / 10 ** decimals
+    return value if metric else value * MM_PER_UNIT['INCH']
+
+
+def read_excellon(path):
+    """
+    Read the hits of an Excellon drill file.
+    
+    Supports the subset written by PCB tools: METRIC/INCH headers with
+    LZ/TZ, tool definitions with diameters, absolute coordinates with or
+    without decimal point, modal X/Y, and G85 slots (reported at their
+    centre). Plating comes from the KiCad TF.FileFunction comment or the
+    file name (NPTH), the hole function from the TA.AperFunction comment
+    preceding each tool definition.
+    
+    Args:
+        path (str): Drill file
+    
+    Returns:
+        list: (x, y, diameter, plated, function) tuples, coordinates and
+        diameter in mm; function is e.g. 'ViaDrill' or '' if unknown
+    """
+    metric = False
+    zeros = 'LZ'
+    digits = None
+    plated = 'NPTH' not in os.path.basename(path).upper()
+    tools = {}
+    function = ''
+    tool = None
+    x = y = 0.0
+    hits = []
+    with open(path, 'r', errors='replace') as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith(';'):
+                if 'TF.FileFunction' in line:
+                    plated = 'NonPlated' not in line
+                elif 'TA.AperFunction' in line:
+                    function = line.rsplit(',', 1)[-1].strip()
+                continue
+            if line.startswith(('METRIC', 'INCH')):
+                metric = line.startswith('METRIC')
+                options = line.split(',')[1:]
+                if 'TZ' in options:
+                    zeros = 'TZ'
+                elif 'LZ' in options:
+                    zeros = 'LZ'
+                for option in options:
+                    if '.' in option and option.replace('.', '').replace('0', '') == '':
+                        digits = tuple(len(part) for part in option.split('.'))
+                continue
+            match = _EXCELLON_TOOL.match(line)
+            if match:
+                diameter = float(match.group(2)) * (1.0 if metric else MM_PER_UNIT['INCH'])
+                tools[int(match.group(1))] = (diameter, function)
+                function = ''
+                continue
+            if line[0] == 'T' and line[1:].isdigit():
+                tool = int(line[1:])
+                continue
+            if line[0] not in 'XY':
+                continue
+            if digits is None:
+                digits = (3, 3) if metric else (2, 4)
+            
+            # X..Y.. or a slot X..Y..G85X..Y..
+            start, _, end = line.partition('G85')
+            match = _EXCELLON_COORD.match(start)
+            if match.group(1):
+                x = _excellon_number(match.group(1), metric, zeros, digits)
+            if match.group(2):
+                y = _excellon_number(match.group(2), metric, zeros, digits)
+            hit_x, hit_y = x, y
+            if end:
+                match = _EXCELLON_COORD.match(end)
+                if match.group(1):
+                    x = _excellon_number(match.group(1), metric, zeros, digits)
+                if match.group(2):
+                    y = _excellon_number(match.group(2), metric, zeros, digits)
+                hit_x, hit_y = (hit_x + x) / 2, (hit_y + y) / 2
+            diameter, hole_function = tools.get(tool, (0.0, ''))
+            hits.append((hit_x, hit_y, diameter, plated, hole_function))
+    logger.info(f"Read {len(hits)} drill hits from {path}")
+    return hits
+
+
+def read_gerber(path, max_region_size=MAX_REGION_PAD_SIZE):
+    """
+    Read the pads of an RS-274X Gerber file: flashes and small regions.
+    
+    Only what is needed to locate pads is interpreted: the format and unit
+    statements, aperture selection, D01/D02/D03 operations, polarity and
+    G36/G37 regions. Flashes (D03) with dark polarity are pads at the
+    flash position. Regions whose bounding box is at most max_region_size
+    are pads at the box centre, since many tools write SMD pads as regions.
+    
+    Args:
+        path (str): Gerber file
+        max_region_size (float): Largest region, in mm, taken as a pad
+    
+    Returns:
+        list: (x, y, kind) tuples in mm, kind 'flash' or 'region'
+    """
+    with open(path, 'r', errors='replace') as file:
+        content = file.read()
+    
+    scale = 1.0
+    decimals = 6
+    trailing = False
+    integer = 0
+    dark = True
+    region = None
+    x = y = 0
+    pads = []
+    
+    def number(text):
+        sign = -1 if text.startswith('-') else 1
+        text = text.lstrip('+-')
+        if trailing:
+            text = text.ljust(integer + decimals, '0')
+        return sign * int(text) / 10 ** decimals * scale
+    
+    for match in _GERBER_WORD.finditer(content):
+        extended, word = match.groups()
+        if extended is not None:
+            for command in extended.split('*'):
+                command = command.strip()
+                if command.startswith('FS'):
+                    found = re.match(r'FS([LT])?[AI]?X(\d)(\d)Y\d\d', command)
+                    if found:
+                        trailing = found.group(1) == 'T'
+                        integer, decimals = int(found.group(2)), int(found.group(3))
+                elif command.startswith('MO'):
+                    scale = MM_PER_UNIT['INCH'] if command[2:4] == 'IN' else 1.0
+                elif command.startswith('LP'):
+                    dark = command[2:3] != 'C'
+            continue
+        
+        word = word.strip()
+        if not word or word.startswith('G04'):
+            continue
+        if word.startswith('G36'):
+            region = []
+            continue
+        if word.startswith('G37'):
+            if region and dark:
+                xs = [point[0] for point in region]
+                ys = [point[1] for point in region]
+                if max(max(xs) - min(xs), max(ys) - min(ys)) <= max_region_size:
+                    pads.append(((min(xs) + max(xs)) / 2, (min(ys) + max(ys)) / 2, 'region'))
+            region = None
+            continue
+        coords = _GERBER_COORD.match(word)
+        if coords is None or not (coords.group(1) or coords.group(2) or coords.group(3)):
+            # Aperture selection (Dnn, G54Dnn) and other commands
+            continue
+        if coords.group(1):
+            x = number(coords.group(1))
+        if coords.group(2):
+            y = number(coords.group(2))
+        operation = coords.group(3)
+        if region is not None:
+            if operation in ('1', '2'):
+                region.append((x, y))
+        elif operation == '3' and dark:
+            pads.append((x, y, 'flash'))
+    
+    logger.info(f"Read {len(pads)} pads from {path}")
+    return pads
+
+
+def gerber_side(path):
+    """
+    Get the copper side of a Gerber file.
+    
+    Uses the TF.FileFunction attribute (Copper,L1,Top / Copper,Ln,Bot),
+    then the KiCad layer name (F_Cu, B_Cu) or Protel extension (.gtl, .gbl)
+    of the file name.
+    
+    Args:
+        path (str): Gerber file
+    
+    Returns:
+        str: 'TOP' or 'BOTTOM'
+    
+    Raises:
+        ValueError: If the side cannot be determined
+    """
+    with open(path, 'r', errors='replace') as file:
+        for _, line in zip(range(50), file):
+            if 'TF.FileFunction,Copper' in line:
+                if ',Top' in line:
+                    return 'TOP'
+                if ',Bot' in line:
+                    return 'BOTTOM'
+    name = os.path.basename(path).upper()
+    if 'F_CU' in name or name.endswith('.GTL'):
+        return 'TOP'
+    if 'B_CU' in name or name.endswith('.GBL'):
+        return 'BOTTOM'
+    raise ValueError(f"Cannot tell the copper side of {path}")
+
+
+def find_fab_files(directory):
+    """
+    Find the drill files and copper Gerbers of a fabrication output directory.
+    
+    Drill files are *.drl and *.xln; copper Gerbers are the files for which
+    gerber_side succeeds on the name alone (F_Cu/B_Cu, .gtl/.gbl).
+    
+    Args:
+        directory (str): Directory with the fabrication outputs
+    
+    Returns:
+        tuple: (drill files, copper files), sorted
+    """
+    drill_files, copper_files = [], []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        upper = name.upper()
+        if upper.endswith(('.DRL', '.XLN')):
+            drill_files.append(path)
+        elif ('F_CU' in upper or 'B_CU' in upper or upper.endswith(('.GTL', '.GBL'))) and \
+                not upper.endswith(('.ZIP', '.GBRJOB')):
+            copper_files.append(path)
+    return drill_files, copper_files
+
+
+class _PointHash:
+    """
+    Points bucketed into square cells the size of the match tolerance.
+    
+    A point within the tolerance of a query lies in the query's cell or one
+    of its eight neighbours, so a lookup costs O(1) and matching n pins to m
+    features O(n + m).
+    """
+    
+    def __init__(self, tolerance, points=()):
+        self.tolerance = tolerance
+        self.cells = {}
+        self.points = []
+        for x, y, value in points:
+            self.add(x, y, value)
+    
+    def add(self, x, y, value):
+        index = len(self.points)
+        self.points.append((x, y, value))
+        cell = (math.floor(x / self.tolerance), math.floor(y / self.tolerance))
+        self.cells.setdefault(cell, []).append(index)
+    
+    def nearest(self, x, y):
+        """
+        Find the closest point within the tolerance.
+        
+        Args:
+            x (float): X coordinate
+            y (float): Y coordinate
+        
+        Returns:
+            tuple: (distance, point index), or None
+        """
+        cx, cy = math.floor(x / self.tolerance), math.floor(y / self.tolerance)
+        best = None
+        for ix in (cx - 1, cx, cx + 1):
+            for iy in (cy - 1, cy, cy + 1):
+                for index in self.cells.get((ix, iy), ()):
+                    px, py, _ = self.points[index]
+                    dist = math.hypot(px - x, py - y)
+                    if dist <= self.tolerance and (best is None or dist < best[0]):
+                        best = (dist, index)
+        return best
+
+
+def _pad_layers(board):
+    """
+    Get the drill and copper sides of every pad or padstack of a board.
+    
+    Args:
+        board (GencadParser): Parsed board
+    
+    Returns:
+        dict: Pad name -> (drill, set of 'TOP'/'BOTTOM')
+    """
+    layers = getattr(board, 'layers', [])
+    sides = {'TOP': 'TOP', 'BOTTOM': 'BOTTOM'}
+    if layers:
+        sides[layers[0]] = 'TOP'
+        sides[layers[-1]] = 'BOTTOM'
+    
+    pads = {}
+    for name, pad in board.pads.items():
+        pads[name] = (pad.get('drill', 0.0), set())
+    for name, padstack in board.padstacks.items():
+        pads[name] = (padstack.get('drill', 0.0),
+                      {sides[pad['layer']] for pad in padstack['pads'] if pad['layer'] in sides})
+    return pads
+
+
+def cross_check(board, drill_files=(), copper_files=(), tolerance=DEFAULT_FAB_TOLERANCE,
+                max_region_size=MAX_REGION_PAD_SIZE):
+    """
+    Match the placed pins of a board against drill hits and copper pads.
+    
+    Every pin is classified by its pad: drilled pads (drill > 0) must have
+    a drill hit, pads on a single copper side must have a copper pad on
+    that side (after flipping for bottom side components), and pads on
+    several sides without a known drill (DSN padstacks) pass with either.
+    SMD pins are only checked when a copper file for their side is given.
+    Plated drill hits that are neither vias nor matched by a pin are
+    reported as well. Pin coordinates are taken from the nanometre
+    columns of the pin table, so the check does not depend on the units
+    of the board or its output.
+    
+    Report rows have a status from FAB_STATUSES:
+    - missing_drill: drilled pin without a drill hit
+    - missing_pad: pin without a copper pad on its side (or any drill hit)
+    - wrong_side: SMD pin whose copper pad is only on the other side
+    - unmatched_drill: plated component hole without a pin
+    
+    Args:
+        board (GencadParser): Parsed board
+        drill_files (iterable): Excellon files
+        copper_files (iterable): Copper Gerber files, see gerber_side
+        tolerance (float): Maximum pin to hit/pad distance in mm
+        max_region_size (float): Largest Gerber region taken as a pad, in mm
+    
+    Returns:
+        tuple: (report rows, counts). Rows are dictionaries with status,
+        component, pin_name, layer, side (checked copper sides), x and y
+        (mm); counts maps 'pins',
+        'checked', 'ok' and every status to a number.
+    
+    Raises:
+        ValueError: If a copper side is unknown
+    """
+    hits = [hit for path in drill_files for hit in read_excellon(path)]
+    drills = _PointHash(tolerance, ((x, y, i) for i, (x, y, _, _, _) in enumerate(hits)))
+    copper = {}
+    for path in copper_files:
+        side = gerber_side(path)
+        index = copper.setdefault(side, _PointHash(tolerance))
+        for x, y, kind in read_gerber(path, max_region_size):
+            index.add(x, y, kind)
+    
+    pad_layers = _pad_layers(board)
+    shape_pads = {name: {pin['name']: pin['pad'] for pin in shape['pins']} for name, shape in board.shapes.items()}
+    
+    rows = []
+    counts = Counter(dict.fromkeys(('checked', 'ok') + FAB_STATUSES, 0), pins=len(board.pins))
+    matched_hits = set()
+    pins = board.pins
+    components = pins.column('component')
+    pin_names = pins.column('pin_name')
+    layers = pins.column('layer')
+    x_nm, y_nm = pins.x_nm, pins.y_nm
+    for row, (component, pin_name, layer) in enumerate(zip(components, pin_names, layers)):
+        x, y = x_nm[row] / 1e6, y_nm[row] / 1e6
+        comp = board.components.get(component, {})
+        pad = shape_pads.get(comp.get('shape'), {}).get(pin_name)
+        drill, sides = pad_layers.get(pad, (0.0, set()))
+        if comp.get('flip'):
+            sides = {'BOTTOM' if side == 'TOP' else 'TOP' for side in sides}
+        if not sides:
+            sides = {layer if layer in ('TOP', 'BOTTOM') else 'TOP'}
+        
+        status = None
+        if drill > 0 or len(sides) > 1:
+            found = drills.nearest(x, y)
+            if found is not None:
+                matched_hits.add(drills.points[found[1]][2])
+            elif drill > 0:
+                status = 'missing_drill'
+            elif copper:
+                if not any(side in copper and copper[side].nearest(x, y) for side in sides):
+                    status = 'missing_pad'
+            else:
+                continue
+        else:
+            side, = sides
+            if side not in copper:
+                continue
+            if copper[side].nearest(x, y) is None:
+                other = 'BOTTOM' if side == 'TOP' else 'TOP'
+                if other in copper and copper[other].nearest(x, y) is not None:
+                    status = 'wrong_side'
+                else:
+                    status = 'missing_pad'
+        
+        counts['checked'] += 1
+        if status is None:
+            counts['ok'] += 1
+            continue
+        counts[status] += 1
+        rows.append({'status': status, 'component': component, 'pin_name': pin_name, 'layer': layer,
+                     'side': '|'.join(sorted(sides)), 'x': x, 'y': y})
+    
+    for i, (x, y, _, plated, function) in enumerate(hits):
+        if plated and function != 'ViaDrill' and i not in matched_hits:
+            counts['unmatched_drill'] += 1
+            rows.append({'status': 'unmatched_drill', 'component': '', 'pin_name': '', 'layer': '',
+                         'side': 'DRILL', 'x': x, 'y': y})
+    
+    logger.info(f"Fab check: {counts['ok']} of {counts['checked']} checked pins matched, "
+                f"{len(rows)} mismatches")
+    return rows, dict(counts)
+
+
+def export_fab_check(board, output_path, drill_files=(), copper_files=(), tolerance=DEFAULT_FAB_TOLERANCE):
+    """
+    Run cross_check and write its mismatch report to a CSV file.
+    
+    Args:
+        board (GencadParser): Parsed board
+        output_path (str): Path to the output CSV file
+        drill_files (iterable): Excellon files
+        copper_files (iterable): Copper Gerber files
+        tolerance (float): Maximum pin to hit/pad distance in mm
+    
+    Returns:
+        dict: Counts of cross_check
+    """
+    rows, counts = cross_check(board, drill_files, copper_files, tolerance)
+    with board._open_output(output_path) as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=['status', 'component', 'pin_name', 'layer', 'side', 'x', 'y'])
+        writer.writeheader()
+        writer.writerows(rows)
+    logger.info(f"Exported {len(rows)} fab check mismatches to {output_path}")
+    return counts
@@ -0,0 +1,359 @@
+"""
+Geometry helpers: per-net connection trees and board outline polylines.
+"""
+
+import math
+from collections import defaultdict
+
+from ._numpy import get_numpy
+
+# Nets with fewer pins build their minimum spanning tree in pure Python,
+# which is faster than converting them to NumPy arrays
+NUMPY_MIN_MST_POINTS = 64
+
+
+def euclidean_mst(xs, ys):
+    """
+    Compute the Euclidean minimum spanning tree of a set of points.
+    
+    Uses Prim's algorithm on the complete graph, which is O(n^2) with O(n)
+    memory and vectorized with NumPy when it is available and the net has
+    at least NUMPY_MIN_MST_POINTS pins.
+    
+    Args:
+        xs (list): X coordinates
+        ys (list): Y coordinates
+        
+    Returns:
+        list: (parent, child) index pairs, n - 1 edges
+    """
+    n = len(xs)
+    if n < 2:
+        return []
+    edges = []
+    
+    np = get_numpy() if n >= NUMPY_MIN_MST_POINTS else None
+    if np is not None:
+        px = np.asarray(xs, dtype=np.float64)
+        py = np.asarray(ys, dtype=np.float64)
+        best = (px - px[0]) ** 2 + (py - py[0]) ** 2
+        parent = np.zeros(n, dtype=np.intp)
+        best[0] = np.inf
+        in_tree = np.zeros(n, dtype=bool)
+        in_tree[0] = True
+        for _ in range(n - 1):
+            k = int(np.argmin(best))
+            edges.append((int(parent[k]), k))
+            in_tree[k] = True
+            best[k] = np.inf
+            dist = (px - px[k]) ** 2 + (py - py[k]) ** 2
+            closer = (dist < best) & ~in_tree
+            best[closer] = dist[closer]
+            parent[closer] = k
+        return edges
+    
+    best = [(xs[i] - xs[0]) ** 2 + (ys[i] - ys[0]) ** 2 for i in range(n)]
+    parent = [0] * n
+    remaining = set(range(1, n))
+    while remaining:
+        k = min(remaining, key=lambda i: (best[i], i))
+        remaining.remove(k)
+        edges.append((parent[k], k))
+        kx, ky = xs[k], ys[k]
+        for i in remaining:
+            dist = (xs[i] - kx) ** 2 + (ys[i] - ky) ** 2
+            if dist < best[i]:
+                best[i] = dist
+                parent[i] = k
+    return edges
+
+
+def nearest_neighbour_chain(xs, ys):
+    """
+    Chain a set of points by repeatedly walking to the nearest unvisited one.
+    
+    The walk starts at the leftmost (then lowest) point.
+    
+    Args:
+        xs (list): X coordinates
+        ys (list): Y coordinates
+        
+    Returns:
+        list: (from, to) index pairs, n - 1 edges
+    """
+    n = len(xs)
+    if n < 2:
+        return []
+    current = min(range(n), key=lambda i: (xs[i], ys[i]))
+    remaining = set(range(n))
+    remaining.remove(current)
+    edges = []
+    while remaining:
+        cx, cy = xs[current], ys[current]
+        nearest = min(remaining, key=lambda i: ((xs[i] - cx) ** 2 + (ys[i] - cy) ** 2, i))
+        remaining.remove(nearest)
+        edges.append((current, nearest))
+        current = nearest
+    return edges
+
+
+# Millimetres per GENCAD unit, used to derive unit-independent tolerances
+MM_PER_UNIT = {
+    'INCH': 25.4,
+    'MM': 1.0,
+    'MILS': 0.0254,
+    'MIL': 0.0254,
+    'THOU': 0.0254,
+    'CENTIMETER': 10.0,
+    'CM': 10.0,
+    'UM': 0.001,
+}
+
+# Nanometres per unit; pin coordinates are stored as integer nanometres
+NM_PER_UNIT = {unit: round(mm * 1000000) for unit, mm in MM_PER_UNIT.items()}
+
+# Nanometres per inch, centimetre or millimetre of the GENCAD user units:
+# "UNITS USER 1000" is a thousandth of an inch
+USER_UNITS = {'USER': 25400000, 'USERM': 10000000, 'USERCM': 10000000, 'USERMM': 1000000}
+
+
+def nm_per_unit(units):
+    """
+    Get the number of nanometres in one length unit.
+    
+    Args:
+        units (str): Unit name, a key of MM_PER_UNIT, or a USER_UNITS name
+            followed by the number of units per inch/cm/mm, e.g. "USER 1000"
+            (case-insensitive)
+        
+    Returns:
+        float: Nanometres per unit (an int for the units of MM_PER_UNIT)
+        
+    Raises:
+        ValueError: If the unit is unknown
+    """
+    name, *count = units.upper().split() or ['']
+    if not count and name in NM_PER_UNIT:
+        return NM_PER_UNIT[name]
+    if len(count) == 1 and name in USER_UNITS:
+        try:
+            count = float(count[0])
+        except ValueError:
+            count = 0.0
+        if count > 0:
+            return USER_UNITS[name] / count
+    raise ValueError(f"Unknown units: {units}")
+
+
+def _arc_steps(radius, sweep, tolerance):
+    """
+    Number of chords needed to keep an arc within a chord-height tolerance.
+    
+    Args:
+        radius (float): Arc radius
+        sweep (float): Swept angle in radians
+        tolerance (float): Maximum distance between chord and arc
+        
+    Returns:
+        int: Number of chords, at least 1
+    """
+    if radius <= tolerance:
+        return 1
+    step = 2 * math.acos(1 - tolerance / radius)
+    return max(1, math.ceil(sweep / step))
+
+
+def tessellate_arc(x1, y1, x2, y2, xc, yc, tolerance):
+    """
+    Approximate a counterclockwise GENCAD arc with a polyline.
+    
+    The number of points adapts to the radius so that no chord deviates from
+    the arc by more than tolerance. An arc whose start and end coincide is a
+    full circle.
+    
+    Args:
+        x1, y1 (float): Start point
+        x2, y2 (float): End point
+        xc, yc (float): Center
+        tolerance (float): Maximum chord-to-arc distance
+        
+    Returns:
+        list: (x, y) points from the exact start to the exact end point
+    """
+    radius = math.hypot(x1 - xc, y1 - yc)
+    start = math.atan2(y1 - yc, x1 - xc)
+    sweep = (math.atan2(y2 - yc, x2 - xc) - start) % (2 * math.pi)
+    if sweep == 0:
+        sweep = 2 * math.pi
+    steps = _arc_steps(radius, sweep, tolerance)
+    points = [(x1, y1)]
+    for i in range(1, steps):
+        angle = start + sweep * i / steps
+        points.append((xc + radius * math.cos(angle), yc + radius * math.sin(angle)))
+    points.append((x2, y2))
+    return points
+
+
+def tessellate_circle(xc, yc, radius, tolerance):
+    """
+    Approximate a circle with a closed polygon (without repeating the first point).
+    
+    Args:
+        xc, yc (float): Center
+        radius (float): Radius
+        tolerance (float): Maximum chord-to-arc distance
+        
+    Returns:
+        list: (x, y) points, counterclockwise
+    """
+    steps = max(3, _arc_steps(radius, 2 * math.pi, tolerance))
+    return [
+        (xc + radius * math.cos(2 * math.pi * i / steps), yc + radius * math.sin(2 * math.pi * i / steps))
+        for i in range(steps)
+    ]
+
+
+def chain_segments(polylines, tolerance):
+    """
+    Join polylines that share endpoints into ordered chains.
+    
+    Endpoints are hashed into a grid of tolerance-sized cells, so finding the
+    continuation of a chain only looks at the 3x3 cells around its end and
+    the whole pass is O(n).
+    
+    Args:
+        polylines (list): Lists of (x, y) points, at least two each
+        tolerance (float): Maximum distance between joined endpoints
+        
+    Returns:
+        list: (points, closed) tuples. Closed chains do not repeat their first point.
+    """
+    def key(point):
+        return (round(point[0] / tolerance), round(point[1] / tolerance))
+    
+    ends = defaultdict(list)
+    for i, polyline in enumerate(polylines):
+        ends[key(polyline[0])].append((i, 0))
+        ends[key(polyline[-1])].append((i, -1))
+    used = [False] * len(polylines)
+    
+    def take(point):
+        kx, ky = key(point)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for i, end in ends.get((kx + dx, ky + dy), ()):
+                    if used[i]:
+                        continue
+                    other = polylines[i][end]
+                    if abs(other[0] - point[0]) <= tolerance and abs(other[1] - point[1]) <= tolerance:
+                        used[i] = True
+                        # Orient the polyline so that it starts at the matched end
+                        return polylines[i] if end == 0 else polylines[i][::-1]
+        return None
+    
+    chains = []
+    for i, polyline in enumerate(polylines):
+        if used[i]:
+            continue
+        used[i] = True
+        points = list(polyline)
+        while True:
+            following = take(points[-1])
+            if following is None:
+                break
+            points.extend(following[1:])
+        
+        first, last = points[0], points[-1]
+        closed = len(points) > 2 and abs(first[0] - last[0]) <= tolerance and abs(first[1] - last[1]) <= tolerance
+        if not closed:
+            while True:
+                preceding = take(points[0])
+                if preceding is None:
+                    break
+                points[:0] = preceding[::-1][:-1]
+        else:
+            points.pop()
+        chains.append((points, closed))
+    return chains
+
+
+def polygon_area(points):
+    """
+    Signed area of a polygon (positive when counterclockwise).
+    
+    Args:
+        points (list): (x, y) points, first point not repeated
+        
+    Returns:
+        float: Signed area
+    """
+    area = 0.0
+    for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]):
+        area += x1 * y2 - x2 * y1
+    return area / 2
+
+
+def point_in_polygon(x, y, points):
+    """
+    Even-odd test of a point against a polygon.
+    
+    Args:
+        x, y (float): Point
+        points (list): (x, y) polygon points, first point not repeated
+        
+    Returns:
+        bool: True if the point is inside
+    """
+    inside = False
+    for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]):
+        if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+            inside = not inside
+    return inside
+
+
+def simplify_polyline(points, tolerance, closed=False):
+    """
+    Douglas-Peucker simplification, iterative so long outlines cannot hit the recursion limit.
+    
+    Closed polylines are split at their first point and the point farthest
+    from it, so both halves keep an anchor.
+    
+    Args:
+        points (list): (x, y) points
+        tolerance (float): Maximum distance of a dropped point from the result
+        closed (bool): Whether the polyline is a closed loop (first point not repeated)
+        
+    Returns:
+        list: Simplified (x, y) points
+    """
+    if len(points) < 3 or tolerance <= 0:
+        return list(points)
+    if closed:
+        x0, y0 = points[0]
+        far = max(range(len(points)), key=lambda i: (points[i][0] - x0) ** 2 + (points[i][1] - y0) ** 2)
+        first = simplify_polyline(points[:far + 1], tolerance)
+        second = simplify_polyline(points[far:] + points[:1], tolerance)
+        return first[:-1] + second[:-1]
+    
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        (ax, ay), (bx, by) = points[start], points[end]
+        dx, dy = bx - ax, by - ay
+        length = math.hypot(dx, dy)
+        farthest, index = -1.0, None
+        for i in range(start + 1, end):
+            px, py = points[i]
+            if length == 0:
+                dist = math.hypot(px - ax, py - ay)
+            else:
+                dist = abs(dy * (px - ax) - dx * (py - ay)) / length
+            if dist > farthest:
+                farthest, index = dist, i
+        if index is not None and farthest > tolerance:
+            keep[index] = True
+            stack.append((start, index))
+            stack.append((index, end))
+    return [point for point, kept in zip(points, keep) if kept]
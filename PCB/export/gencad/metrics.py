@@ -0,0 +1,139 @@
+"""
+Per-net wirelength and placement metrics.
+"""
+
+import math
+from collections import defaultdict
+
+from ._numpy import get_numpy
+from .geometry import euclidean_mst
+
+# Boards with fewer pins group their nets in pure Python, which is faster
+# than converting the pin columns to NumPy arrays
+NUMPY_MIN_METRIC_PINS = 256
+
+# Columns of the net metrics export, in order
+NET_METRIC_FIELDS = ('signal', 'pin_count', 'min_x', 'min_y', 'max_x', 'max_y', 'width', 'height', 'hpwl',
+                     'mst_length', 'layer_count', 'layers')
+
+
+def _group_scalar(pins):
+    """
+    Compute the pin count, bounding box and layer set of every signal in pure Python.
+    
+    Args:
+        pins (PinTable): Placed pins
+    
+    Returns:
+        dict: Signal id -> (pin rows, min_x, min_y, max_x, max_y, set of layer ids), bounding
+        boxes in nanometres
+    """
+    rows = defaultdict(list)
+    for row, signal_id in enumerate(pins.signal_ids):
+        rows[signal_id].append(row)
+    xs, ys, layer_ids = pins.x_nm, pins.y_nm, pins.layer_ids
+    groups = {}
+    for signal_id, members in rows.items():
+        px = [xs[row] for row in members]
+        py = [ys[row] for row in members]
+        groups[signal_id] = (members, min(px), min(py), max(px), max(py), {layer_ids[row] for row in members})
+    return groups
+
+
+def _group_numpy(np, pins):
+    """
+    Compute the pin count, bounding box and layer set of every signal with segment reductions.
+    
+    Pins are sorted by signal once; the bounding boxes are then reduceat
+    calls over the signal segments and the layers come from the unique
+    (signal, layer) pairs.
+    
+    Args:
+        np: The numpy module
+        pins (PinTable): Placed pins
+    
+    Returns:
+        dict: Signal id -> (pin rows, min_x, min_y, max_x, max_y, set of layer ids), bounding
+        boxes in nanometres
+    """
+    signals = np.frombuffer(pins.signal_ids, dtype=np.int32)
+    layers = np.frombuffer(pins.layer_ids, dtype=np.int32)
+    order = np.argsort(signals, kind='stable')
+    sorted_signals = signals[order]
+    starts = np.flatnonzero(np.r_[True, sorted_signals[1:] != sorted_signals[:-1]])
+    xs = np.frombuffer(pins.x_nm, dtype=np.int64)[order]
+    ys = np.frombuffer(pins.y_nm, dtype=np.int64)[order]
+    min_x, max_x = np.minimum.reduceat(xs, starts), np.maximum.reduceat(xs, starts)
+    min_y, max_y = np.minimum.reduceat(ys, starts), np.maximum.reduceat(ys, starts)
+    
+    pairs = np.unique(signals.astype(np.int64) * len(pins.strings) + layers)
+    layer_sets = defaultdict(set)
+    for signal_id, layer_id in zip(*np.divmod(pairs, len(pins.strings))):
+        layer_sets[int(signal_id)].add(int(layer_id))
+    
+    groups = {}
+    segments = np.split(order, starts[1:])
+    for i, signal_id in enumerate(sorted_signals[starts].tolist()):
+        groups[signal_id] = (segments[i].tolist(), int(min_x[i]), int(min_y[i]), int(max_x[i]),
+                             int(max_y[i]), layer_sets[signal_id])
+    return groups
+
+
+def net_metrics(board):
+    """
+    Compute the wirelength estimates and spread of every net with placed pins.
+    
+    Per net: pin count (fan-out), bounding box, half-perimeter wire length
+    (HPWL, width + height of the box), Euclidean minimum spanning tree
+    length and the number and names of the layers its pins are on. Nets
+    are in the order of board.signals; the "unconnected" pseudo-net is
+    skipped. Lengths are measured on the integer nanometre pin columns and
+    converted to the output units of the board (pin_units) once, so they do
+    not depend on float round-off.
+    
+    Args:
+        board (GencadParser): Parsed board
+    
+    Returns:
+        tuple: (rows, totals). Rows are dictionaries with NET_METRIC_FIELDS
+        (layers joined with '|'); totals has nets, routed_nets (two or
+        more pins), pins, hpwl, mst_length, max_pin_count and
+        multi_layer_nets.
+    """
+    pins = board.pins
+    np = get_numpy() if len(pins) >= NUMPY_MIN_METRIC_PINS else None
+    groups = _group_numpy(np, pins) if np is not None else _group_scalar(pins)
+    xs, ys, strings, from_nm = pins.x_nm, pins.y_nm, pins.strings, pins.from_nm
+    
+    rows = []
+    totals = {'nets': 0, 'routed_nets': 0, 'pins': 0, 'hpwl': 0, 'mst_length': 0.0, 'max_pin_count': 0,
+              'multi_layer_nets': 0}
+    for signal in board.signals:
+        signal_id = pins.string_id(signal)
+        if signal == "unconnected" or signal_id not in groups:
+            continue
+        members, min_x, min_y, max_x, max_y, layer_ids = groups[signal_id]
+        mst_length = 0.0
+        if len(members) > 1:
+            px = [xs[row] for row in members]
+            py = [ys[row] for row in members]
+            mst_length = sum(math.hypot(px[a] - px[b], py[a] - py[b]) for a, b in euclidean_mst(px, py))
+        width, height = max_x - min_x, max_y - min_y
+        layer_names = sorted(strings[layer_id] for layer_id in layer_ids)
+        rows.append({
+            'signal': signal, 'pin_count': len(members), 'min_x': from_nm(min_x), 'min_y': from_nm(min_y),
+            'max_x': from_nm(max_x), 'max_y': from_nm(max_y), 'width': from_nm(width), 'height': from_nm(height),
+            'hpwl': from_nm(width + height), 'mst_length': from_nm(mst_length),
+            'layer_count': len(layer_names), 'layers': '|'.join(layer_names)
+        })
+        
+        totals['nets'] += 1
+        totals['routed_nets'] += len(members) > 1
+        totals['pins'] += len(members)
+        totals['hpwl'] += width + height
+        totals['mst_length'] += mst_length
+        totals['max_pin_count'] = max(totals['max_pin_count'], len(members))
+        totals['multi_layer_nets'] += len(layer_names) > 1
+    totals['hpwl'] = from_nm(totals['hpwl'])
+    totals['mst_length'] = from_nm(totals['mst_length'])
+    return rows, totals
@@ -0,0 +1,2066 @@
+"""
+GENCAD file parser and exporters.
+"""
+
+import csv
+import os
+import math
+import struct
+import filecmp
+import logging
+from array import array
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from functools import partial
+from itertools import groupby
+from operator import itemgetter
+
+from ._numpy import get_numpy
+from .cache import DEFAULT_TRANSFORM_CACHE_SIZE, TransformCache
+from .dxf import DXF_VERSIONS, DxfWriter, dxf_layer_name
+from .geometry import (
+    NM_PER_UNIT, USER_UNITS, chain_segments, euclidean_mst, nearest_neighbour_chain, nm_per_unit,
+    point_in_polygon, polygon_area, simplify_polyline, tessellate_arc, tessellate_circle
+)
+from .metrics import NET_METRIC_FIELDS, net_metrics
+from .pins import PinSpatialIndex, PinTable
+from .profiling import Profiler
+from .stages import PinPipeline, applied_stages_path, default_stages
+from .writers import EXPORT_BUFFER_SIZE, RowWriter
+
+logger = logging.getLogger("GencadParser")
+
+# Supported per-net connection topologies, see GencadParser.iter_connections
+TOPOLOGIES = ('all-pairs', 'mst', 'star', 'chain')
+
+# Sections parsed by GencadParser.parse()
+EAGER_SECTIONS = ('HEADER', 'BOARD', 'SHAPES', 'COMPONENTS', 'SIGNALS')
+
+# Sections parsed on first access, and the parser attribute holding them
+LAZY_SECTIONS = {
+    'PADS': '_pads',
+    'PADSTACKS': '_padstacks',
+    'DEVICES': '_devices',
+    'TRACKS': '_tracks',
+    'ROUTES': '_routes',
+}
+
+# Sections whose parsed result is cached, and the parser attributes holding it
+CACHED_SECTIONS = {
+    'BOARD': ('board_outline', 'board_arcs', 'board_circles'),
+    'SHAPES': ('shapes',),
+    'SIGNALS': ('signals', 'signal_index'),
+}
+
+# Output formats of GencadParser.export_all and the file name suffix after <base>_
+EXPORT_FORMATS = {
+    'pins': 'pins.csv',
+    'connections': 'connections.csv',
+    'netlist': 'netlist.csv',
+    'board_outline': 'board_outline.csv',
+    'houdini': 'houdini.csv',
+    'outline_loops': 'outline_loops.csv',
+    'ply': 'houdini.ply',
+    'npz': 'houdini.npz',
+    'dxf': 'board.dxf',
+    'net_metrics': 'net_metrics.csv',
+    'houdini_net_pins': 'houdini_net_pins.csv',
+    'houdini_nets': 'houdini_nets.csv',
+}
+
+# Columns of the Houdini CSV export
+HOUDINI_FIELDS = ('id', 'x', 'y', 'z', 'component', 'pin_name', 'layer', 'signal', 'connected_to', 'connected_ids')
+
+# Z coordinate of the pins that are not on the TOP layer in the 3D exports, in
+# file units; GencadParser.bottom_z is this value in the output units
+BOTTOM_Z = -0.1
+
+# Formats written by export_all unless others are requested
+DEFAULT_EXPORT_FORMATS = ('pins', 'connections', 'netlist', 'board_outline', 'houdini', 'outline_loops')
+
+# Boards with fewer components are placed in pure Python, which is faster
+# than importing NumPy for them
+NUMPY_MIN_PLACEMENTS = 256
+
+
+class GencadParser:
+    """
+    Parser for GENCAD files (.cad) that extracts pin placements, names, and connections.
+    
+    Attributes:
+        file_path (str): Path to the GENCAD file
+        cache (ParseCache): Cache for parsed sections (optional)
+        transform_cache (TransformCache): Transformed shape pin offsets by orientation
+        changed_outputs (list): Output paths whose content changed on export
+        pins (PinTable): Placed pins
+        signals (dict): Dictionary of signal connections
+        components (dict): Dictionary of component data
+        shapes (dict): Dictionary of shape data with pin definitions
+        units (str): Units used in the GENCAD file (default: INCH), e.g. "USER 1000" for user units
+        nm_per_file_unit (float): Nanometres per file unit (see nm_per_unit), set by parse()
+        output_units (str): Units of the pin coordinates and exports, or None for the file's units
+        bottom_z (float): Z coordinate of the pins not on the TOP layer in the 3D exports (BOTTOM_Z
+            converted to the output units)
+        board_outline (list): Board LINE segments (x1, y1, x2, y2)
+        board_arcs (list): Board ARC records (x1, y1, x2, y2, xc, yc)
+        board_circles (list): Board CIRCLE records (xc, yc, r)
+        section_offsets (dict): Section name -> list of (start, end) byte ranges
+        signal_index (dict): (component, pin) -> signal name
+        pin_index (dict): (component, pin) -> row index in pins
+        pipeline (PinPipeline): Stages applied to the placed pins
+        profiler (Profiler): Stage timings and counters
+        sections (tuple): Sections parsed by parse()
+    """
+    
+    def __init__(self, file_path, cache=None, transform_cache_size=DEFAULT_TRANSFORM_CACHE_SIZE, stages=None,
+                 profiler=None, sections=None, output_units=None):
+        """
+        Initialize the GENCAD parser.
+        
+        Args:
+            file_path (str): Path to the GENCAD file
+            cache (ParseCache): Cache for parsed sections, or None to always parse
+            transform_cache_size (int): Maximum number of cached shape transforms
+            stages (list): PinStage objects applied to the placed pins
+                (default: default_stages(), the L-D* diode swap)
+            profiler (Profiler): Profiler to report stages and counters to
+                (default: a disabled one that only keeps counters)
+            sections (iterable): Sections to parse (default: EAGER_SECTIONS).
+                Lazily parsed sections listed here are parsed right away;
+                pins are only placed when SHAPES and COMPONENTS are included.
+            output_units (str): Units of the pin coordinates and of all exports,
+                a key of MM_PER_UNIT (default: the units of the file)
+                
+        Raises:
+            ValueError: If a section name or the output units are not known to the parser
+        """
+        if sections is None:
+            sections = EAGER_SECTIONS
+        sections = tuple(section.upper() for section in sections)
+        unknown = [section for section in sections if section not in EAGER_SECTIONS and section not in LAZY_SECTIONS]
+        if unknown:
+            raise ValueError(f"Unknown GENCAD section(s): {', '.join(unknown)}")
+        if output_units is not None:
+            output_units = output_units.upper()
+            nm_per_unit(output_units)
+        self.sections = sections
+        self.file_path = file_path
+        self.profiler = profiler if profiler is not None else Profiler(enabled=False)
+        self.pipeline = PinPipeline(default_stages() if stages is None else stages)
+        self.cache = cache
+        self.transform_cache = TransformCache(transform_cache_size)
+        self.changed_outputs = []  # Output files rewritten by the export_* methods
+        self.pins = PinTable()  # Will store pin data: component, pin_name, x, y, layer, signal
+        self.signals = defaultdict(list)  # Will store signal connections
+        self.components = {}  # Will store component data: {name: {position, rotation, etc.}}
+        self.shapes = {}  # Will store shape data with pin definitions
+        self.units = "INCH"  # Default units
+        self.output_units = output_units  # None: export in self.units
+        self.nm_per_file_unit = None  # Nanometres per unit of the file, set by parse()
+        self.bottom_z = BOTTOM_Z  # Z of non-TOP pins in the output units, set by parse()
+        self.board_outline = []  # Will store board outline points
+        self.board_arcs = []  # Board ARC records: (x1, y1, x2, y2, xc, yc)
+        self.board_circles = []  # Board CIRCLE records: (xc, yc, r)
+        self.section_offsets = None  # Section name -> [(start, end)] byte ranges, set by parse()
+        self._pads = None  # Lazily parsed sections, see LAZY_SECTIONS
+        self._padstacks = None
+        self._devices = None
+        self._tracks = None
+        self._routes = None
+        self._route_track = None
+        self._route_layer = None
+        self.signal_index = {}  # (component, pin) -> signal name, built in _parse_signals
+        self.pin_index = {}  # (component, pin) -> pin row, built in _calculate_pin_positions
+        self._current_name = None  # SHAPE/COMPONENT/SIGNAL currently being parsed
+        self._numpy = None  # NumPy module when placement is vectorized, see _calculate_pin_positions
+        
+    def parse(self):
+        """
+        Parse the GENCAD file and extract pin information.
+        
+        The file is read once, line by line. Every line of the following
+        sections (by default; see the sections argument of __init__) is
+        dispatched to the handler registered for its keyword:
+        - HEADER: Units and other general information
+        - BOARD: Board outline
+        - SHAPES: Component shapes and pin definitions
+        - COMPONENTS: Component placements
+        - SIGNALS: Signal connections
+        
+        For all other sections only the byte range is recorded; PADS,
+        PADSTACKS, DEVICES, TRACKS and ROUTES are parsed the first time the
+        corresponding property (pads, padstacks, ...) is accessed.
+        
+        After parsing, it calculates the actual pin positions based on component placement and shape definitions.
+        
+        Raises:
+            FileNotFoundError: If the GENCAD file is not found
+            Exception: If there is an error parsing the file
+        """
+        try:
+            with open(self.file_path, 'rb') as file:
+                self._parse_stream(file)
+            
+            for section in self.sections:
+                if section not in self.section_offsets:
+                    logger.warning(f"Section {section} not found in file")
+                elif section in LAZY_SECTIONS:
+                    self._lazy_section(section)
+            
+            logger.info(f"Using units: {self.units}")
+            self._convert_units()
+            logger.info(f"Parsed board outline with {len(self.board_outline)} points")
+            logger.info(f"Parsed {len(self.shapes)} shapes")
+            logger.info(f"Parsed {len(self.components)} components")
+            logger.info(f"Parsed {len(self.signals)} signals")
+            if self.cache is not None:
+                logger.info(f"Parse cache: {self.cache.hits} sections reused, {self.cache.misses} parsed")
+            
+            # Calculate actual pin positions based on component placement and shape definitions
+            if 'SHAPES' in self.sections and 'COMPONENTS' in self.sections:
+                with self.profiler.stage('place_pins'):
+                    self._calculate_pin_positions()
+                logger.info(f"Calculated positions for {len(self.pins)} pins")
+            
+            profiler = self.profiler
+            profiler.count('bytes_read', os.path.getsize(self.file_path))
+            profiler.count('pins', len(self.pins))
+            profiler.count('nets', len(self.signals))
+            profiler.count('components', len(self.components))
+            profiler.count('shapes', len(self.shapes))
+            profiler.count('outline_segments', len(self.board_outline) + len(self.board_arcs) + len(self.board_circles))
+            profiler.count('transform_cache_hits', self.transform_cache.hits)
+            profiler.count('transform_cache_misses', self.transform_cache.misses)
+            if self.cache is not None:
+                profiler.count('parse_cache_hits', self.cache.hits)
+                profiler.count('parse_cache_misses', self.cache.misses)
+            
+        except FileNotFoundError:
+            logger.error(f"GENCAD file not found: {self.file_path}")
+            raise
+        except Exception as e:
+            logger.error(f"Error parsing file: {str(e)}", exc_info=True)
+            raise
+    
+    def _section_handlers(self):
+        """
+        Build the keyword dispatch tables for the sections this parser reads.
+        
+        Returns:
+            dict: Section name -> (keyword handlers, fallback handler). Keyword
+            handlers receive the rest of the line after the keyword; the
+            fallback receives the whole line for keywords not in the table.
+        """
+        return {
+            'HEADER': ({'UNITS': self._parse_header_units}, None),
+            'BOARD': ({
+                'LINE': self._parse_board_line,
+                'ARC': self._parse_board_arc,
+                'CIRCLE': self._parse_board_circle,
+            }, None),
+            'SHAPES': ({
+                'SHAPE': self._parse_shape_start,
+                'PIN': self._parse_shape_pin,
+            }, None),
+            'COMPONENTS': ({
+                'COMPONENT': self._parse_component_start,
+                'DEVICE': self._parse_component_device,
+                'PLACE': self._parse_component_place,
+                'LAYER': self._parse_component_layer,
+                'ROTATION': self._parse_component_rotation,
+                'SHAPE': self._parse_component_shape,
+            }, self._parse_component_flags),
+            'SIGNALS': ({
+                'SIGNAL': self._parse_signal_start,
+                'NODE': self._parse_signal_node,
+            }, None),
+            'PADS': ({
+                'PAD': self._parse_pad_start,
+                'LINE': partial(self._parse_pad_geometry, 'LINE'),
+                'ARC': partial(self._parse_pad_geometry, 'ARC'),
+                'CIRCLE': partial(self._parse_pad_geometry, 'CIRCLE'),
+                'RECTANGLE': partial(self._parse_pad_geometry, 'RECTANGLE'),
+            }, None),
+            'PADSTACKS': ({
+                'PADSTACK': self._parse_padstack_start,
+                'PAD': self._parse_padstack_pad,
+            }, None),
+            'DEVICES': ({'DEVICE': self._parse_device_start}, self._parse_device_attribute),
+            'TRACKS': ({'TRACK': self._parse_track}, None),
+            'ROUTES': ({
+                'ROUTE': self._parse_route_start,
+                'TRACK': self._parse_route_track,
+                'LAYER': self._parse_route_layer,
+                'LINE': partial(self._parse_route_segment, 'LINE'),
+                'ARC': partial(self._parse_route_segment, 'ARC'),
+                'CIRCLE': partial(self._parse_route_segment, 'CIRCLE'),
+                'VIA': self._parse_route_via,
+            }, None),
+        }
+    
+    def _iter_sections(self, file, sections):
+        """
+        Iterate over the lines of the requested sections of a GENCAD file.
+        
+        This is a forward-only generator: the file is never held in memory as a
+        whole, and section markers ($NAME / $ENDNAME) are consumed here. The
+        byte range of every section, requested or not, is recorded in
+        section_offsets so that other sections can be parsed later on demand.
+        
+        Args:
+            file: GENCAD file opened in binary mode
+            sections: Names of the sections whose lines are yielded
+            
+        Yields:
+            tuple: (section name, stripped non-empty line)
+        """
+        self.section_offsets = defaultdict(list)
+        section = None
+        section_start = offset = 0
+        for raw in file:
+            line_start = offset
+            offset += len(raw)
+            line = raw.strip()
+            if not line:
+                continue
+            if line[:1] == b'$':
+                if section is not None:
+                    self.section_offsets[section].append((section_start, line_start))
+                if line.startswith(b'$END'):
+                    section = None
+                else:
+                    section = line[1:].split()[0].decode('ascii', 'replace')
+                    section_start = offset
+                continue
+            if section in sections:
+                yield section, line.decode('utf-8', 'replace')
+        
+        if section is not None:
+            self.section_offsets[section].append((section_start, offset))
+    
+    def _parse_stream(self, file):
+        """
+        Dispatch every line of the eagerly parsed sections to its handler.
+        
+        Lines are streamed straight to the handlers. When a parse cache is
+        configured, the lines of each cacheable section are buffered and
+        hashed first, and a cached result is restored instead of parsing
+        the section again.
+        
+        Args:
+            file: GENCAD file opened in binary mode
+        """
+        handlers = self._section_handlers()
+        seen = set()
+        
+        eager = [section for section in self.sections if section in EAGER_SECTIONS]
+        for section, group in groupby(self._iter_sections(file, eager), key=itemgetter(0)):
+            # Lines are read while the handlers run, so each stage includes its share of the I/O
+            with self.profiler.stage(f"parse_{section.lower()}"):
+                self._parse_section(section, (line for _, line in group), handlers[section], seen)
+            seen.add(section)
+    
+    def _parse_section(self, section, lines, handler, seen):
+        """
+        Parse the lines of one section, or restore them from the parse cache.
+        
+        Args:
+            section (str): Section name
+            lines: Iterable of stripped lines
+            handler (tuple): (keyword handlers, fallback handler) of the section
+            seen (set): Sections already parsed; only a section's first
+                occurrence goes through the cache
+        """
+        table, fallback = handler
+        self._current_name = None
+        
+        if self.cache is None or section in seen or section not in CACHED_SECTIONS:
+            self._dispatch_lines(lines, table, fallback)
+        else:
+            lines = list(lines)
+            key = self.cache.key(section, lines)
+            state = self.cache.load(key)
+            if state is not None:
+                for attr, value in zip(CACHED_SECTIONS[section], state):
+                    setattr(self, attr, value)
+            else:
+                self._dispatch_lines(lines, table, fallback)
+                self.cache.store(key, tuple(getattr(self, attr) for attr in CACHED_SECTIONS[section]))
+    
+    def _lazy_section(self, section):
+        """
+        Get the parsed content of a lazily parsed section, parsing it if needed.
+        
+        Args:
+            section (str): Section name, one of LAZY_SECTIONS
+            
+        Returns:
+            dict: Parsed section content
+        """
+        attr = LAZY_SECTIONS[section]
+        if getattr(self, attr) is None:
+            setattr(self, attr, {})
+            self._load_section(section)
+        return getattr(self, attr)
+    
+    def _load_section(self, section):
+        """
+        Parse one section by reading only its recorded byte ranges.
+        
+        Args:
+            section (str): Section name
+        """
+        with open(self.file_path, 'rb') as file:
+            if self.section_offsets is None:
+                # parse() has not run yet: only index the sections
+                for _ in self._iter_sections(file, ()):
+                    pass
+            
+            table, fallback = self._section_handlers()[section]
+            for start, end in self.section_offsets.get(section, ()):
+                file.seek(start)
+                content = file.read(end - start).decode('utf-8', 'replace')
+                self._current_name = None
+                self._dispatch_lines(
+                    (line for line in (raw.strip() for raw in content.splitlines()) if line),
+                    table, fallback
+                )
+        logger.info(f"Parsed {len(getattr(self, LAZY_SECTIONS[section]))} entries from section {section}")
+    
+    @property
+    def pads(self):
+        """
+        dict: Pad definitions from $PADS, parsed on first access.
+        
+        Maps pad name -> {'shape', 'drill', 'geometry'}, where geometry is a
+        list of (kind, coordinates) tuples for LINE/ARC/CIRCLE/RECTANGLE.
+        """
+        return self._lazy_section('PADS')
+    
+    @property
+    def padstacks(self):
+        """
+        dict: Padstack definitions from $PADSTACKS, parsed on first access.
+        
+        Maps padstack name -> {'drill', 'pads'}, where pads is a list of
+        {'pad', 'layer', 'rotation', 'mirror'} dictionaries.
+        """
+        return self._lazy_section('PADSTACKS')
+    
+    @property
+    def devices(self):
+        """
+        dict: Device definitions from $DEVICES, parsed on first access.
+        
+        Maps device name -> attributes ('part', 'package', ...), keyed by the
+        lower-case GENCAD keyword.
+        """
+        return self._lazy_section('DEVICES')
+    
+    @property
+    def tracks(self):
+        """
+        dict: Track widths from $TRACKS, parsed on first access.
+        """
+        return self._lazy_section('TRACKS')
+    
+    @property
+    def routes(self):
+        """
+        dict: Routed copper from $ROUTES, parsed on first access.
+        
+        Maps signal name -> {'segments', 'vias'}. Segments are
+        {'kind', 'coords', 'layer', 'track'} dictionaries, vias are
+        {'padstack', 'x', 'y', 'layer', 'drill'} dictionaries.
+        """
+        return self._lazy_section('ROUTES')
+    
+    def _dispatch_lines(self, lines, table, fallback):
+        """
+        Dispatch the lines of one section to the handlers for their keywords.
+        
+        Args:
+            lines: Iterable of stripped lines
+            table (dict): Keyword -> handler taking the rest of the line
+            fallback: Handler taking the whole line for other keywords, or None
+        """
+        for line in lines:
+            parts = line.split(None, 1)
+            handler = table.get(parts[0])
+            if handler is not None:
+                handler(parts[1] if len(parts) > 1 else "")
+            elif fallback is not None:
+                fallback(line)
+    
+    def _split_name(self, text):
+        """
+        Split a leading, optionally quoted, GENCAD name off a line.
+        
+        Args:
+            text (str): Line content following the keyword
+            
+        Returns:
+            tuple: (name, remainder of the line)
+        """
+        if text.startswith('"'):
+            end = text.find('"', 1)
+            if end != -1:
+                return text[1:end], text[end + 1:].strip()
+        parts = text.split(None, 1)
+        if not parts:
+            return "", ""
+        return parts[0], parts[1] if len(parts) > 1 else ""
+    
+    def _parse_header_units(self, rest):
+        """
+        Handle the UNITS keyword of the HEADER section.
+        
+        User units keep their scale, e.g. "USER 1000" for thousandths of an inch.
+        
+        Args:
+            rest (str): Line content following the keyword
+        """
+        parts = rest.split()
+        if parts:
+            self.units = ' '.join(parts[:2] if parts[0].upper() in USER_UNITS else parts[:1])
+    
+    def _parse_board_line(self, rest):
+        """
+        Handle a LINE record of the BOARD section (board outline segment).
+        
+        Args:
+            rest (str): Line content following the keyword
+        """
+        parts = rest.split()
+        if len(parts) >= 4:
+            x1, y1, x2, y2 = map(float, parts[:4])
+            self.board_outline.append((x1, y1, x2, y2))
+    
+    def _parse_board_arc(self, rest):
+        """
+        Handle an ARC record of the BOARD section.
+        
+        Args:
+            rest (str): Line content following the keyword (start x/y, end x/y, center x/y)
+        """
+        parts = rest.split()
+        if len(parts) >= 6:
+            self.board_arcs.append(tuple(map(float, parts[:6])))
+    
+    def _parse_board_circle(self, rest):
+        """
+        Handle a CIRCLE record of the BOARD section.
+        
+        Args:
+            rest (str): Line content following the keyword (center x/y, radius)
+        """
+        parts = rest.split()
+        if len(parts) >= 3:
+            self.board_circles.append(tuple(map(float, parts[:3])))
+    
+    def _parse_shape_start(self, rest):
+        """
+        Handle a SHAPE record, which opens a new shape definition.
+        
+        Args:
+            rest (str): Line content following the keyword
+        """
+        self._current_name, _ = self._split_name(rest)
+        self.shapes[self._current_name] = {'pins': []}
+    
+    def _parse_shape_pin(self, rest):
+        """
+        Handle a PIN record of the current shape.
+        
+        Args:
+            rest (str): Line content following the keyword
+        """
+        if not self._current_name:
+            return
+        pin_name, rest = self._split_name(rest)
+        parts = rest.split()
+        if len(parts) < 3:
+            return
+        
+        self.shapes[self._current_name]['pins'].append({
+            'name': pin_name,
+            'pad': parts[0],
+            'x': float(parts[1]),
+            'y': float(parts[2]),
+            'layer': parts[3] if len(parts) > 3 else "TOP",
+            'rotation': float(parts[4]) if len(parts) > 4 else 0.0
+        })
+    
+    def _parse_component_start(self, rest):
+        """
+        Handle a COMPONENT record, which opens a new component placement.
+        
+        Args:
+            rest (str): Line content following the keyword
+        """
+        self._current_name, _ = self._split_name(rest)
+        self.components[self._current_name] = {
+            'mirror_x': False,
+            'mirror_y': False,
+            'flip': False
+        }
+    
+    def _parse_component_device(self, rest):
+        """
+        Handle the DEVICE record of the current component.
+        
+        Args:
+            rest (str): Line content following the keyword
+        """
+        if self._current_name:
+            self.components[self._current_name]['device'], _ = self._split_name(rest)
+    
+    def _parse_component_place(self, rest):
+        """
+        Handle the PLACE record of the current component.
+        
+        Args:
+            rest (str): Line content following the keyword
+        """
+        parts = rest.split()
+        if self._current_name and len(parts) >= 2:
+            self.components[self._current_name]['x'] = float(parts[0])
+            self.components[self._current_name]['y'] = float(parts[1])
+    
+    def _parse_component_layer(self, rest):
+        """
+        Handle the LAYER record of the current component.
+        
+        Args:
+            rest (str): Line content following the keyword
+        """
+        parts = rest.split()
+        if self._current_name and parts:
+            self.components[self._current_name]['layer'] = parts[0]
+    
+    def _parse_component_rotation(self, rest):
+        """
+        Handle the ROTATION record of the current component.
+        
+        Args:
+            rest (str): Line content following the keyword
+        """
+        if not self._current_name:
+            return
+        rotation = rest.split()[0] if rest else rest
+        try:
+            self.components[self._current_name]['rotation'] = float(rotation)
+        except ValueError:
+            logger.warning(f"Invalid rotation value for component {self._current_name}: {rotation}")
+            self.components[self._current_name]['rotation'] = 0.0
+    
+    def _parse_component_shape(self, rest):
+        """
+        Handle the SHAPE record of the current component.
+        
+        Args:
+            rest (str): Line content following the keyword
+        """
+        if self._current_name:
+            self.components[self._current_name]['shape'], _ = self._split_name(rest)
+    
+    def _parse_component_flags(self, line):
+        """
+        Check any other COMPONENTS line for mirroring and flipping flags.
+        
+        Args:
+            line (str): Complete line
+        """
+        if not self._current_name:
+            return
+        component = self.components[self._current_name]
+        if "MIRRORX" in line:
+            component['mirror_x'] = True
+        if "MIRRORY" in line:
+            component['mirror_y'] = True
+        if "FLIP" in line:
+            component['flip'] = True
+    
+    def _parse_signal_start(self, rest):
+        """
+        Handle a SIGNAL record, which opens a new net.
+        
+        Args:
+            rest (str): Line content following the keyword
+        """
+        self._current_name, _ = self._split_name(rest)
+    
+    def _parse_signal_node(self, rest):
+        """
+        Handle a NODE record (component pin) of the current signal.
+        
+        Args:
+            rest (str): Line content following the keyword
+        """
+        if not self._current_name:
+            return
+        component, rest = self._split_name(rest)
+        pin, _ = self._split_name(rest)
+        if component and pin:
+            self.signals[self._current_name].append((component, pin))
+            self.signal_index.setdefault((component, pin), self._current_name)
+    
+    def _parse_pad_start(self, rest):
+        """
+        Handle a PAD record of the PADS section.
+        
+        Args:
+            rest (str): Line content following the keyword (name, shape, drill)
+        """
+        self._current_name, rest = self._split_name(rest)
+        parts = rest.split()
+        self._pads[self._current_name] = {
+            'shape': parts[0] if parts else "",
+            'drill': float(parts[1]) if len(parts) > 1 else 0.0,
+            'geometry': []
+        }
+    
+    def _parse_pad_geometry(self, kind, rest):
+        """
+        Handle a LINE/ARC/CIRCLE/RECTANGLE record of the current pad.
+        
+        Args:
+            kind (str): Record keyword
+            rest (str): Line content following the keyword
+        """
+        if self._current_name:
+            coords = tuple(float(value) for value in rest.split())
+            self._pads[self._current_name]['geometry'].append((kind, coords))
+    
+    def _parse_padstack_start(self, rest):
+        """
+        Handle a PADSTACK record of the PADSTACKS section.
+        
+        Args:
+            rest (str): Line content following the keyword (name, drill)
+        """
+        self._current_name, rest = self._split_name(rest)
+        parts = rest.split()
+        self._padstacks[self._current_name] = {
+            'drill': float(parts[0]) if parts else 0.0,
+            'pads': []
+        }
+    
+    def _parse_padstack_pad(self, rest):
+        """
+        Handle a PAD record of the current padstack.
+        
+        Args:
+            rest (str): Line content following the keyword (pad, layer, rotation, mirror)
+        """
+        if not self._current_name:
+            return
+        pad, rest = self._split_name(rest)
+        parts = rest.split()
+        self._padstacks[self._current_name]['pads'].append({
+            'pad': pad,
+            'layer': parts[0] if parts else "TOP",
+            'rotation': float(parts[1]) if len(parts) > 1 else 0.0,
+            'mirror': parts[2] if len(parts) > 2 else "0"
+        })
+    
+    def _parse_device_start(self, rest):
+        """
+        Handle a DEVICE record of the DEVICES section.
+        
+        Args:
+            rest (str): Line content following the keyword
+        """
+        self._current_name, _ = self._split_name(rest)
+        self._devices[self._current_name] = {}
+    
+    def _parse_device_attribute(self, line):
+        """
+        Handle any other record (PART, PACKAGE, VALUE, PINDESC, ...) of the current device.
+        
+        PINDESC and PINFUNCT records are collected into pin -> text dictionaries.
+        
+        Args:
+            line (str): Complete line
+        """
+        if not self._current_name:
+            return
+        parts = line.split(None, 1)
+        keyword = parts[0].lower()
+        rest = parts[1] if len(parts) > 1 else ""
+        device = self._devices[self._current_name]
+        if keyword in ('pindesc', 'pinfunct'):
+            pin, rest = self._split_name(rest)
+            device.setdefault(keyword, {})[pin] = self._split_name(rest)[0]
+        else:
+            value, remainder = self._split_name(rest)
+            device[keyword] = f"{value} {remainder}" if remainder else value
+    
+    def _parse_track(self, rest):
+        """
+        Handle a TRACK record of the TRACKS section.
+        
+        Args:
+            rest (str): Line content following the keyword (name, width)
+        """
+        name, rest = self._split_name(rest)
+        parts = rest.split()
+        self._tracks[name] = float(parts[0]) if parts else 0.0
+    
+    def _parse_route_start(self, rest):
+        """
+        Handle a ROUTE record, which opens the routed copper of a signal.
+        
+        Args:
+            rest (str): Line content following the keyword
+        """
+        self._current_name, _ = self._split_name(rest)
+        self._routes.setdefault(self._current_name, {'segments': [], 'vias': []})
+        self._route_track = None
+        self._route_layer = None
+    
+    def _parse_route_track(self, rest):
+        """
+        Handle a TRACK record of the current route (track width for the following segments).
+        
+        Args:
+            rest (str): Line content following the keyword
+        """
+        self._route_track, _ = self._split_name(rest)
+    
+    def _parse_route_layer(self, rest):
+        """
+        Handle a LAYER record of the current route (layer of the following segments).
+        
+        Args:
+            rest (str): Line content following the keyword
+        """
+        self._route_layer, _ = self._split_name(rest)
+    
+    def _parse_route_segment(self, kind, rest):
+        """
+        Handle a LINE/ARC/CIRCLE record of the current route.
+        
+        Args:
+            kind (str): Record keyword
+            rest (str): Line content following the keyword
+        """
+        if self._current_name:
+            self._routes[self._current_name]['segments'].append({
+                'kind': kind,
+                'coords': tuple(float(value) for value in rest.split()),
+                'layer': self._route_layer,
+                'track': self._route_track
+            })
+    
+    def _parse_route_via(self, rest):
+        """
+        Handle a VIA record of the current route.
+        
+        Args:
+            rest (str): Line content following the keyword (padstack, x, y, layer, drill)
+        """
+        if not self._current_name:
+            return
+        padstack, rest = self._split_name(rest)
+        parts = rest.split()
+        if len(parts) < 2:
+            return
+        self._routes[self._current_name]['vias'].append({
+            'padstack': padstack,
+            'x': float(parts[0]),
+            'y': float(parts[1]),
+            'layer': parts[2] if len(parts) > 2 else "ALL",
+            'drill': float(parts[3]) if len(parts) > 3 else 0.0
+        })
+    
+    def _calculate_pin_positions(self):
+        """
+        Calculate actual pin positions based on component placement and rotation.
+        
+        This method applies the following transformations to pin coordinates:
+        1. Mirroring (if applicable)
+        2. Rotation
+        3. Translation
+        
+        It also determines the pin layer based on the component layer and flip
+        status, then runs the pins of each component through the pipeline.
+        Placement is done in file units and each position is rounded once, to
+        integer nanometres, which is what the pipeline and pins store.
+        
+        Steps 1 and 2 and the layer only depend on the shape and orientation,
+        so they are computed once per (shape, rotation, mirror_x, mirror_y,
+        flip) and kept in transform_cache; placing an instance then only
+        costs a translation. When NumPy is available and there are at least
+        NUMPY_MIN_PLACEMENTS components, the translation is batched per group
+        of components sharing a transform; smaller boards do not pay for
+        importing NumPy.
+        """
+        placements = []
+        for comp_name, comp_data in self.components.items():
+            if 'shape' not in comp_data:
+                logger.warning(f"Component {comp_name} has no shape defined")
+                continue
+                
+            shape_name = comp_data['shape']
+            if shape_name not in self.shapes:
+                logger.warning(f"Shape {shape_name} not found for component {comp_name}")
+                continue
+            
+            placements.append((comp_name, comp_data))
+        
+        self._numpy = get_numpy() if len(placements) >= NUMPY_MIN_PLACEMENTS else None
+        if self._numpy is not None:
+            positions = self._place_pins_numpy(placements)
+        else:
+            positions = self._place_pins_scalar(placements)
+        
+        for (comp_name, comp_data), (xs, ys, layers) in zip(placements, positions):
+            pins = [
+                [pin['name'], x_nm, y_nm, pin_layer]
+                for pin, x_nm, y_nm, pin_layer in zip(self.shapes[comp_data['shape']]['pins'], xs, ys, layers)
+            ]
+            if self.pipeline:
+                pins = self.pipeline.apply(comp_name, pins)
+            
+            for pin_name, x_nm, y_nm, pin_layer in pins:
+                row = self.pins.append(comp_name, pin_name, x_nm, y_nm, pin_layer,
+                                       self.get_signal(comp_name, pin_name))
+                self.pin_index.setdefault((comp_name, pin_name), row)
+        
+        logger.info(f"Transform cache: {self.transform_cache.hits} hits, {self.transform_cache.misses} misses")
+        self.pipeline.log_summary(self.profiler)
+    
+    def _shape_transform(self, comp_data):
+        """
+        Get the mirrored and rotated pin offsets and layers of a component's shape.
+        
+        Args:
+            comp_data (dict): Component data
+            
+        Returns:
+            tuple: (cache key, (x offsets, y offsets, layers)). Offsets are
+            NumPy arrays when NumPy is available, lists otherwise.
+        """
+        key = (
+            comp_data['shape'],
+            comp_data.get('rotation', 0),
+            comp_data.get('mirror_x', False),
+            comp_data.get('mirror_y', False),
+            comp_data.get('flip', False)
+        )
+        offsets = self.transform_cache.get(key)
+        if offsets is not None:
+            return key, offsets
+        
+        shape_name, rotation, mirror_x, mirror_y, flip = key
+        pins = self.shapes[shape_name]['pins']
+        
+        # Determine pin layers
+        layers = []
+        for pin in pins:
+            pin_layer = pin.get('layer', 'TOP')
+            if flip:
+                pin_layer = 'BOTTOM' if pin_layer == 'TOP' else 'TOP'
+            layers.append(pin_layer)
+        
+        np = self._numpy
+        if np is not None:
+            pin_x = np.array([pin['x'] for pin in pins], dtype=np.float64)
+            pin_y = np.array([pin['y'] for pin in pins], dtype=np.float64)
+            if mirror_x:
+                pin_x = -pin_x
+            if mirror_y:
+                pin_y = -pin_y
+            angle_rad = math.radians(rotation)
+            cos_a = math.cos(angle_rad)
+            sin_a = math.sin(angle_rad)
+            offsets = (pin_x * cos_a - pin_y * sin_a, pin_x * sin_a + pin_y * cos_a, layers)
+        else:
+            rel_x, rel_y = [], []
+            for pin in pins:
+                # Apply mirroring if needed
+                pin_x = -pin['x'] if mirror_x else pin['x']
+                pin_y = -pin['y'] if mirror_y else pin['y']
+                
+                # Apply rotation
+                pin_x, pin_y = self._rotate_point(pin_x, pin_y, rotation)
+                rel_x.append(pin_x)
+                rel_y.append(pin_y)
+            offsets = (rel_x, rel_y, layers)
+        
+        self.transform_cache.put(key, offsets)
+        return key, offsets
+    
+    def _place_pins_scalar(self, placements):
+        """
+        Translate the cached shape transforms to every component one pin at a time.
+        
+        Args:
+            placements (list): (component name, component data) tuples
+            
+        Returns:
+            list: (x_nm list, y_nm list, layer list) per placement, in shape pin order
+        """
+        scale = self.nm_per_file_unit
+        positions = []
+        for comp_name, comp_data in placements:
+            comp_x = comp_data['x']
+            comp_y = comp_data['y']
+            _, (rel_x, rel_y, layers) = self._shape_transform(comp_data)
+            
+            # Apply translation
+            positions.append((
+                [round((comp_x + pin_x) * scale) for pin_x in rel_x],
+                [round((comp_y + pin_y) * scale) for pin_y in rel_y],
+                layers
+            ))
+        return positions
+    
+    def _place_pins_numpy(self, placements):
+        """
+        Translate the cached shape transforms to every component with NumPy.
+        
+        Components sharing a transform are translated in a single broadcast.
+        The arithmetic matches the scalar path operation for operation, and
+        rint rounds halves to even like round(), so both produce identical
+        coordinates.
+        
+        Args:
+            placements (list): (component name, component data) tuples
+            
+        Returns:
+            list: (x_nm list, y_nm list, layer list) per placement, in shape pin order
+        """
+        np = self._numpy
+        scale = self.nm_per_file_unit
+        groups = defaultdict(list)
+        offsets = {}
+        for i, (comp_name, comp_data) in enumerate(placements):
+            key, offsets[key] = self._shape_transform(comp_data)
+            groups[key].append(i)
+        
+        positions = [None] * len(placements)
+        for key, indices in groups.items():
+            rel_x, rel_y, layers = offsets[key]
+            comp_x = np.array([placements[i][1]['x'] for i in indices], dtype=np.float64)
+            comp_y = np.array([placements[i][1]['y'] for i in indices], dtype=np.float64)
+            abs_x = np.rint((comp_x[:, None] + rel_x[None, :]) * scale).astype(np.int64).tolist()
+            abs_y = np.rint((comp_y[:, None] + rel_y[None, :]) * scale).astype(np.int64).tolist()
+            
+            for row, i in enumerate(indices):
+                positions[i] = (abs_x[row], abs_y[row], layers)
+        return positions
+    
+    def _rotate_point(self, x, y, angle_deg):
+        """
+        Rotate a point around the origin.
+        
+        Args:
+            x (float): X coordinate
+            y (float): Y coordinate
+            angle_deg (float): Rotation angle in degrees
+            
+        Returns:
+            tuple: Rotated coordinates (x, y)
+        """
+        angle_rad = math.radians(angle_deg)
+        cos_a = math.cos(angle_rad)
+        sin_a = math.sin(angle_rad)
+        
+        new_x = x * cos_a - y * sin_a
+        new_y = x * sin_a + y * cos_a
+        
+        return new_x, new_y
+    
+    def _convert_units(self):
+        """
+        Resolve the file's units and the output units of the pins and the board geometry.
+        
+        Runs once after parsing, before the pins are placed. Shapes and
+        components stay in file units: pins are placed from them and stored
+        in nanometres, and the pin table derives the output coordinates from
+        those. The board outline, arcs and circles and bottom_z are converted
+        the same way, through integer nanometres, into new lists (cached
+        section content is not modified), so every export is written in
+        pin_units without float noise, also when the output units are the
+        file's own. Lazily parsed sections (pads, padstacks, tracks, routes)
+        stay in file units.
+        
+        The coordinates of a file in unknown units are used as they are
+        (taken as millimetres where a length is needed), and output_units is
+        ignored since there is no scale to convert with.
+        """
+        try:
+            self.nm_per_file_unit = nm_per_unit(self.units)
+        except ValueError:
+            logger.warning(f"Unknown units {self.units}, using the coordinates unscaled")
+            self.nm_per_file_unit = NM_PER_UNIT['MM']
+            if self.output_units is not None:
+                logger.warning(f"Cannot convert {self.units} to {self.output_units}, exporting in file units")
+                self.output_units = None
+        
+        if self.output_units is None:
+            self.pins.nm_per_unit = self.nm_per_file_unit
+        else:
+            self.pins.nm_per_unit = nm_per_unit(self.output_units)
+        self.pipeline.set_units(self.pins.nm_per_unit)
+        scale = self.nm_per_file_unit
+        from_nm = self.pins.from_nm
+        
+        def convert(values):
+            return tuple(from_nm(round(value * scale)) for value in values)
+        
+        self.board_outline = [convert(line) for line in self.board_outline]
+        self.board_arcs = [convert(arc) for arc in self.board_arcs]
+        self.board_circles = [convert(circle) for circle in self.board_circles]
+        self.bottom_z = convert((BOTTOM_Z,))[0]
+        if self.output_units is not None and self.output_units != self.units:
+            logger.info(f"Converted coordinates from {self.units} to {self.output_units}")
+    
+    @property
+    def pin_units(self):
+        """
+        str: Units of the pin coordinates and of the exports (output_units, or the file's units)
+        """
+        return self.output_units or self.units
+    
+    def get_signal(self, component, pin):
+        """
+        Look up the signal a component pin is connected to.
+        
+        Args:
+            component (str): Component name
+            pin (str): Pin name
+            
+        Returns:
+            str: Signal name or "unconnected" if not found
+        """
+        return self.signal_index.get((component, pin), "unconnected")
+    
+    def get_pin(self, component, pin):
+        """
+        Look up the placed pin data for a component pin.
+        
+        If a component has several pins with the same name, the first placed
+        one is returned.
+        
+        Args:
+            component (str): Component name
+            pin (str): Pin name
+            
+        Returns:
+            PinRow: View of the pin, or None if the pin was not placed
+        """
+        row = self.pin_index.get((component, pin))
+        return None if row is None else self.pins[row]
+    
+    def spatial_index(self, cell_size=None):
+        """
+        Build a spatial index over the placed pins.
+        
+        Args:
+            cell_size (float): Grid cell size (default: derived from pin density)
+            
+        Returns:
+            PinSpatialIndex: Index for radius, nearest and clearance queries
+        """
+        return PinSpatialIndex(self.pins, cell_size)
+    
+    @contextmanager
+    def _open_output(self, output_path, binary=False, buffering=-1):
+        """
+        Open an output file for atomic, write-if-changed replacement.
+        
+        Data is written to a temporary file in the same directory. On success
+        the temporary file replaces output_path only if the content differs,
+        so readers never see a half-written file and unchanged outputs keep
+        their modification time.
+        
+        Args:
+            output_path (str): Path to the output file
+            binary (bool): Open in binary mode instead of text mode for csv
+            buffering (int): Buffer size passed to open() (default: the system default)
+            
+        Yields:
+            file: Writable file object
+        """
+        directory = os.path.dirname(os.path.abspath(output_path))
+        tmp_path = os.path.join(directory, f".{os.path.basename(output_path)}.{os.getpid()}.tmp")
+        try:
+            if binary:
+                handle = open(tmp_path, 'wb', buffering=buffering)
+            else:
+                handle = open(tmp_path, 'w', newline='', buffering=buffering)
+            with handle:
+                yield handle
+            
+            if os.path.isfile(output_path) and filecmp.cmp(tmp_path, output_path, shallow=False):
+                os.remove(tmp_path)
+                logger.info(f"{output_path} is unchanged")
+            else:
+                os.replace(tmp_path, output_path)
+                self.changed_outputs.append(output_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    def export_to_csv(self, output_path):
+        """
+        Export pin data to CSV file.
+        
+        Args:
+            output_path (str): Path to the output CSV file
+            
+        Raises:
+            Exception: If there is an error exporting to CSV
+        """
+        try:
+            pins = self.pins
+            with self._open_output(output_path) as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(['component', 'pin_name', 'x', 'y', 'layer', 'signal'])
+                writer.writerows(zip(
+                    pins.column('component'), pins.column('pin_name'), pins.x, pins.y,
+                    pins.column('layer'), pins.column('signal')
+                ))
+            
+            logger.info(f"Exported {len(self.pins)} pins to {output_path}")
+        except Exception as e:
+            logger.error(f"Error exporting pins to CSV: {str(e)}", exc_info=True)
+            raise
+        
+    def iter_connections(self, topology='all-pairs'):
+        """
+        Generate the pin-to-pin connections of every signal.
+        
+        Args:
+            topology (str): How the pins of a net are connected, one of TOPOLOGIES:
+                - all-pairs: every pair of pins
+                - mst: Euclidean minimum spanning tree
+                - star: every pin to the pin closest to the net centroid
+                - chain: nearest-neighbour path starting at the leftmost pin
+                
+        Yields:
+            tuple: (signal name, pin row 1, pin row 2)
+            
+        Raises:
+            ValueError: If the topology is unknown
+        """
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Unknown connection topology: {topology}")
+        
+        pins = self.pins
+        xs, ys = pins.x_nm, pins.y_nm  # Exact, so ties between equal distances break the same way in any unit
+        
+        # Group pins by signal
+        signal_pins = defaultdict(list)
+        for row, signal in enumerate(pins.column('signal')):
+            if signal != "unconnected":
+                signal_pins[signal].append(row)
+        
+        for signal, rows in signal_pins.items():
+            if topology == 'all-pairs':
+                for i in range(len(rows)):
+                    for j in range(i+1, len(rows)):
+                        yield signal, rows[i], rows[j]
+                continue
+            if len(rows) < 2:
+                continue
+            
+            px = [xs[row] for row in rows]
+            py = [ys[row] for row in rows]
+            if topology == 'mst':
+                edges = euclidean_mst(px, py)
+            elif topology == 'star':
+                cx = sum(px) / len(px)
+                cy = sum(py) / len(py)
+                hub = min(range(len(rows)), key=lambda i: (px[i] - cx) ** 2 + (py[i] - cy) ** 2)
+                edges = [(hub, i) for i in range(len(rows)) if i != hub]
+            else:
+                edges = nearest_neighbour_chain(px, py)
+            for i, j in edges:
+                yield signal, rows[i], rows[j]
+    
+    def export_connections_to_csv(self, output_path, topology='all-pairs'):
+        """
+        Export connection data to CSV file.
+        
+        Rows are streamed to the file as they are generated.
+        
+        Args:
+            output_path (str): Path to the output CSV file
+            topology (str): Connection topology per net, see iter_connections
+            
+        Raises:
+            Exception: If there is an error exporting to CSV
+        """
+        try:
+            pins = self.pins
+            components = pins.column('component')
+            pin_names = pins.column('pin_name')
+            layers = pins.column('layer')
+            xs, ys = pins.x, pins.y
+            count = 0
+            
+            def rows():
+                nonlocal count
+                for signal, a, b in self.iter_connections(topology):
+                    count += 1
+                    yield (
+                        signal,
+                        components[a], pin_names[a], xs[a], ys[a], layers[a],
+                        components[b], pin_names[b], xs[b], ys[b], layers[b]
+                    )
+            
+            with self._open_output(output_path) as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(['signal', 'component1', 'pin1', 'x1', 'y1', 'layer1', 'component2', 'pin2', 'x2', 'y2', 'layer2'])
+                writer.writerows(rows())
+            
+            self.profiler.count('connections', count)
+            logger.info(f"Exported {count} connections ({topology}) to {output_path}")
+        except Exception as e:
+            logger.error(f"Error exporting connections to CSV: {str(e)}", exc_info=True)
+            raise
+
+    def export_netlist_to_csv(self, output_path):
+        """
+        Export netlist data to CSV file.
+        
+        Args:
+            output_path (str): Path to the output CSV file
+            
+        Raises:
+            Exception: If there is an error exporting to CSV
+        """
+        try:
+            netlist = []
+            
+            # Create a list of all placed pins in each signal
+            for signal_name, connections in self.signals.items():
+                signal_pins = [
+                    f"{component}:{pin}" for component, pin in connections
+                    if (component, pin) in self.pin_index
+                ]
+                netlist.append((signal_name, len(signal_pins), ', '.join(signal_pins)))
+            
+            # Export to CSV
+            with self._open_output(output_path) as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(['signal', 'pin_count', 'components'])
+                writer.writerows(netlist)
+            
+            logger.info(f"Exported {len(netlist)} nets to {output_path}")
+        except Exception as e:
+            logger.error(f"Error exporting netlist to CSV: {str(e)}", exc_info=True)
+            raise
+
+    def outline_loops(self, tolerance=None, arc_tolerance=None, simplify=None):
+        """
+        Chain the board outline into ordered polylines.
+        
+        LINE segments and tessellated ARC records are joined end to end,
+        CIRCLE records become loops of their own. Points and tolerances are
+        in output units (see pin_units). Closed loops that are not inside any
+        other loop (or inside an even number of them) are outer outlines and
+        are oriented counterclockwise; the others are cutouts and are
+        oriented clockwise.
+        
+        Args:
+            tolerance (float): Maximum gap between joined endpoints (default: 0.001 mm)
+            arc_tolerance (float): Maximum chord-to-arc distance when tessellating (default: 0.01 mm)
+            simplify (float): Douglas-Peucker tolerance, or None to keep every point
+            
+        Returns:
+            list: Dictionaries with 'kind' ('outer', 'inner' or 'open'), 'closed'
+            and 'points' ((x, y) tuples, first point not repeated for closed loops)
+        """
+        mm = self.pins.nm_per_unit / NM_PER_UNIT['MM']
+        if tolerance is None:
+            tolerance = 0.001 / mm
+        if arc_tolerance is None:
+            arc_tolerance = 0.01 / mm
+        
+        polylines = [[(x1, y1), (x2, y2)] for x1, y1, x2, y2 in self.board_outline]
+        polylines.extend(tessellate_arc(*arc, arc_tolerance) for arc in self.board_arcs)
+        chains = chain_segments(polylines, tolerance)
+        chains.extend((tessellate_circle(*circle, arc_tolerance), True) for circle in self.board_circles)
+        
+        loops = []
+        for points, closed in chains:
+            if simplify:
+                points = simplify_polyline(points, simplify, closed)
+            loops.append({'kind': 'open', 'closed': closed, 'points': points})
+        
+        closed_loops = [loop for loop in loops if loop['closed']]
+        boxes = []
+        for loop in closed_loops:
+            xs = [x for x, _ in loop['points']]
+            ys = [y for _, y in loop['points']]
+            boxes.append((min(xs), min(ys), max(xs), max(ys)))
+        for loop in closed_loops:
+            x, y = loop['points'][0]
+            # Bounding boxes rule out most pairs before the full polygon test
+            depth = sum(
+                1 for other, (x0, y0, x1, y1) in zip(closed_loops, boxes)
+                if other is not loop and x0 <= x <= x1 and y0 <= y <= y1
+                and point_in_polygon(x, y, other['points'])
+            )
+            loop['kind'] = 'inner' if depth % 2 else 'outer'
+            counterclockwise = polygon_area(loop['points']) > 0
+            if counterclockwise != (loop['kind'] == 'outer'):
+                loop['points'].reverse()
+        return loops
+    
+    def export_outline_loops_to_csv(self, output_path, simplify=None):
+        """
+        Export the chained board outline, one point per row grouped by loop.
+        
+        Args:
+            output_path (str): Path to the output CSV file
+            simplify (float): Douglas-Peucker tolerance, or None to keep every point
+            
+        Raises:
+            Exception: If there is an error exporting to CSV
+        """
+        try:
+            loops = self.outline_loops(simplify=simplify)
+            with self._open_output(output_path) as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(['loop', 'kind', 'closed', 'vertex', 'x', 'y'])
+                for number, loop in enumerate(loops):
+                    writer.writerows(
+                        (number, loop['kind'], int(loop['closed']), vertex, x, y)
+                        for vertex, (x, y) in enumerate(loop['points'])
+                    )
+            
+            points = sum(len(loop['points']) for loop in loops)
+            logger.info(f"Exported {len(loops)} outline loops with {points} points to {output_path}")
+        except Exception as e:
+            logger.error(f"Error exporting outline loops to CSV: {str(e)}", exc_info=True)
+            raise
+    
+    def export_net_metrics_csv(self, output_path):
+        """
+        Export the per-net wirelength metrics, see metrics.net_metrics.
+        
+        Args:
+            output_path (str): Path to the output CSV file
+            
+        Returns:
+            dict: Board totals of net_metrics
+            
+        Raises:
+            Exception: If there is an error exporting to CSV
+        """
+        try:
+            with self.profiler.stage('net_metrics'):
+                rows, totals = net_metrics(self)
+            with self._open_output(output_path) as csvfile:
+                writer = csv.DictWriter(csvfile, fieldnames=NET_METRIC_FIELDS)
+                writer.writeheader()
+                writer.writerows(rows)
+            
+            logger.info(f"Exported metrics of {totals['nets']} nets to {output_path} "
+                        f"(HPWL {totals['hpwl']:.4f}, MST {totals['mst_length']:.4f} {self.pin_units})")
+            return totals
+        except Exception as e:
+            logger.error(f"Error exporting net metrics to CSV: {str(e)}", exc_info=True)
+            raise
+    
+    def export_board_outline_to_csv(self, output_path):
+        """
+        Export board outline to CSV file.
+        
+        Args:
+            output_path (str): Path to the output CSV file
+            
+        Raises:
+            Exception: If there is an error exporting to CSV
+        """
+        try:
+            with self._open_output(output_path) as csvfile:
+                fieldnames = ['x1', 'y1', 'x2', 'y2']
+                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+                
+                writer.writeheader()
+                for x1, y1, x2, y2 in self.board_outline:
+                    writer.writerow({
+                        'x1': x1,
+                        'y1': y1,
+                        'x2': x2,
+                        'y2': y2
+                    })
+            
+            logger.info(f"Exported board outline with {len(self.board_outline)} segments to {output_path}")
+        except Exception as e:
+            logger.error(f"Error exporting board outline to CSV: {str(e)}", exc_info=True)
+            raise
+
+    def export_applied_stages_csv(self, pins_path, applied=None):
+        """
+        Record the pin stages applied to an exported pin file in its sidecar file.
+        
+        The sidecar (see applied_stages_path) has a component and a stages
+        column, listing the labels of the stages that changed each component
+        joined with '|' (see PinPipeline.applied). It is written even when no
+        stage changed anything, so that swap_diode_pins.py can tell the pins
+        of this export from those of older exports.
+        
+        Args:
+            pins_path (str): Path of the exported pin file
+            applied (dict): Component name -> joined stage labels (default:
+                self.pipeline.applied)
+            
+        Returns:
+            str: Path of the sidecar file
+        """
+        output_path = applied_stages_path(pins_path)
+        with self._open_output(output_path) as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(['component', 'stages'])
+            writer.writerows((self.pipeline.applied if applied is None else applied).items())
+        return output_path
+    
+    def export_houdini_csv(self, output_path):
+        """
+        Export pin data to a single CSV file optimized for Houdini's tableimport.
+        
+        Creates a CSV where each row is a pin with position, metadata, and connection attributes.
+        The pin id is the row index in the pin table and z places bottom layer pins at
+        bottom_z. The pin stages that were applied are recorded in a sidecar file (see
+        export_applied_stages_csv). The file is written by the houdini format of export_all.
+        
+        Args:
+            output_path (str): Path to the output CSV file
+            
+        Raises:
+            Exception: If there is an error exporting to CSV
+        """
+        self._write_formats({'houdini': output_path})
+        logger.info(f"Exported {len(self.pins)} pins to single Houdini-friendly CSV: {output_path}")
+    
+    def _z_column(self, layers):
+        """
+        Get the z coordinate of every pin for the 3D exports.
+        
+        Args:
+            layers (list): Layer name of every pin
+            
+        Returns:
+            list: 0.0 for TOP pins, bottom_z for all others
+        """
+        bottom_z = self.bottom_z
+        return [0.0 if layer == 'TOP' else bottom_z for layer in layers]
+    
+    def net_order(self):
+        """
+        Order the pins by net for the net-indexed Houdini schema.
+        
+        Nets are numbered in the order of self.signals, counting only nets
+        with placed pins and skipping "unconnected"; within a net, pins keep
+        their pin table order. Pins without a net come last.
+        
+        Returns:
+            tuple: (pin rows in net order, list of (net name, first position,
+            pin count) indexed by net id, number of pins with a net)
+        """
+        pins = self.pins
+        net_ids = {}
+        for signal in self.signals:
+            signal_id = pins.string_id(signal)
+            if signal != "unconnected" and signal_id is not None:
+                net_ids.setdefault(signal_id, len(net_ids))
+        
+        buckets = [[] for _ in net_ids]
+        loose = []
+        for row, signal_id in enumerate(pins.signal_ids):
+            net_id = net_ids.get(signal_id)
+            if net_id is None:
+                loose.append(row)
+            else:
+                buckets[net_id].append(row)
+        
+        order = []
+        nets = []
+        strings = pins.strings
+        for signal_id, net_id in net_ids.items():
+            rows = buckets[net_id]
+            if rows:
+                nets.append((strings[signal_id], len(order), len(rows)))
+                order.extend(rows)
+        connected = len(order)
+        order.extend(loose)
+        return order, nets, connected
+    
+    def export_houdini_net_csv(self, pins_path=None, nets_path=None):
+        """
+        Export pin data in the net-indexed Houdini schema.
+        
+        Unlike export_houdini_csv, connectivity is not spelled out per pin:
+        pins are sorted by net (see net_order) and carry an integer net_id
+        and their net_index within the net, so every net is the contiguous
+        id range [first_id, last_id] of the nets table and both files grow
+        linearly with the pin count. id is the position in this file and
+        pin_id the pin's id in the other exports; pins without a net come
+        last with net_id and net_index -1. The pin stages that were applied
+        are recorded as for export_houdini_csv.
+        
+        Args:
+            pins_path (str): Path to the pins CSV file, or None to skip it
+            nets_path (str): Path to the nets CSV file (net_id, name,
+                pin_count, first_id, last_id), or None to skip it
+            
+        Raises:
+            Exception: If there is an error exporting to CSV
+        """
+        try:
+            pins = self.pins
+            order, nets, connected = self.net_order()
+            
+            if pins_path is not None:
+                net_ids = []
+                net_indices = []
+                for net_id, (_, _, count) in enumerate(nets):
+                    net_ids.extend([net_id] * count)
+                    net_indices.extend(range(count))
+                net_ids.extend([-1] * (len(order) - connected))
+                net_indices.extend([-1] * (len(order) - connected))
+                
+                strings = pins.strings
+                xs, ys = pins.x, pins.y
+                bottom_z = self.bottom_z
+                with self._open_output(pins_path, buffering=EXPORT_BUFFER_SIZE) as csvfile:
+                    writer = csv.writer(csvfile)
+                    writer.writerow(['id', 'pin_id', 'x', 'y', 'z', 'component', 'pin_name', 'layer', 'signal',
+                                     'net_id', 'net_index'])
+                    writer.writerows(
+                        (i, row, xs[row], ys[row], 0.0 if strings[pins.layer_ids[row]] == 'TOP' else bottom_z,
+                         strings[pins.component_ids[row]], strings[pins.pin_name_ids[row]],
+                         strings[pins.layer_ids[row]], strings[pins.signal_ids[row]], net_id, net_index)
+                        for i, (row, net_id, net_index) in enumerate(zip(order, net_ids, net_indices))
+                    )
+                self.export_applied_stages_csv(pins_path)
+            
+            if nets_path is not None:
+                with self._open_output(nets_path) as csvfile:
+                    writer = csv.writer(csvfile)
+                    writer.writerow(['net_id', 'name', 'pin_count', 'first_id', 'last_id'])
+                    writer.writerows(
+                        (net_id, name, count, first, first + count - 1)
+                        for net_id, (name, first, count) in enumerate(nets)
+                    )
+            
+            logger.info(f"Exported {len(order)} pins on {len(nets)} nets in the net-indexed Houdini schema")
+        except Exception as e:
+            logger.error(f"Error exporting net-indexed Houdini CSV: {str(e)}", exc_info=True)
+            raise
+    
+    def export_all(self, output_dir=None, base_name=None, formats=DEFAULT_EXPORT_FORMATS, topology='all-pairs',
+                   simplify=None, threads=False, dxf_version='R2000'):
+        """
+        Write several output formats in one pass over the data.
+        
+        The decoded pin columns, the per-net pin rows and the connections are
+        computed once and shared by all selected formats: one walk over the
+        nets fills the netlist, connections and the Houdini connection
+        columns, and one walk over the pins writes the pin and Houdini rows.
+        Parser state is not modified. The files get the same content as the
+        corresponding export_* methods, written through large buffered
+        handles, and with threads=True each CSV is formatted and written by
+        its own background thread. The houdini and houdini_net_pins formats
+        also record the applied pin stages next to their file (see
+        export_applied_stages_csv).
+        
+        Args:
+            output_dir (str): Output directory (default: the directory of the GENCAD file)
+            base_name (str): File name prefix (default: the GENCAD file name without extension)
+            formats (iterable): Keys of EXPORT_FORMATS
+            topology (str): Connection topology per net, see iter_connections
+            simplify (float): Douglas-Peucker tolerance for the outline loops, or None
+            threads (bool): Write the CSV files on background threads
+            dxf_version (str): DXF version of the dxf format, see export_dxf
+        
+        Returns:
+            dict: Format -> output path, in the order of formats
+            
+        Raises:
+            ValueError: If a format or the topology is unknown
+            ImportError: If npz is requested without NumPy
+            Exception: If there is an error exporting
+        """
+        formats = list(dict.fromkeys(formats))
+        unknown = [fmt for fmt in formats if fmt not in EXPORT_FORMATS]
+        if unknown:
+            raise ValueError(f"Unknown export format(s): {', '.join(unknown)}")
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Unknown connection topology: {topology}")
+        if output_dir is None:
+            output_dir = os.path.dirname(os.path.abspath(self.file_path))
+        if base_name is None:
+            base_name = os.path.splitext(os.path.basename(self.file_path))[0]
+        paths = {fmt: os.path.join(output_dir, f"{base_name}_{EXPORT_FORMATS[fmt]}") for fmt in formats}
+        self._write_formats(paths, topology, simplify, threads, dxf_version)
+        logger.info(f"Exported {len(self.pins)} pins to {len(paths)} files ({', '.join(formats)}) in {output_dir}")
+        return paths
+    
+    def _write_formats(self, paths, topology='all-pairs', simplify=None, threads=False, dxf_version='R2000'):
+        """
+        Write export formats to the given paths in one pass over the data (see export_all).
+        
+        Args:
+            paths (dict): Format -> output path
+            topology (str): Connection topology per net, see iter_connections
+            simplify (float): Douglas-Peucker tolerance for the outline loops, or None
+            threads (bool): Write the CSV files on background threads
+            dxf_version (str): DXF version of the dxf format, see export_dxf
+            
+        Raises:
+            Exception: If there is an error exporting
+        """
+        try:
+            pins = self.pins
+            n = len(pins)
+            components = pins.column('component')
+            pin_names = pins.column('pin_name')
+            layers = pins.column('layer')
+            signals = pins.column('signal')
+            xs, ys = pins.x, pins.y
+            binary = 'ply' in paths or 'npz' in paths
+            
+            with ExitStack() as stack:
+                writers = {}
+                for fmt in ('pins', 'connections', 'netlist', 'board_outline', 'houdini'):
+                    if fmt in paths:
+                        handle = stack.enter_context(self._open_output(paths[fmt], buffering=EXPORT_BUFFER_SIZE))
+                        writers[fmt] = stack.enter_context(RowWriter(handle, threaded=threads))
+                pins_out = writers.get('pins')
+                connections_out = writers.get('connections')
+                netlist_out = writers.get('netlist')
+                houdini_out = writers.get('houdini')
+                
+                if 'board_outline' in writers:
+                    writers['board_outline'].writerow(('x1', 'y1', 'x2', 'y2'))
+                    writers['board_outline'].writerows(self.board_outline)
+                
+                # Walk the nets once for the netlist and the Houdini connection columns
+                if netlist_out is not None:
+                    netlist_out.writerow(('signal', 'pin_count', 'components'))
+                if houdini_out is not None:
+                    connected_to = ["[]"] * n
+                    connected_ids = ["[]"] * n
+                if netlist_out is not None or houdini_out is not None:
+                    pin_index = self.pin_index
+                    for signal_name, connections_list in self.signals.items():
+                        rows = [pin_index[key] for key in connections_list if key in pin_index]
+                        labels = [f"{components[row]}:{pin_names[row]}" for row in rows]
+                        if netlist_out is not None:
+                            netlist_out.writerow((signal_name, len(rows), ', '.join(labels)))
+                        if houdini_out is not None and signal_name != "unconnected":
+                            ids = [str(row) for row in rows]
+                            for i, row in enumerate(rows):
+                                connected_to[row] = "|".join(labels[:i] + labels[i+1:])
+                                connected_ids[row] = f"[{','.join(ids[:i] + ids[i+1:])}]"
+                
+                # Connections, collected as edges as well when a binary format needs them
+                columns = None
+                if connections_out is not None:
+                    connections_out.writerow(('signal', 'component1', 'pin1', 'x1', 'y1', 'layer1',
+                                              'component2', 'pin2', 'x2', 'y2', 'layer2'))
+                    edges = array('i')
+                    edge_signals = array('i')
+                    signal_ids = pins.signal_ids
+                    for signal, a, b in self.iter_connections(topology):
+                        connections_out.writerow((
+                            signal,
+                            components[a], pin_names[a], xs[a], ys[a], layers[a],
+                            components[b], pin_names[b], xs[b], ys[b], layers[b]
+                        ))
+                        if binary:
+                            edges.append(a)
+                            edges.append(b)
+                            edge_signals.append(signal_ids[a])
+                    self.profiler.count('connections', connections_out.rows - 1)
+                    if binary:
+                        columns = (self._z_column(layers), edges, edge_signals)
+                
+                # Walk the pins once for the pin and Houdini rows
+                if pins_out is not None:
+                    pins_out.writerow(('component', 'pin_name', 'x', 'y', 'layer', 'signal'))
+                    pins_out.writerows(zip(components, pin_names, xs, ys, layers, signals))
+                if houdini_out is not None:
+                    z = columns[0] if columns else self._z_column(layers)
+                    houdini_out.writerow(HOUDINI_FIELDS)
+                    houdini_out.writerows(zip(range(n), xs, ys, z, components, pin_names, layers, signals,
+                                              connected_to, connected_ids))
+            
+            if 'houdini' in paths:
+                self.export_applied_stages_csv(paths['houdini'])
+            if 'outline_loops' in paths:
+                self.export_outline_loops_to_csv(paths['outline_loops'], simplify=simplify)
+            if binary and columns is None:
+                columns = self._binary_columns(topology)
+            if 'ply' in paths:
+                self.export_houdini_ply(paths['ply'], topology=topology, columns=columns)
+            if 'npz' in paths:
+                self.export_npz(paths['npz'], topology=topology, columns=columns)
+            if 'dxf' in paths:
+                self.export_dxf(paths['dxf'], dxf_version, topology=topology, simplify=simplify)
+            if 'houdini_net_pins' in paths or 'houdini_nets' in paths:
+                self.export_houdini_net_csv(paths.get('houdini_net_pins'), paths.get('houdini_nets'))
+            if 'net_metrics' in paths:
+                self.export_net_metrics_csv(paths['net_metrics'])
+        except Exception as e:
+            logger.error(f"Error exporting: {str(e)}", exc_info=True)
+            raise
+    
+    def export_clearance_violations_to_csv(self, output_path, min_dist):
+        """
+        Export pairs of pins on different nets that are closer than min_dist.
+        
+        Args:
+            output_path (str): Path to the output CSV file
+            min_dist (float): Minimum allowed center-to-center distance
+            
+        Raises:
+            Exception: If there is an error exporting to CSV
+        """
+        try:
+            pins = self.pins
+            violations = PinSpatialIndex(pins, min_dist).clearance_violations(min_dist)
+            components = pins.column('component')
+            pin_names = pins.column('pin_name')
+            layers = pins.column('layer')
+            signals = pins.column('signal')
+            xs, ys = pins.x, pins.y
+            
+            with self._open_output(output_path) as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(['layer', 'distance', 'signal1', 'component1', 'pin1', 'x1', 'y1',
+                                 'signal2', 'component2', 'pin2', 'x2', 'y2'])
+                writer.writerows(
+                    (layers[a], distance,
+                     signals[a], components[a], pin_names[a], xs[a], ys[a],
+                     signals[b], components[b], pin_names[b], xs[b], ys[b])
+                    for a, b, distance in violations
+                )
+            
+            logger.info(f"Exported {len(violations)} clearance violations below {min_dist} to {output_path}")
+        except Exception as e:
+            logger.error(f"Error exporting clearance violations to CSV: {str(e)}", exc_info=True)
+            raise
+    
+    def _binary_columns(self, topology):
+        """
+        Collect the per-pin columns and connectivity shared by the binary exports.
+        
+        Args:
+            topology (str): Connection topology per net, see iter_connections
+            
+        Returns:
+            tuple: (z list, edge array of vertex index pairs, edge signal index array)
+        """
+        pins = self.pins
+        z = self._z_column(pins.column('layer'))
+        
+        edges = array('i')
+        edge_signals = array('i')
+        for _, a, b in self.iter_connections(topology):
+            edges.append(a)
+            edges.append(b)
+            edge_signals.append(pins.signal_ids[a])
+        return z, edges, edge_signals
+    
+    def export_houdini_ply(self, output_path, topology='all-pairs', columns=None):
+        """
+        Export pin data as a binary little-endian PLY point cloud.
+        
+        Each pin is a vertex with x, y, z, id and integer component, pin_name,
+        layer and signal attributes. The integers index the string table,
+        which is written into the header as "comment string <index> <value>"
+        lines. Connections are written as an edge element (vertex1, vertex2,
+        signal).
+        
+        Args:
+            output_path (str): Path to the output PLY file
+            topology (str): Connection topology per net, see iter_connections
+            columns (tuple): Result of _binary_columns(topology) if already known
+            
+        Raises:
+            Exception: If there is an error exporting to PLY
+        """
+        try:
+            pins = self.pins
+            z, edges, edge_signals = columns or self._binary_columns(topology)
+            
+            header = ["ply", "format binary_little_endian 1.0",
+                      f"comment source {os.path.basename(self.file_path)}",
+                      f"comment units {self.pin_units}"]
+            header.extend(f"comment string {i} {value}" for i, value in enumerate(pins.strings))
+            header.extend([
+                f"element vertex {len(pins)}",
+                "property double x", "property double y", "property double z",
+                "property int id", "property int component", "property int pin_name",
+                "property int layer", "property int signal",
+                f"element edge {len(edge_signals)}",
+                "property int vertex1", "property int vertex2", "property int signal",
+                "end_header"
+            ])
+            
+            np = get_numpy()
+            with self._open_output(output_path, binary=True) as plyfile:
+                plyfile.write(("\n".join(header) + "\n").encode('utf-8'))
+                
+                if np is not None:
+                    vertices = np.empty(len(pins), dtype=[
+                        ('x', '<f8'), ('y', '<f8'), ('z', '<f8'), ('id', '<i4'),
+                        ('component', '<i4'), ('pin_name', '<i4'), ('layer', '<i4'), ('signal', '<i4')
+                    ])
+                    vertices['x'] = pins.x
+                    vertices['y'] = pins.y
+                    vertices['z'] = z
+                    vertices['id'] = np.arange(len(pins))
+                    vertices['component'] = pins.component_ids
+                    vertices['pin_name'] = pins.pin_name_ids
+                    vertices['layer'] = pins.layer_ids
+                    vertices['signal'] = pins.signal_ids
+                    plyfile.write(vertices.tobytes())
+                    
+                    edge_rows = np.empty(len(edge_signals), dtype=[
+                        ('vertex1', '<i4'), ('vertex2', '<i4'), ('signal', '<i4')
+                    ])
+                    pairs = np.asarray(edges, dtype='<i4').reshape(-1, 2)
+                    edge_rows['vertex1'] = pairs[:, 0]
+                    edge_rows['vertex2'] = pairs[:, 1]
+                    edge_rows['signal'] = edge_signals
+                    plyfile.write(edge_rows.tobytes())
+                else:
+                    vertex = struct.Struct('<dddiiiii')
+                    plyfile.write(b''.join(
+                        vertex.pack(*row) for row in zip(
+                            pins.x, pins.y, z, range(len(pins)), pins.component_ids,
+                            pins.pin_name_ids, pins.layer_ids, pins.signal_ids
+                        )
+                    ))
+                    edge = struct.Struct('<iii')
+                    plyfile.write(b''.join(
+                        edge.pack(edges[2 * i], edges[2 * i + 1], signal)
+                        for i, signal in enumerate(edge_signals)
+                    ))
+            
+            logger.info(f"Exported {len(pins)} pins and {len(edge_signals)} connections to binary PLY: {output_path}")
+        except Exception as e:
+            logger.error(f"Error exporting to PLY: {str(e)}", exc_info=True)
+            raise
+    
+    def export_npz(self, output_path, topology='all-pairs', columns=None):
+        """
+        Export pin data as a NumPy .npz archive.
+        
+        The archive holds the per-pin arrays x, y, z, id, component, pin_name,
+        layer and signal (string table indices), the string table itself as
+        strings, and the connectivity as an (n, 2) edges array with a
+        matching edge_signal array.
+        
+        Args:
+            output_path (str): Path to the output .npz file
+            topology (str): Connection topology per net, see iter_connections
+            columns (tuple): Result of _binary_columns(topology) if already known
+            
+        Raises:
+            ImportError: If NumPy is not installed
+            Exception: If there is an error exporting to .npz
+        """
+        np = get_numpy()
+        if np is None:
+            raise ImportError("NumPy is required for the .npz export")
+        try:
+            pins = self.pins
+            z, edges, edge_signals = columns or self._binary_columns(topology)
+            with self._open_output(output_path, binary=True) as npzfile:
+                np.savez(
+                    npzfile,
+                    x=np.frombuffer(pins.x, dtype=np.float64),
+                    y=np.frombuffer(pins.y, dtype=np.float64),
+                    z=np.asarray(z, dtype=np.float64),
+                    id=np.arange(len(pins), dtype=np.int32),
+                    component=np.frombuffer(pins.component_ids, dtype=np.int32),
+                    pin_name=np.frombuffer(pins.pin_name_ids, dtype=np.int32),
+                    layer=np.frombuffer(pins.layer_ids, dtype=np.int32),
+                    signal=np.frombuffer(pins.signal_ids, dtype=np.int32),
+                    strings=np.asarray(pins.strings, dtype=str),
+                    edges=np.asarray(edges, dtype=np.int32).reshape(-1, 2),
+                    edge_signal=np.asarray(edge_signals, dtype=np.int32)
+                )
+            logger.info(f"Exported {len(pins)} pins and {len(edge_signals)} connections to {output_path}")
+        except Exception as e:
+            logger.error(f"Error exporting to .npz: {str(e)}", exc_info=True)
+            raise
+    
+    def export_dxf(self, output_path, version='R2000', topology='mst', pin_radius=None, simplify=None):
+        """
+        Export the pins, the ratsnest and the board outline as a DXF drawing.
+        
+        Pins are POINT entities, or CIRCLE entities with pin_radius, on one
+        layer per copper side and net (PINS_<layer>_<signal>). Connections
+        are LINE entities on RATSNEST and the chained outline loops are
+        polylines on OUTLINE. Entities are streamed to the file by
+        DxfWriter, so memory does not grow with the pin or connection count.
+        Coordinates are in output units, see pin_units.
+        
+        Args:
+            output_path (str): Path to the output DXF file
+            version (str): DXF version, 'R12' or 'R2000'
+            topology (str): Connection topology of the ratsnest, see iter_connections
+            pin_radius (float): Circle radius of the pins in output units, or None for points
+            simplify (float): Douglas-Peucker tolerance for the outline loops, or None
+        
+        Raises:
+            ValueError: If the version or topology is unknown
+            Exception: If there is an error exporting to DXF
+        """
+        if version not in DXF_VERSIONS:
+            raise ValueError(f"Unknown DXF version: {version}")
+        if topology not in TOPOLOGIES:
+            raise ValueError(f"Unknown connection topology: {topology}")
+        try:
+            pins = self.pins
+            strings = pins.strings
+            
+            # Layers of the (copper side, signal) pairs in use
+            pin_layers = {}
+            for layer_id, signal_id in set(zip(pins.layer_ids, pins.signal_ids)):
+                pin_layers[layer_id, signal_id] = dxf_layer_name(
+                    f"PINS_{strings[layer_id]}_{strings[signal_id]}", version)
+            colours = {'TOP': 1, 'BOTTOM': 5}
+            layers = {'OUTLINE': 7, 'RATSNEST': 2}
+            for (layer_id, _), name in sorted(pin_layers.items(), key=itemgetter(1)):
+                layers.setdefault(name, colours.get(strings[layer_id], 3))
+            loops = self.outline_loops(simplify=simplify)
+            
+            with self._open_output(output_path, buffering=EXPORT_BUFFER_SIZE) as dxffile:
+                with DxfWriter(dxffile, version, layers, self.pin_units) as drawing:
+                    for loop in loops:
+                        drawing.polyline(loop['points'], 'OUTLINE', loop['closed'])
+                    xs, ys = pins.x, pins.y
+                    for x, y, layer_id, signal_id in zip(xs, ys, pins.layer_ids, pins.signal_ids):
+                        if pin_radius:
+                            drawing.circle(x, y, pin_radius, pin_layers[layer_id, signal_id])
+                        else:
+                            drawing.point(x, y, pin_layers[layer_id, signal_id])
+                    connections = 0
+                    for _, a, b in self.iter_connections(topology):
+                        drawing.line(xs[a], ys[a], xs[b], ys[b], 'RATSNEST')
+                        connections += 1
+            
+            logger.info(f"Exported {len(pins)} pins, {connections} connections ({topology}) and "
+                        f"{len(loops)} outline loops to DXF {version}: {output_path}")
+        except Exception as e:
+            logger.error(f"Error exporting to DXF: {str(e)}", exc_info=True)
+            raise
+
+
+# The parsed form of a GENCAD file, as returned by gencad.load()
+Board = GencadParser
@@ -0,0 +1,463 @@
+"""
+Columnar storage and spatial indexing of placed pins.
+"""
+
+import math
+import heapq
+from array import array
+from collections import defaultdict
+
+
+class PinRow:
+    """
+    Lightweight view of one row of a PinTable.
+    
+    Attributes can be read as properties (row.x) or dictionary style
+    (row['x']) so that code written against the former per-pin dictionaries
+    keeps working. Writing a field updates the underlying table.
+    """
+    
+    __slots__ = ('_table', 'id')
+    
+    def __init__(self, table, index):
+        self._table = table
+        self.id = index
+    
+    @property
+    def component(self):
+        return self._table.strings[self._table.component_ids[self.id]]
+    
+    @component.setter
+    def component(self, value):
+        self._table.component_ids[self.id] = self._table.intern(value)
+    
+    @property
+    def pin_name(self):
+        return self._table.strings[self._table.pin_name_ids[self.id]]
+    
+    @pin_name.setter
+    def pin_name(self, value):
+        self._table.pin_name_ids[self.id] = self._table.intern(value)
+    
+    @property
+    def x(self):
+        return self._table.x[self.id]
+    
+    @x.setter
+    def x(self, value):
+        self._table.x_nm[self.id] = self._table.to_nm(value)
+        self._table._x = None
+    
+    @property
+    def y(self):
+        return self._table.y[self.id]
+    
+    @y.setter
+    def y(self, value):
+        self._table.y_nm[self.id] = self._table.to_nm(value)
+        self._table._y = None
+    
+    @property
+    def layer(self):
+        return self._table.strings[self._table.layer_ids[self.id]]
+    
+    @layer.setter
+    def layer(self, value):
+        self._table.layer_ids[self.id] = self._table.intern(value)
+    
+    @property
+    def signal(self):
+        return self._table.strings[self._table.signal_ids[self.id]]
+    
+    @signal.setter
+    def signal(self, value):
+        self._table.signal_ids[self.id] = self._table.intern(value)
+    
+    def __getitem__(self, key):
+        if key not in PinTable.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __setitem__(self, key, value):
+        if key not in PinTable.FIELDS or key == 'id':
+            raise KeyError(key)
+        setattr(self, key, value)
+    
+    def keys(self):
+        return PinTable.FIELDS
+    
+    def get(self, key, default=None):
+        return getattr(self, key) if key in PinTable.FIELDS else default
+    
+    def __repr__(self):
+        return f"PinRow({', '.join(f'{key}={self[key]!r}' for key in PinTable.FIELDS)})"
+
+
+class PinTable:
+    """
+    Columnar (struct-of-arrays) storage for placed pins.
+    
+    Coordinates are stored once, as integer nanometres in array('q')
+    columns, so equal positions compare, hash and bucket exactly. The x and
+    y columns are array('d') views in the output unit (nm_per_unit), rounded
+    to decimals places, built on first access and cached until the table
+    changes. Component, pin name, layer and signal columns store indices
+    into a single interned string table, so a pin costs a few machine words
+    instead of a dictionary.
+    
+    Attributes:
+        x_nm (array): X coordinates in nanometres
+        y_nm (array): Y coordinates in nanometres
+        nm_per_unit (float): Nanometres per output unit, the unit of x and y
+        decimals (int): Decimal places of x and y, the finest that is not below a nanometre
+        component_ids (array): String table indices of the component names
+        pin_name_ids (array): String table indices of the pin names
+        layer_ids (array): String table indices of the layers
+        signal_ids (array): String table indices of the signal names
+        strings (list): Interned string table
+    """
+    
+    FIELDS = ('id', 'component', 'pin_name', 'x', 'y', 'layer', 'signal')
+    
+    def __init__(self, nm_per_unit=1000000):
+        """
+        Initialize an empty pin table.
+        
+        Args:
+            nm_per_unit (float): Nanometres per output unit (default: millimetres)
+        """
+        self.x_nm = array('q')
+        self.y_nm = array('q')
+        self._x = None
+        self._y = None
+        self.nm_per_unit = nm_per_unit
+        self.component_ids = array('i')
+        self.pin_name_ids = array('i')
+        self.layer_ids = array('i')
+        self.signal_ids = array('i')
+        self.strings = []
+        self._string_ids = {}
+    
+    @property
+    def nm_per_unit(self):
+        """
+        float: Nanometres per output unit; setting it also sets decimals and rebuilds x and y
+        """
+        return self._nm_per_unit
+    
+    @nm_per_unit.setter
+    def nm_per_unit(self, value):
+        self._nm_per_unit = value
+        self.decimals = max(0, math.floor(math.log10(value)))
+        self._x = self._y = None
+    
+    def intern(self, value):
+        """
+        Get the string table index for a value, adding it if needed.
+        
+        Args:
+            value (str): String to intern
+            
+        Returns:
+            int: Index into the string table
+        """
+        index = self._string_ids.get(value)
+        if index is None:
+            index = self._string_ids[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+    
+    def string_id(self, value):
+        """
+        Get the string table index of a value without adding it.
+        
+        Args:
+            value (str): String to look up
+            
+        Returns:
+            int: Index into the string table, or None if the string is not present
+        """
+        return self._string_ids.get(value)
+    
+    def from_nm(self, value):
+        """
+        Convert a length in nanometres to the output unit.
+        
+        Args:
+            value (float): Length in nanometres
+            
+        Returns:
+            float: Length in the output unit, rounded to decimals places
+        """
+        return round(value / self._nm_per_unit, self.decimals)
+    
+    def to_nm(self, value):
+        """
+        Convert a length in the output unit to integer nanometres.
+        
+        Args:
+            value (float): Length in the output unit
+            
+        Returns:
+            int: Length in nanometres
+        """
+        return round(value * self._nm_per_unit)
+    
+    @property
+    def x(self):
+        """
+        array: X coordinates in the output unit, derived from x_nm and cached
+        """
+        if self._x is None:
+            self._x = array('d', map(self.from_nm, self.x_nm))
+        return self._x
+    
+    @property
+    def y(self):
+        """
+        array: Y coordinates in the output unit, derived from y_nm and cached
+        """
+        if self._y is None:
+            self._y = array('d', map(self.from_nm, self.y_nm))
+        return self._y
+    
+    def append(self, component, pin_name, x_nm, y_nm, layer, signal):
+        """
+        Append a pin to the table.
+        
+        Args:
+            component (str): Component name
+            pin_name (str): Pin name
+            x_nm (int): X coordinate in nanometres
+            y_nm (int): Y coordinate in nanometres
+            layer (str): Layer name
+            signal (str): Signal name
+            
+        Returns:
+            int: Row index (pin id) of the new pin
+        """
+        self.component_ids.append(self.intern(component))
+        self.pin_name_ids.append(self.intern(pin_name))
+        self.x_nm.append(x_nm)
+        self.y_nm.append(y_nm)
+        self.layer_ids.append(self.intern(layer))
+        self.signal_ids.append(self.intern(signal))
+        self._x = self._y = None
+        return len(self.x_nm) - 1
+    
+    def column(self, name):
+        """
+        Get a whole column.
+        
+        Args:
+            name (str): One of PinTable.FIELDS
+            
+        Returns:
+            Sequence: The coordinate array itself for 'x'/'y', a range for
+            'id', or a list of decoded strings for the string columns
+        """
+        if name in ('x', 'y'):
+            return getattr(self, name)
+        if name == 'id':
+            return range(len(self.x_nm))
+        if name not in self.FIELDS:
+            raise KeyError(name)
+        strings = self.strings
+        return [strings[i] for i in getattr(self, name + '_ids')]
+    
+    def __len__(self):
+        return len(self.x_nm)
+    
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.x_nm)
+        if not 0 <= index < len(self.x_nm):
+            raise IndexError("pin index out of range")
+        return PinRow(self, index)
+    
+    def __iter__(self):
+        for index in range(len(self.x_nm)):
+            yield PinRow(self, index)
+
+
+class PinSpatialIndex:
+    """
+    Uniform-grid spatial index over placed pins, split by layer.
+    
+    Each layer has its own grid of square cells mapping (ix, iy) to the pin
+    rows inside the cell, so radius, nearest-neighbour and clearance queries
+    only look at the cells around the query instead of every pin. Pins are
+    bucketed and measured on the integer nanometre columns of the table, so
+    cells and distance comparisons are exact; query coordinates, sizes and
+    returned distances are in the output unit of the table.
+    
+    Attributes:
+        pins (PinTable): Indexed pins
+        cell_size (float): Grid cell size, in the output unit of the pins
+        cell_nm (int): Grid cell size in nanometres
+        grids (dict): Layer -> {(ix, iy): [pin rows]}
+    """
+    
+    def __init__(self, pins, cell_size=None):
+        """
+        Build the index.
+        
+        Args:
+            pins (PinTable): Pins to index
+            cell_size (float): Grid cell size. Defaults to a size giving about
+                two pins per occupied cell over the pins' bounding box.
+        """
+        self.pins = pins
+        xs, ys = pins.x_nm, pins.y_nm
+        if cell_size is None:
+            cell_nm = pins.nm_per_unit
+            if len(pins) > 1:
+                area = (max(xs) - min(xs)) * (max(ys) - min(ys))
+                if area > 0:
+                    cell_nm = math.sqrt(2 * area / len(pins))
+        else:
+            cell_nm = cell_size * pins.nm_per_unit
+        self.cell_nm = max(1, round(cell_nm))
+        self.cell_size = self.cell_nm / pins.nm_per_unit
+        
+        cell = self.cell_nm
+        self.grids = defaultdict(lambda: defaultdict(list))
+        layer_names = pins.strings
+        for row, layer in enumerate(pins.layer_ids):
+            self.grids[layer_names[layer]][(xs[row] // cell, ys[row] // cell)].append(row)
+        self.grids = {layer: dict(grid) for layer, grid in self.grids.items()}
+        
+        # Occupied cell range per layer, bounding the ring search in nearest()
+        self._extents = {}
+        for layer, grid in self.grids.items():
+            cells_x = [cell[0] for cell in grid]
+            cells_y = [cell[1] for cell in grid]
+            self._extents[layer] = (min(cells_x), min(cells_y), max(cells_x), max(cells_y))
+    
+    def _cell(self, x, y):
+        return (math.floor(x / self.cell_nm), math.floor(y / self.cell_nm))
+    
+    def _layers(self, layer):
+        if layer is None:
+            return list(self.grids)
+        return [layer] if layer in self.grids else []
+    
+    def query_radius(self, x, y, radius, layer=None):
+        """
+        Find the pins within a distance of a point.
+        
+        Args:
+            x (float): X coordinate
+            y (float): Y coordinate
+            radius (float): Search radius
+            layer (str): Only search this layer (default: all layers)
+            
+        Returns:
+            list: (distance, pin row) tuples sorted by distance
+        """
+        xs, ys = self.pins.x_nm, self.pins.y_nm
+        scale = self.pins.nm_per_unit
+        x, y, radius = x * scale, y * scale, radius * scale
+        min_x, min_y = self._cell(x - radius, y - radius)
+        max_x, max_y = self._cell(x + radius, y + radius)
+        radius_sq = radius * radius
+        
+        found = []
+        for name in self._layers(layer):
+            grid = self.grids[name]
+            for ix in range(min_x, max_x + 1):
+                for iy in range(min_y, max_y + 1):
+                    for row in grid.get((ix, iy), ()):
+                        dist_sq = (xs[row] - x) ** 2 + (ys[row] - y) ** 2
+                        if dist_sq <= radius_sq:
+                            found.append((math.sqrt(dist_sq) / scale, row))
+        found.sort()
+        return found
+    
+    def nearest(self, x, y, k=1, layer=None):
+        """
+        Find the k pins nearest to a point.
+        
+        Searches rings of cells of growing size around the point and stops as
+        soon as no unvisited cell can hold a closer pin.
+        
+        Args:
+            x (float): X coordinate
+            y (float): Y coordinate
+            k (int): Number of pins to return
+            layer (str): Only search this layer (default: all layers)
+            
+        Returns:
+            list: Up to k (distance, pin row) tuples sorted by distance
+        """
+        xs, ys = self.pins.x_nm, self.pins.y_nm
+        scale = self.pins.nm_per_unit
+        x, y = x * scale, y * scale
+        cx, cy = self._cell(x, y)
+        best = []
+        for name in self._layers(layer):
+            grid = self.grids[name]
+            min_x, min_y, max_x, max_y = self._extents[name]
+            max_ring = max(abs(cx - min_x), abs(cx - max_x), abs(cy - min_y), abs(cy - max_y))
+            candidates = []
+            for ring in range(max_ring + 1):
+                if ring == 0:
+                    cells = [(cx, cy)]
+                else:
+                    cells = [(cx + d, cy - ring) for d in range(-ring, ring + 1)]
+                    cells += [(cx + d, cy + ring) for d in range(-ring, ring + 1)]
+                    cells += [(cx - ring, cy + d) for d in range(-ring + 1, ring)]
+                    cells += [(cx + ring, cy + d) for d in range(-ring + 1, ring)]
+                for cell in cells:
+                    for row in grid.get(cell, ()):
+                        candidates.append((math.hypot(xs[row] - x, ys[row] - y), row))
+                # Cells outside this ring are at least ring * cell_nm away
+                if len(candidates) >= k and heapq.nsmallest(k, candidates)[-1][0] <= ring * self.cell_nm:
+                    break
+            best.extend(heapq.nsmallest(k, candidates))
+        return [(distance / scale, row) for distance, row in heapq.nsmallest(k, best)]
+    
+    def clearance_violations(self, min_dist):
+        """
+        Find pairs of pins on the same layer and different nets closer than min_dist.
+        
+        Unconnected pins are treated as belonging to a net of their own, but
+        are not checked against the other pins of their own component:
+        mechanical and unnumbered pads are placed by the footprint, not by
+        routing. Uses a temporary grid with min_dist cells, so every pair is
+        found by looking at half of the 3x3 cell neighbourhood of each cell.
+        
+        Args:
+            min_dist (float): Minimum allowed center-to-center distance
+            
+        Returns:
+            list: (pin row 1, pin row 2, distance) tuples, row 1 < row 2
+        """
+        if min_dist <= 0:
+            return []
+        scale = self.pins.nm_per_unit
+        index = self if self.cell_nm == max(1, round(min_dist * scale)) else PinSpatialIndex(self.pins, min_dist)
+        xs, ys = self.pins.x_nm, self.pins.y_nm
+        signals = self.pins.signal_ids
+        components = self.pins.component_ids
+        unconnected = self.pins.string_id("unconnected")
+        min_dist_sq = (min_dist * scale) ** 2
+        neighbours = ((1, -1), (1, 0), (1, 1), (0, 1))
+        
+        violations = []
+        for grid in index.grids.values():
+            for (ix, iy), rows in grid.items():
+                others = [(rows, True)]
+                others += [(grid[cell], False) for cell in ((ix + dx, iy + dy) for dx, dy in neighbours) if cell in grid]
+                for i, a in enumerate(rows):
+                    for candidates, same_cell in others:
+                        for b in (candidates[i + 1:] if same_cell else candidates):
+                            if signals[a] == signals[b] and signals[a] != unconnected:
+                                continue
+                            if components[a] == components[b] and unconnected in (signals[a], signals[b]):
+                                continue
+                            dist_sq = (xs[a] - xs[b]) ** 2 + (ys[a] - ys[b]) ** 2
+                            if dist_sq < min_dist_sq:
+                                violations.append((min(a, b), max(a, b), math.sqrt(dist_sq) / scale))
+        violations.sort()
+        return violations
@@ -0,0 +1,131 @@
+"""
+Per-stage timing, memory and counter collection.
+"""
+
+import os
+import time
+import tracemalloc
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+class Profiler:
+    """
+    Per-stage wall time, CPU time and peak memory, plus event counters.
+    
+    Stages are flat: a stage entered several times accumulates its times
+    and keeps the highest peak. Peak memory is the peak of the Python
+    allocations traced by tracemalloc during the stage, above what was
+    allocated when the stage started; tracing slows everything down, so it
+    is optional. A disabled profiler costs one attribute check per stage.
+    
+    Attributes:
+        enabled (bool): Whether stages are measured
+        memory (bool): Whether peak memory is traced
+        stages (OrderedDict): Stage name -> {'calls', 'wall', 'cpu', 'peak_bytes'}
+        counters (OrderedDict): Counter name -> value
+    """
+    
+    def __init__(self, enabled=True, memory=True, cprofile=False):
+        """
+        Initialize the profiler.
+        
+        Args:
+            enabled (bool): Measure stages; a disabled profiler only keeps counters
+            memory (bool): Trace peak memory per stage with tracemalloc
+            cprofile (bool): Also run cProfile between start() and stop()
+        """
+        self.enabled = enabled
+        self.memory = enabled and memory
+        self.stages = OrderedDict()
+        self.counters = OrderedDict()
+        self._cprofile = None
+        self._cprofile_enabled = enabled and cprofile
+        self._started_tracing = False
+    
+    def start(self):
+        """
+        Start memory tracing and cProfile, if enabled.
+        """
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        if self._cprofile_enabled:
+            import cProfile
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+    
+    def stop(self):
+        """
+        Stop what start() started.
+        """
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+    
+    @contextmanager
+    def stage(self, name):
+        """
+        Measure a block of code as a stage.
+        
+        Args:
+            name (str): Stage name
+        """
+        if not self.enabled:
+            yield
+            return
+        
+        if self.memory:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            entry = self.stages.get(name)
+            if entry is None:
+                entry = self.stages[name] = {'calls': 0, 'wall': 0.0, 'cpu': 0.0}
+            entry['calls'] += 1
+            entry['wall'] += wall
+            entry['cpu'] += cpu
+            if self.memory:
+                peak = tracemalloc.get_traced_memory()[1] - before
+                entry['peak_bytes'] = max(entry.get('peak_bytes', 0), peak)
+    
+    def count(self, name, value=1):
+        """
+        Add to a counter.
+        
+        Args:
+            name (str): Counter name
+            value (int): Amount to add
+        """
+        self.counters[name] = self.counters.get(name, 0) + value
+    
+    def results(self, top=30):
+        """
+        Get the measurements as plain data.
+        
+        Args:
+            top (int): Number of cProfile entries to include, by cumulative time
+            
+        Returns:
+            dict: 'stages', 'counters' and, if cProfile ran, 'cprofile' (list of
+            {'function', 'calls', 'tottime', 'cumtime'})
+        """
+        results = {'stages': dict(self.stages), 'counters': dict(self.counters)}
+        if self._cprofile is not None:
+            import pstats
+            stats = pstats.Stats(self._cprofile).stats
+            entries = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+            results['cprofile'] = [
+                {
+                    'function': f"{os.path.basename(filename)}:{line}({function})",
+                    'calls': calls, 'tottime': tottime, 'cumtime': cumtime
+                }
+                for (filename, line, function), (_, calls, tottime, cumtime, _) in entries
+            ]
+        return results
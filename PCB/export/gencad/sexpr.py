@@ -0,0 +1,226 @@
+"""
+Streaming S-expression reader for Specctra DSN files.
+
+The tokenizer reads the file in chunks and the tree builder keeps an
+explicit stack instead of recursing, so nesting depth is not limited by
+the Python stack and lists that are not needed can be skipped without
+being built.
+"""
+
+import io
+import re
+
+# Characters read from the file at a time
+CHUNK_SIZE = 1024 * 1024
+
+
+class _Delimiter:
+    """
+    List delimiter token, compared by identity so that it cannot be confused
+    with a quoted "(" or ")" atom.
+    """
+    
+    __slots__ = ('char',)
+    
+    def __init__(self, char):
+        self.char = char
+    
+    def __repr__(self):
+        return self.char
+
+
+OPEN = _Delimiter('(')
+CLOSE = _Delimiter(')')
+
+
+def _token_pattern(quote):
+    """
+    Compile the token pattern for a string quote character.
+    
+    An atom is a run of quoted and unquoted pieces without whitespace
+    between them, so that pin references like "L-S5"-2 are one atom.
+    
+    Args:
+        quote (str): String quote character
+    
+    Returns:
+        re.Pattern: Pattern whose groups are open, close and atom
+    """
+    q = re.escape(quote)
+    return re.compile(rf'\s*(?:(\()|(\))|((?:{q}[^{q}]*{q}|[^\s(){q}]+)+))')
+
+
+def tokenize(file, chunk_size=CHUNK_SIZE):
+    """
+    Split an S-expression text stream into tokens.
+    
+    Quotes are removed from atoms. The (string_quote C) directive of the DSN
+    parser section is honoured: its argument is read as a single character
+    and becomes the quote character for the rest of the file.
+    
+    Args:
+        file: Text file or stream
+        chunk_size (int): Characters read at a time
+    
+    Yields:
+        OPEN, CLOSE or str: Tokens in file order
+    
+    Raises:
+        ValueError: If the stream ends inside a quoted string
+    """
+    quote = '"'
+    pattern = _token_pattern(quote)
+    buf = ''
+    pos = 0
+    eof = False
+    after_open = False
+    quote_next = False
+    while True:
+        if not eof:
+            chunk = file.read(chunk_size)
+            eof = not chunk
+            buf = buf[pos:] + chunk
+            pos = 0
+        end = len(buf)
+        while True:
+            if quote_next:
+                # The directive's argument is a bare quote character
+                while pos < end and buf[pos].isspace():
+                    pos += 1
+                if pos == end:
+                    break
+                quote = buf[pos]
+                pattern = _token_pattern(quote)
+                pos += 1
+                quote_next = False
+                after_open = False
+                yield quote
+            for match in pattern.finditer(buf, pos):
+                if match.start() != pos or (match.end() == end and not eof):
+                    # Unmatched text or a token that may continue in the next chunk
+                    break
+                pos = match.end()
+                kind = match.lastindex
+                if kind == 1:
+                    after_open = True
+                    yield OPEN
+                elif kind == 2:
+                    after_open = False
+                    yield CLOSE
+                else:
+                    atom = match.group(3)
+                    if quote in atom:
+                        atom = atom.replace(quote, '')
+                    if after_open and atom == 'string_quote':
+                        quote_next = True
+                        yield atom
+                        break
+                    after_open = False
+                    yield atom
+            if not quote_next:
+                break
+        if eof:
+            if buf[pos:].strip():
+                raise ValueError(f"Unterminated string in S-expression: {buf[pos:pos + 40]!r}")
+            return
+
+
+def read_list(tokens, keyword=None):
+    """
+    Build the rest of a list whose OPEN token has already been consumed.
+    
+    Args:
+        tokens: Token iterator positioned after OPEN (and the keyword, if given)
+        keyword (str): Already consumed first atom of the list
+    
+    Returns:
+        list: Atoms and nested lists
+    
+    Raises:
+        ValueError: If the tokens end before the list is closed
+    """
+    node = [] if keyword is None else [keyword]
+    stack = []
+    for token in tokens:
+        if token is OPEN:
+            child = []
+            node.append(child)
+            stack.append(node)
+            node = child
+        elif token is CLOSE:
+            if not stack:
+                return node
+            node = stack.pop()
+        else:
+            node.append(token)
+    raise ValueError("Unexpected end of S-expression")
+
+
+def skip_list(tokens):
+    """
+    Consume the rest of a list whose OPEN token has already been consumed.
+    
+    Args:
+        tokens: Token iterator positioned inside the list
+    
+    Raises:
+        ValueError: If the tokens end before the list is closed
+    """
+    depth = 0
+    for token in tokens:
+        if token is OPEN:
+            depth += 1
+        elif token is CLOSE:
+            if not depth:
+                return
+            depth -= 1
+    raise ValueError("Unexpected end of S-expression")
+
+
+def loads(text):
+    """
+    Parse a single S-expression from a string.
+    
+    Args:
+        text (str): S-expression text
+    
+    Returns:
+        list: Atoms and nested lists of the outermost list
+    
+    Raises:
+        ValueError: If the text is not a list
+    """
+    tokens = tokenize(io.StringIO(text))
+    if next(tokens, None) is not OPEN:
+        raise ValueError("S-expression must start with '('")
+    return read_list(tokens)
+
+
+def children(node, keyword):
+    """
+    Iterate over the child lists of a node that start with a keyword.
+    
+    Args:
+        node (list): Parsed list
+        keyword (str): First atom of the wanted children
+    
+    Yields:
+        list: Matching child lists
+    """
+    for item in node:
+        if isinstance(item, list) and item and item[0] == keyword:
+            yield item
+
+
+def child(node, keyword):
+    """
+    Get the first child list of a node that starts with a keyword.
+    
+    Args:
+        node (list): Parsed list
+        keyword (str): First atom of the wanted child
+    
+    Returns:
+        list: The child list, or None
+    """
+    return next(children(node, keyword), None)
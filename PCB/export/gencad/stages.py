@@ -0,0 +1,386 @@
+"""
+Post-processing stages applied to the placed pins of each component.
+"""
+
+import os
+import csv
+import copy
+import json
+import logging
+from fnmatch import fnmatchcase
+
+logger = logging.getLogger("GencadParser")
+
+
+class PinStage:
+    """
+    Post-processing step applied to the placed pins of each matching component.
+    
+    Stages run after placement and before anything is exported. A stage sees
+    the pins of one component at a time as a list of [pin_name, x_nm, y_nm,
+    layer] lists, with the coordinates in integer nanometres, which it may
+    modify in place, reorder or drop, and returns the pins to keep.
+    
+    Attributes:
+        pattern (str): fnmatch pattern of the component names the stage applies to
+        count (int): Number of components the stage changed
+        nm_per_unit (float): Nanometres per unit of the stage's lengths, set by set_units
+    """
+    
+    name = None
+    
+    def __init__(self, pattern='*'):
+        """
+        Initialize the stage.
+        
+        Args:
+            pattern (str): fnmatch pattern of the component names to process
+        """
+        self.pattern = pattern
+        self.count = 0
+        self.nm_per_unit = 1
+    
+    def set_units(self, nm_per_unit):
+        """
+        Set the unit of the lengths the stage was configured with.
+        
+        Args:
+            nm_per_unit (float): Nanometres per unit (GencadParser.pin_units)
+        """
+        self.nm_per_unit = nm_per_unit
+    
+    def matches(self, component):
+        """
+        Check whether the stage applies to a component.
+        
+        Args:
+            component (str): Component name
+            
+        Returns:
+            bool: True if the component name matches the pattern
+        """
+        return fnmatchcase(component, self.pattern)
+    
+    def apply(self, component, pins):
+        """
+        Process the pins of one component.
+        
+        Args:
+            component (str): Component name
+            pins (list): [pin_name, x_nm, y_nm, layer] lists
+            
+        Returns:
+            list: Pins to keep
+        """
+        raise NotImplementedError
+    
+    def spec(self):
+        """
+        Get the identity of the stage, used to detect stages configured twice.
+        
+        Returns:
+            tuple: Stage name, pattern and arguments
+        """
+        return (self.name, self.pattern)
+    
+    def fresh(self):
+        """
+        Get a copy of the stage with its count reset, for a new run.
+        
+        Returns:
+            PinStage: Stage with the same configuration and a count of 0
+        """
+        stage = copy.copy(self)
+        stage.count = 0
+        return stage
+    
+    @property
+    def label(self):
+        """
+        str: Short name of the stage, e.g. 'swap-diodes[L-D*]', used in the applied stages files
+        """
+        return f"{self.name}[{self.pattern}]"
+    
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(map(repr, self.spec()[1:]))})"
+
+
+class SwapDiodePins(PinStage):
+    """
+    Swap the coordinates of the two pins of diodes whose footprint numbers the pins the wrong way round.
+    """
+    
+    name = 'swap-diodes'
+    
+    def __init__(self, pattern='L-D*'):
+        super().__init__(pattern)
+    
+    def apply(self, component, pins):
+        if len(pins) != 2:
+            return pins
+        pins.sort(key=lambda p: p[0])
+        pins[0][1:3], pins[1][1:3] = pins[1][1:3], pins[0][1:3]
+        self.count += 1
+        logger.debug(f"Swapped coordinates for diode {component}: Pin {pins[0][0]} now at ({pins[0][1]}, {pins[0][2]}), "
+                     f"Pin {pins[1][0]} now at ({pins[1][1]}, {pins[1][2]})")
+        return pins
+
+
+class RemapLayers(PinStage):
+    """
+    Rename pin layers, e.g. TOP=F.Cu.
+    """
+    
+    name = 'remap-layers'
+    
+    def __init__(self, pattern='*', mapping=None):
+        """
+        Args:
+            pattern (str): fnmatch pattern of the component names to process
+            mapping (dict): Old layer name -> new layer name
+        """
+        super().__init__(pattern)
+        self.mapping = dict(mapping or {})
+    
+    def apply(self, component, pins):
+        changed = False
+        for pin in pins:
+            layer = self.mapping.get(pin[3])
+            if layer is not None:
+                pin[3] = layer
+                changed = True
+        self.count += changed
+        return pins
+    
+    def spec(self):
+        return (self.name, self.pattern, tuple(sorted(self.mapping.items())))
+
+
+class OffsetPins(PinStage):
+    """
+    Translate pins by a fixed offset.
+    """
+    
+    name = 'offset'
+    
+    def __init__(self, pattern='*', dx=0.0, dy=0.0):
+        """
+        Args:
+            pattern (str): fnmatch pattern of the component names to process
+            dx, dy (float): Offset in the units of the pin coordinates (GencadParser.pin_units)
+        """
+        super().__init__(pattern)
+        self.dx = float(dx)
+        self.dy = float(dy)
+    
+    def apply(self, component, pins):
+        for pin in pins:
+            pin[1] += round(self.dx * self.nm_per_unit)
+            pin[2] += round(self.dy * self.nm_per_unit)
+        self.count += 1
+        return pins
+    
+    def spec(self):
+        return (self.name, self.pattern, self.dx, self.dy)
+
+
+class ExcludeComponents(PinStage):
+    """
+    Drop the pins of matching components from the output.
+    """
+    
+    name = 'exclude'
+    
+    def apply(self, component, pins):
+        self.count += 1
+        return []
+
+
+PIN_STAGES = {stage.name: stage for stage in (SwapDiodePins, RemapLayers, OffsetPins, ExcludeComponents)}
+
+
+def make_stage(config):
+    """
+    Create a stage from its configuration.
+    
+    Args:
+        config (dict): 'stage' (name in PIN_STAGES), optional 'pattern' and the
+            stage's own arguments ('mapping' for remap-layers, 'dx'/'dy' for offset)
+            
+    Returns:
+        PinStage: The stage
+        
+    Raises:
+        ValueError: If the stage name is unknown
+    """
+    config = dict(config)
+    name = config.pop('stage', None)
+    if name not in PIN_STAGES:
+        raise ValueError(f"Unknown pin stage {name!r}, expected one of {', '.join(PIN_STAGES)}")
+    return PIN_STAGES[name](**config)
+
+
+def parse_stage(text):
+    """
+    Create a stage from its command line form NAME[:PATTERN[:ARGS]].
+    
+    ARGS is OLD=NEW[,OLD=NEW...] for remap-layers and DX,DY for offset, e.g.
+    swap-diodes:L-D*, remap-layers:*:TOP=F.Cu,BOTTOM=B.Cu, offset:*:10,-5.
+    
+    Args:
+        text (str): Stage specification
+        
+    Returns:
+        PinStage: The stage
+        
+    Raises:
+        ValueError: If the specification is malformed
+    """
+    name, _, rest = text.partition(':')
+    pattern, _, args = rest.partition(':')
+    config = {'stage': name}
+    if pattern:
+        config['pattern'] = pattern
+    if args:
+        if name == RemapLayers.name:
+            config['mapping'] = dict(item.split('=', 1) for item in args.split(','))
+        elif name == OffsetPins.name:
+            config['dx'], config['dy'] = (float(value) for value in args.split(','))
+        else:
+            raise ValueError(f"Pin stage {name!r} takes no arguments")
+    return make_stage(config)
+
+
+def load_stages(path):
+    """
+    Load a list of stage configurations (see make_stage) from a JSON file.
+    
+    Args:
+        path (str): Path to the JSON file
+        
+    Returns:
+        list: PinStage objects
+    """
+    with open(path) as config_file:
+        return [make_stage(config) for config in json.load(config_file)]
+
+
+def default_stages():
+    """
+    Get the stages applied when none are configured.
+    
+    Returns:
+        list: The L-D* diode swap
+    """
+    return [SwapDiodePins()]
+
+
+class PinPipeline:
+    """
+    Ordered list of pin stages run on every component.
+    
+    A stage that is configured twice with the same arguments (for example the
+    default diode swap and an explicit one) is only kept once, since running
+    it twice would undo it. The stages that changed each component are
+    recorded in applied, which the Houdini exports write to a sidecar file
+    (see applied_stages_path) so that exported pins are not processed a
+    second time by swap_diode_pins.py.
+    
+    Attributes:
+        stages (list): PinStage objects in application order
+        applied (dict): Component name -> labels of the stages that changed it, joined with '|'
+    """
+    
+    def __init__(self, stages=()):
+        """
+        Initialize the pipeline.
+        
+        Args:
+            stages (iterable): PinStage objects
+        """
+        self.stages = []
+        seen = set()
+        for stage in stages:
+            if stage.spec() in seen:
+                logger.warning(f"Ignoring duplicate pin stage {stage!r}")
+                continue
+            seen.add(stage.spec())
+            self.stages.append(stage)
+        self.applied = {}
+    
+    def __bool__(self):
+        return bool(self.stages)
+    
+    def set_units(self, nm_per_unit):
+        """
+        Set the unit of the lengths the stages were configured with.
+        
+        Args:
+            nm_per_unit (float): Nanometres per unit (GencadParser.pin_units)
+        """
+        for stage in self.stages:
+            stage.set_units(nm_per_unit)
+    
+    def apply(self, component, pins, skip=()):
+        """
+        Run the matching stages on the pins of one component.
+        
+        Args:
+            component (str): Component name
+            pins (list): [pin_name, x_nm, y_nm, layer] lists
+            skip (collection): Labels of stages not to run on this component
+            
+        Returns:
+            list: Pins to keep
+        """
+        changed = []
+        for stage in self.stages:
+            if pins and stage.matches(component) and stage.label not in skip:
+                count = stage.count
+                pins = stage.apply(component, pins)
+                if stage.count != count:
+                    changed.append(stage.label)
+        if changed:
+            self.applied[component] = '|'.join(changed)
+        return pins
+    
+    def log_summary(self, profiler=None):
+        """
+        Log how many components each stage changed.
+        
+        Args:
+            profiler (Profiler): Also record the counts as counters named
+                after the stages, e.g. 'swap-diodes[L-D*]'
+        """
+        for stage in self.stages:
+            logger.info(f"Pin stage {stage!r}: {stage.count} components")
+            if profiler is not None:
+                profiler.count(stage.label, stage.count)
+
+
+def applied_stages_path(pins_path):
+    """
+    Get the path of the file recording the pin stages applied to an exported pin file.
+    
+    Args:
+        pins_path (str): Path of the exported pin file, e.g. NIOKR_houdini.csv
+        
+    Returns:
+        str: Path of the sidecar file, e.g. NIOKR_houdini_stages.csv
+    """
+    return os.path.splitext(pins_path)[0] + '_stages.csv'
+
+
+def read_applied_stages(path):
+    """
+    Read a file written by GencadParser.export_applied_stages_csv.
+    
+    Args:
+        path (str): Path of the sidecar file
+        
+    Returns:
+        dict: Component name -> list of the labels of the stages applied to it
+    """
+    with open(path, newline='') as csvfile:
+        return {row['component']: [label for label in row['stages'].split('|') if label]
+                for row in csv.DictReader(csvfile)}
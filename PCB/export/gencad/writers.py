@@ -0,0 +1,139 @@
+"""
+Batched CSV row writers, optionally running on a background thread.
+"""
+
+import csv
+import queue
+import threading
+from itertools import islice
+
+# Buffer size of the export file handles
+EXPORT_BUFFER_SIZE = 1024 * 1024
+
+# Rows handed to the writer at a time
+ROW_BATCH_SIZE = 4096
+
+
+class RowWriter:
+    """
+    CSV writer that formats and writes rows in batches.
+    
+    With threaded=True, batches are queued to a background thread that
+    formats them and writes them to the file, so the caller can build the
+    next batch while the previous one is written; the bounded queue keeps
+    memory flat. Without it, rows are written directly.
+    
+    Use as a context manager: leaving the block flushes the last batch,
+    waits for the thread and re-raises any error it hit.
+    
+    Attributes:
+        rows (int): Number of rows written
+    """
+    
+    def __init__(self, handle, threaded=False, batch_size=ROW_BATCH_SIZE, max_pending=8):
+        """
+        Initialize the writer.
+        
+        Args:
+            handle: Text file opened with newline=''
+            threaded (bool): Write on a background thread
+            batch_size (int): Rows per batch
+            max_pending (int): Maximum number of batches queued for the thread
+        """
+        self._writer = csv.writer(handle)
+        self._batch_size = batch_size
+        self._batch = []
+        self._error = None
+        self._queue = None
+        self._thread = None
+        self.rows = 0
+        if threaded:
+            self._queue = queue.Queue(max_pending)
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+    
+    def _run(self):
+        """
+        Write queued batches until the end marker, draining the queue after an error.
+        """
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                return
+            if self._error is None:
+                try:
+                    self._writer.writerows(batch)
+                except BaseException as e:
+                    self._error = e
+    
+    def _submit(self, batch):
+        if self._error is not None:
+            raise self._error
+        if self._queue is not None:
+            self._queue.put(batch)
+        else:
+            self._writer.writerows(batch)
+    
+    def writerow(self, row):
+        """
+        Add one row.
+        
+        Args:
+            row (tuple): Row values
+        """
+        self._batch.append(row)
+        self.rows += 1
+        if len(self._batch) >= self._batch_size:
+            self._submit(self._batch)
+            self._batch = []
+    
+    def writerows(self, rows):
+        """
+        Add rows from an iterable, consuming it one batch at a time.
+        
+        Args:
+            rows (iterable): Row tuples
+        """
+        if self._batch:
+            self._submit(self._batch)
+            self._batch = []
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, self._batch_size))
+            if not batch:
+                break
+            self.rows += len(batch)
+            self._submit(batch)
+    
+    def close(self):
+        """
+        Write the pending rows and stop the background thread.
+        
+        Raises:
+            Exception: The error the background thread hit, if any
+        """
+        try:
+            if self._batch and self._error is None:
+                self._submit(self._batch)
+            self._batch = []
+        finally:
+            if self._thread is not None:
+                self._queue.put(None)
+                self._thread.join()
+                self._thread = None
+        if self._error is not None:
+            raise self._error
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # Already failing: stop the thread without masking the original error
+            try:
+                self.close()
+            except Exception:
+                pass
+        return False
@@ -0,0 +1,20 @@
+#!/usr/bin/env python3
+"""
+GENCAD Board Diff
+
+This script compares two revisions of a board (GENCAD .cad or Specctra .dsn)
+and reports the components, pins and nets that were added, removed or moved.
+
+Usage:
+    python gencad_diff.py OLD NEW [--output-dir DIR] [--delta {csv,ply,none}]
+
+Output:
+    - <old>_vs_<new>_diff.csv: Contains the changed components, pins and nets
+    - <old>_vs_<new>_delta_houdini.csv: Contains the changed pins for Houdini
+"""
+
+from gencad.cli import diff_main
+
+
+if __name__ == "__main__":
+    diff_main()
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Synthetic GENCAD Board Generator
+
+This script writes valid GENCAD 1.4 files modelled on NIOKR.cad, for
+benchmarking gencad_parser.py on boards of any size. The board is a grid of
+keyboard blocks. Every block has one XIAO-style MCU driving a matrix of
+choc hotswap switches, each with its SOD-123 diode on the bottom side, so
+the nets have the same fan-out as a real keyboard: one two-pin net per
+switch and diode, one net per matrix row and column, and GND and VCC nets
+joining every MCU.
+
+The output is deterministic for a given size and seed.
+
+Usage:
+    python generate_gencad.py PINS [output_file] [--seed SEED]
+"""
+
+import os
+import math
+import random
+import logging
+import argparse
+
+logger = logging.getLogger("GencadGenerator")
+
+# Pins per key: six mounting/"none" pins and two electrical pins on the
+# switch, two on the diode
+PINS_PER_KEY = 10
+
+# Matrix size of one block; 5 rows + 6 columns fit the 11 GPIOs of the MCU
+BLOCK_ROWS = 5
+BLOCK_COLS = 6
+
+KEY_PITCH = 0.748031  # 19 mm
+BLOCK_GAP = 0.5
+MCU_WIDTH = 1.0
+
+# GPIO pins of the MCU used for the matrix rows and columns, and power pins
+MCU_ROW_PINS = ('1', '2', '3', '4', '5')
+MCU_COL_PINS = ('6', '7', '8', '9', '10', '11')
+MCU_GND_PIN = '13'
+MCU_VCC_PIN = '14'
+
+# Column splay of an ergonomic layout; a handful of rotations keeps the
+# shape transform cache as effective as on a real board
+COLUMN_ROTATIONS = (6, 3, 0, 0, 354, 351)
+
+SWITCH_PINS = (
+    ('none', 'PAD6', -0.216535, 0),
+    ('none', 'PAD5', -0.19685, -0.202756),
+    ('none', 'PAD7', 0, 0.232283),
+    ('none', 'PAD8', 0, 0),
+    ('none', 'PAD7', 0.19685, 0.149606),
+    ('none', 'PAD6', 0.216535, 0),
+    ('1', 'PAD2', -0.137795, 0.23622),
+    ('2', 'PAD2', 0.334646, 0.149606),
+)
+
+DIODE_PINS = (
+    ('1', 'PAD3', -0.0649606, 0),
+    ('2', 'PAD3', 0.0649606, 0),
+)
+
+PADS = """$PADS
+PAD P2 POLYGON 0
+LINE -0.0501969 -0.0492126 0.0501969 -0.0492126
+LINE 0.0501969 -0.0492126 0.0501969 0.0492126
+LINE 0.0501969 0.0492126 -0.0501969 0.0492126
+LINE -0.0501969 0.0492126 -0.0501969 -0.0492126
+PAD P3 POLYGON 0
+LINE -0.0177165 -0.023622 0.0177165 -0.023622
+LINE 0.0177165 -0.023622 0.0177165 0.023622
+LINE 0.0177165 0.023622 -0.0177165 0.023622
+LINE -0.0177165 0.023622 -0.0177165 -0.023622
+PAD P5 ROUND 0.0629921
+CIRCLE 0 0 0.0314961
+PAD P6 ROUND 0.0748031
+CIRCLE 0 0 0.0374016
+PAD P7 ROUND 0.120079
+CIRCLE 0 0 0.0600394
+PAD P8 ROUND 0.198819
+CIRCLE 0 0 0.0994094
+$ENDPADS
+
+$PADSTACKS
+PADSTACK PAD2 0
+PAD P2 BOTTOM 0 0
+PADSTACK PAD3 0
+PAD P3 TOP 0 0
+PADSTACK PAD5 0.0629921
+PAD P5 BOTTOM 0 0
+PAD P5 TOP 0 0
+PADSTACK PAD6 0.0748031
+PAD P6 BOTTOM 0 0
+PAD P6 TOP 0 0
+PADSTACK PAD7 0.120079
+PAD P7 BOTTOM 0 0
+PAD P7 TOP 0 0
+PADSTACK PAD8 0.198819
+PAD P8 BOTTOM 0 0
+PAD P8 TOP 0 0
+$ENDPADSTACKS
+
+$ARTWORKS
+$ENDARTWORKS
+"""
+
+SWITCH_SHAPE = "Hotswap:Hotswap_Choc_V1V2_klp_saddle"
+DIODE_SHAPE = "Diode_SMD:D_SOD-123"
+MCU_SHAPE = "Seeed Studio XIAO Series Library:XIAO-nRF52840-SMD"
+
+
+def _num(value):
+    """
+    Format a coordinate the way KiCad writes GENCAD numbers.
+
+    Args:
+        value (float): Number
+
+    Returns:
+        str: Up to six significant digits, without trailing zeros
+    """
+    text = f"{value:.6g}"
+    return "0" if text == "-0" else text
+
+
+def _mcu_pins():
+    """
+    Get the pins of the MCU shape.
+
+    Returns:
+        list: (name, padstack, x, y) tuples, 7 pins down each side plus 8 in the middle
+    """
+    pins = []
+    for i in range(7):
+        pins.append((str(i + 1), 'PAD3', -0.319291, 0.3 - 0.1 * i))
+    for i in range(7):
+        pins.append((str(i + 8), 'PAD3', 0.317126, -0.3 + 0.1 * i))
+    for i in range(8):
+        pins.append((str(i + 15), 'PAD3', -0.0521654 + 0.1 * (i % 2), 0.337343 - 0.1 * (i // 2)))
+    return pins
+
+
+def _write_shape(out, name, outline, pins):
+    """
+    Write one SHAPE record.
+
+    Args:
+        out: Output text file
+        name (str): Shape name
+        outline (tuple): Half width and half height of the rectangular outline
+        pins (iterable): (name, padstack, x, y) tuples
+    """
+    w, h = outline
+    out.write(f'\nSHAPE "{name}"\nINSERT SMD\n')
+    out.write(f"LINE {_num(-w)} {_num(h)} {_num(-w)} {_num(-h)}\n")
+    out.write(f"LINE {_num(-w)} {_num(-h)} {_num(w)} {_num(-h)}\n")
+    out.write(f"LINE {_num(w)} {_num(h)} {_num(-w)} {_num(h)}\n")
+    out.write(f"LINE {_num(w)} {_num(-h)} {_num(w)} {_num(h)}\n")
+    for pin_name, padstack, x, y in pins:
+        out.write(f'PIN "{pin_name}" {padstack} {_num(x)} {_num(y)} TOP 0 0\n')
+
+
+def _write_component(out, name, shape, x, y, rotation, value, bottom=False):
+    """
+    Write one COMPONENT record.
+
+    Bottom side components carry MIRRORX and FLIP on their SHAPE line and
+    MIRRORX on their TEXT lines, as in KiCad exports.
+
+    Args:
+        out: Output text file
+        name (str): Reference designator
+        shape (str): Shape name
+        x, y (float): Placement
+        rotation (float): Rotation in degrees
+        value (str): Component value for the silkscreen text
+        bottom (bool): Whether the component is on the bottom side
+    """
+    layer, flags, text_flags, silk = ('BOTTOM', ' MIRRORX FLIP', 'MIRRORX', 'SILKSCREEN_BOTTOM') if bottom else \
+        ('TOP', ' 0 0', '0', 'SILKSCREEN_TOP')
+    out.write(
+        f'\nCOMPONENT "{name}"\n'
+        f'DEVICE "DEV_{shape}"\n'
+        f'PLACE {_num(x)} {_num(y)}\n'
+        f'LAYER {layer}\n'
+        f'ROTATION {_num(rotation)}\n'
+        f'SHAPE "{shape}"{flags}\n'
+        f'TEXT 0 0.354331 0.0393701 {_num(rotation)} {text_flags} {silk} "{name}" 0 0 0.2 0.0667913\n'
+        f'SHEET "RefDes: {name}, Value: {value}"\n'
+    )
+
+
+def generate_board(out, pins, seed=0, shape_variants=5):
+    """
+    Write a synthetic keyboard board with about the requested number of pins.
+
+    Args:
+        out: Output text file
+        pins (int): Approximate number of pins (at least one key is generated)
+        seed (int): Random seed for the placement jitter
+        shape_variants (int): Number of copies of the switch and diode shapes,
+            KiCad writes one per footprint variant
+
+    Returns:
+        dict: Number of pins, components, nets and blocks written
+    """
+    rng = random.Random(seed)
+    keys = max(1, round(pins / PINS_PER_KEY))
+    block_keys = BLOCK_ROWS * BLOCK_COLS
+    blocks = math.ceil(keys / block_keys)
+    grid = math.ceil(math.sqrt(blocks))
+    block_width = BLOCK_COLS * KEY_PITCH + MCU_WIDTH + BLOCK_GAP
+    block_height = BLOCK_ROWS * KEY_PITCH + BLOCK_GAP
+    width = grid * block_width
+    height = math.ceil(blocks / grid) * block_height
+    mcu_pins = _mcu_pins()
+
+    out.write('$HEADER\nGENCAD 1.4\nUSER "generate_gencad.py"\nDRAWING "synthetic.kicad_pcb"\n'
+              'REVISION " "\nUNITS INCH\nORIGIN 0 0\nINTERTRACK 0\n$ENDHEADER\n\n')
+
+    # Rounded rectangle outline with a mounting hole in every block corner
+    radius = 0.2
+    out.write('$BOARD\n')
+    out.write(f"LINE {_num(radius)} 0 {_num(width - radius)} 0\n")
+    out.write(f"ARC {_num(width - radius)} 0 {_num(width)} {_num(-radius)} {_num(width - radius)} {_num(-radius)}\n")
+    out.write(f"LINE {_num(width)} {_num(-radius)} {_num(width)} {_num(-height + radius)}\n")
+    out.write(f"ARC {_num(width)} {_num(-height + radius)} {_num(width - radius)} {_num(-height)} "
+              f"{_num(width - radius)} {_num(-height + radius)}\n")
+    out.write(f"LINE {_num(width - radius)} {_num(-height)} {_num(radius)} {_num(-height)}\n")
+    out.write(f"ARC {_num(radius)} {_num(-height)} 0 {_num(-height + radius)} {_num(radius)} {_num(-height + radius)}\n")
+    out.write(f"LINE 0 {_num(-height + radius)} 0 {_num(-radius)}\n")
+    out.write(f"ARC 0 {_num(-radius)} {_num(radius)} 0 {_num(radius)} {_num(-radius)}\n")
+    for block in range(blocks):
+        bx = (block % grid) * block_width
+        by = -(block // grid) * block_height
+        out.write(f"CIRCLE {_num(bx + block_width - BLOCK_GAP / 2)} {_num(by - BLOCK_GAP / 4)} 0.0433071\n")
+    out.write('$ENDBOARD\n\n')
+
+    out.write(PADS)
+
+    out.write('\n$SHAPES\n')
+    switch_shapes = [SWITCH_SHAPE] + [f"{SWITCH_SHAPE}_{i}" for i in range(shape_variants - 1)]
+    diode_shapes = [DIODE_SHAPE] + [f"{DIODE_SHAPE}_{i}" for i in range(shape_variants - 1)]
+    for name in switch_shapes:
+        _write_shape(out, name, (0.299213, 0.299213), SWITCH_PINS)
+    for name in diode_shapes:
+        _write_shape(out, name, (0.0929134, 0.0393701), DIODE_PINS)
+    _write_shape(out, MCU_SHAPE, (0.352165, 0.414843), mcu_pins)
+    out.write('$ENDSHAPES\n\n')
+
+    out.write('$COMPONENTS\n')
+    for block in range(blocks):
+        bx = (block % grid) * block_width
+        by = -(block // grid) * block_height
+        for key in range(min(block_keys, keys - block * block_keys)):
+            row, col = divmod(key, BLOCK_COLS)
+            number = block * block_keys + key
+            x = bx + (col + 0.5) * KEY_PITCH + rng.uniform(-0.01, 0.01)
+            y = by - (row + 0.5) * KEY_PITCH + rng.uniform(-0.01, 0.01)
+            variant = rng.randrange(shape_variants)
+            _write_component(out, f"L-S{number}", switch_shapes[variant], x, y, COLUMN_ROTATIONS[col], "Keyswitch")
+            _write_component(out, f"L-D{number}", diode_shapes[variant], x + 0.25, y - 0.32,
+                             COLUMN_ROTATIONS[col] + 90, "Diode", bottom=True)
+        _write_component(out, f"U{block + 1}", MCU_SHAPE, bx + BLOCK_COLS * KEY_PITCH + MCU_WIDTH / 2,
+                         by - block_height / 2, 180, "XIAO-nRF52840-SMD")
+    out.write('$ENDCOMPONENTS\n\n')
+
+    out.write('$DEVICES\n')
+    for name in switch_shapes + diode_shapes + [MCU_SHAPE]:
+        out.write(f'\nDEVICE "DEV_{name}"\nPART "{name.split(":")[-1]}"\nPACKAGE "{name}"\n')
+    out.write('$ENDDEVICES\n\n')
+
+    nets = 0
+    out.write('$SIGNALS\n')
+    for block in range(blocks):
+        count = min(block_keys, keys - block * block_keys)
+        mcu = f"U{block + 1}"
+        for key in range(count):
+            number = block * block_keys + key
+            out.write(f'SIGNAL "Net-(L-D{number}-A)"\nNODE "L-S{number}" "2"\nNODE "L-D{number}" "2"\n')
+            nets += 1
+        for row, mcu_pin in enumerate(MCU_ROW_PINS):
+            members = [block * block_keys + key for key in range(row * BLOCK_COLS, min((row + 1) * BLOCK_COLS, count))]
+            if not members:
+                continue
+            out.write(f'SIGNAL "B{block}-ROW{row}"\nNODE "{mcu}" "{mcu_pin}"\n')
+            out.writelines(f'NODE "L-D{number}" "1"\n' for number in members)
+            nets += 1
+        for col, mcu_pin in enumerate(MCU_COL_PINS):
+            members = [block * block_keys + key for key in range(col, count, BLOCK_COLS)]
+            if not members:
+                continue
+            out.write(f'SIGNAL "B{block}-COL{col}"\nNODE "{mcu}" "{mcu_pin}"\n')
+            out.writelines(f'NODE "L-S{number}" "1"\n' for number in members)
+            nets += 1
+    for net, mcu_pin in (('GND', MCU_GND_PIN), ('VCC', MCU_VCC_PIN)):
+        out.write(f'SIGNAL "{net}"\n')
+        out.writelines(f'NODE "U{block + 1}" "{mcu_pin}"\n' for block in range(blocks))
+        nets += 1
+    out.write('$ENDSIGNALS\n\n$TRACKS\n$ENDTRACKS\n\n$ROUTES\n$ENDROUTES\n')
+
+    return {
+        'pins': keys * PINS_PER_KEY + blocks * len(mcu_pins),
+        'components': 2 * keys + blocks,
+        'nets': nets,
+        'blocks': blocks
+    }
+
+
+def generate_file(path, pins, seed=0, shape_variants=5):
+    """
+    Write a synthetic board to a file.
+
+    Args:
+        path (str): Output path
+        pins (int): Approximate number of pins
+        seed (int): Random seed
+        shape_variants (int): Number of copies of the switch and diode shapes
+
+    Returns:
+        dict: Statistics, see generate_board
+    """
+    with open(path, 'w', newline='\n', buffering=1024 * 1024) as out:
+        stats = generate_board(out, pins, seed, shape_variants)
+    logger.info(f"Wrote {stats['pins']} pins, {stats['components']} components and {stats['nets']} nets to {path}")
+    return stats
+
+
+def main():
+    """
+    Main function to generate a synthetic GENCAD file.
+    """
+    parser = argparse.ArgumentParser(description='Generate a synthetic keyboard GENCAD file for benchmarking.')
+    parser.add_argument('pins', type=int, help='Approximate number of pins (e.g. 100 to 1000000)')
+    parser.add_argument('output_file', nargs='?', help='Output path (default: synthetic_<pins>.cad)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: %(default)s)')
+    parser.add_argument('--shape-variants', type=int, default=5,
+                        help='Copies of the switch and diode shapes (default: %(default)s)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    output_file = args.output_file or f"synthetic_{args.pins}.cad"
+    stats = generate_file(output_file, args.pins, args.seed, args.shape_variants)
+    print(f"{output_file}: {stats['pins']} pins, {stats['components']} components, {stats['nets']} nets, "
+          f"{os.path.getsize(output_file)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,87 +2,146 @@
 """
 Swap Diode Pin Coordinates
 
-This script reads the NIOKR_houdini.csv file and swaps the coordinates for diode pins.
-It creates a new file with the swapped coordinates.
+This script reads a Houdini pin CSV (NIOKR_houdini.csv by default) and runs
+the pin post-processing stages of the gencad package on it, by default the L-D*
+diode swap. It creates a new file with the processed pins.
+
+gencad_parser.py already applies the diode swap before exporting, so this
+is only needed for CSVs exported with --no-stages or by older versions.
+The stages applied to each component are recorded next to the CSV, in
+<name>_stages.csv (NIOKR_houdini_stages.csv for NIOKR_houdini.csv); they
+are not run on that component again, and the stages this script applies
+are added to the record written next to the output file. A CSV without
+the record is processed with a warning, since it may come from an older
+export whose pins were already swapped.
+
+The file is streamed one component at a time, so memory use does not grow
+with the size of the board. Rows of a component must be contiguous, as
+they are in the files written by gencad_parser.py. Coordinates are
+processed as integer nanometres, like in gencad_parser.py, so only the
+coordinates a stage changed are rewritten and the others keep their text.
 
 Usage:
-    python swap_diode_pins.py
+    python swap_diode_pins.py [input_file] [output_file] [--units UNITS] [--stage NAME[:PATTERN[:ARGS]] ...]
 """
 
 import csv
 import os
 import logging
+import argparse
+from itertools import groupby
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler()
-    ]
+from gencad.cli import configure_logging
+from gencad.geometry import NM_PER_UNIT, nm_per_unit
+from gencad.pins import PinTable
+from gencad.stages import (
+    PinPipeline, applied_stages_path, default_stages, load_stages, parse_stage, read_applied_stages
 )
-logger = logging.getLogger()
 
-def swap_diode_pins(input_file, output_file):
+logger = logging.getLogger("GencadParser")
+
+def swap_diode_pins(input_file, output_file, stages=None, units='INCH'):
     """
-    Swap the coordinates for diode pins in the CSV file.
-    
+    Run pin stages over the rows of a Houdini pin CSV file.
+
+    Stages recorded in the applied stages file of the input (see
+    applied_stages_path) have already been applied to their component and
+    are skipped; the record, with the labels of the stages run here added,
+    is written next to the output file.
+
     Args:
         input_file (str): Path to the input CSV file
         output_file (str): Path to the output CSV file
+        stages (list): PinStage objects (default: the L-D* diode swap)
+        units (str): Units of the coordinates in the file, the --units the CSV was exported with
+
+    Returns:
+        PinPipeline: The pipeline that was run, with per-stage counts
+
+    Raises:
+        ValueError: If input and output are the same file or the units are unknown
     """
-    # Read the CSV file
-    with open(input_file, 'r', newline='') as csvfile:
-        reader = csv.DictReader(csvfile)
-        rows = list(reader)
-    
-    # Group pins by component
-    components = {}
-    for row in rows:
-        component = row['component']
-        if component not in components:
-            components[component] = []
-        components[component].append(row)
-    
-    # Swap coordinates for diode pins
-    swap_count = 0
-    for component, pins in components.items():
-        # Check if this is a diode component
-        if component.startswith('L-D') and len(pins) == 2:
-            # Sort pins by pin_name
-            pins.sort(key=lambda p: p['pin_name'])
-            
-            # Swap x and y coordinates
-            x1, y1 = pins[0]['x'], pins[0]['y']
-            x2, y2 = pins[1]['x'], pins[1]['y']
-            
-            pins[0]['x'], pins[0]['y'] = x2, y2
-            pins[1]['x'], pins[1]['y'] = x1, y1
-            
-            logger.info(f"Swapped coordinates for diode {component}: Pin {pins[0]['pin_name']} now at ({pins[0]['x']}, {pins[0]['y']}), Pin {pins[1]['pin_name']} now at ({pins[1]['x']}, {pins[1]['y']})")
-            swap_count += 1
-    
-    # Write the updated CSV file
-    with open(output_file, 'w', newline='') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=reader.fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
-    
-    logger.info(f"Swapped coordinates for {swap_count} diode components")
+    if os.path.abspath(input_file) == os.path.abspath(output_file):
+        raise ValueError("Input and output must be different files")
+
+    record = applied_stages_path(input_file)
+    if os.path.isfile(record):
+        applied = read_applied_stages(record)
+    else:
+        logger.warning(f"{record} not found; if {input_file} was exported with pin stages, "
+                       "they are applied a second time")
+        applied = {}
+
+    coordinates = PinTable(nm_per_unit(units))  # Only used to convert to and from nanometres
+    to_nm, from_nm = coordinates.to_nm, coordinates.from_nm
+    pipeline = PinPipeline(default_stages() if stages is None else stages)
+    pipeline.set_units(coordinates.nm_per_unit)
+    skipped = 0
+    with open(input_file, 'r', newline='') as infile:
+        reader = csv.DictReader(infile)
+        with open(output_file, 'w', newline='') as outfile:
+            writer = csv.DictWriter(outfile, fieldnames=reader.fieldnames)
+            writer.writeheader()
+
+            for component, rows in groupby(reader, key=lambda row: row['component']):
+                rows = list(rows)
+                done = applied.get(component, [])
+                skipped += any(stage.label in done and stage.matches(component) for stage in pipeline.stages)
+                positions = [(to_nm(float(row['x'])), to_nm(float(row['y']))) for row in rows]
+                pins = [[row['pin_name'], x_nm, y_nm, row['layer'], row] for row, (x_nm, y_nm) in zip(rows, positions)]
+                kept = {id(pin[4]): pin for pin in pipeline.apply(component, pins, skip=done)}
+
+                # Write the component's rows in their original order
+                for row, (x_nm, y_nm) in zip(rows, positions):
+                    pin = kept.get(id(row))
+                    if pin is None:
+                        continue
+                    if pin[1] != x_nm:
+                        row['x'] = from_nm(pin[1])
+                    if pin[2] != y_nm:
+                        row['y'] = from_nm(pin[2])
+                    row['layer'] = pin[3]
+                    writer.writerow(row)
+
+    for component, labels in pipeline.applied.items():
+        applied[component] = applied.get(component, []) + [labels]
+    with open(applied_stages_path(output_file), 'w', newline='') as recordfile:
+        writer = csv.writer(recordfile)
+        writer.writerow(['component', 'stages'])
+        writer.writerows((component, '|'.join(labels)) for component, labels in applied.items())
+
+    if skipped:
+        logger.warning(f"Skipped {skipped} components whose stages were already applied")
+    pipeline.log_summary()
     logger.info(f"Wrote updated CSV to {output_file}")
+    return pipeline
 
 def main():
     """
     Main function to swap diode pin coordinates.
     """
-    input_file = "NIOKR_houdini.csv"
-    output_file = "NIOKR_houdini_fixed.csv"
-    
-    if not os.path.isfile(input_file):
-        logger.error(f"Input file not found: {input_file}")
+    parser = argparse.ArgumentParser(description='Post-process the pins of a Houdini pin CSV file.')
+    parser.add_argument('input_file', nargs='?', default="NIOKR_houdini.csv")
+    parser.add_argument('output_file', nargs='?', default="NIOKR_houdini_fixed.csv")
+    parser.add_argument('--stage', action='append', type=parse_stage, dest='stages', metavar='NAME[:PATTERN[:ARGS]]',
+                        help='Pin stage, repeatable (default: swap-diodes:L-D*)')
+    parser.add_argument('--stages', dest='stages_file', metavar='JSON', help='Load pin stages from a JSON file')
+    parser.add_argument('--units', type=str.upper, choices=tuple(NM_PER_UNIT), default='INCH', metavar='UNITS',
+                        help='Units of the coordinates in the CSV: ' + ', '.join(NM_PER_UNIT) + ' (default: INCH)')
+    args = parser.parse_args()
+    configure_logging()
+
+    if not os.path.isfile(args.input_file):
+        logger.error(f"Input file not found: {args.input_file}")
         return
-    
-    swap_diode_pins(input_file, output_file)
+
+    stages = None
+    if args.stages or args.stages_file:
+        stages = (args.stages or []) + (load_stages(args.stages_file) if args.stages_file else [])
+    try:
+        swap_diode_pins(args.input_file, args.output_file, stages, args.units)
+    except ValueError as e:
+        logger.error(str(e))
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -0,0 +1,56 @@
+"""
+Shared fixtures for the gencad tests.
+
+The gencad package and the scripts are imported from the directory above,
+like the scripts import the package.
+"""
+
+import os
+import sys
+
+import pytest
+
+EXPORT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, EXPORT_DIR)
+
+from gencad.pins import PinTable  # noqa: E402
+from generate_gencad import generate_file  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def reference_dir():
+    """
+    Directory of NIOKR.cad and its committed NIOKR_*.csv outputs.
+    """
+    return EXPORT_DIR
+
+
+@pytest.fixture
+def revision_path():
+    """
+    Path of the second board revision, NIOKR2.cad.
+    """
+    return os.path.join(os.path.dirname(EXPORT_DIR), 'NIOKR2.cad')
+
+
+@pytest.fixture(scope='session')
+def synthetic_board(tmp_path_factory):
+    """
+    Path of a generated board of about 3000 pins with rotated and mirrored components.
+    """
+    path = str(tmp_path_factory.mktemp('synthetic') / 'synthetic.cad')
+    generate_file(path, 3000, seed=1)
+    return path
+
+
+@pytest.fixture
+def make_pins():
+    """
+    Build a PinTable from (component, pin_name, x, y, layer, signal) tuples, x and y in the table's unit.
+    """
+    def make(rows, nm_per_unit=1000000):
+        pins = PinTable(nm_per_unit)
+        for component, pin_name, x, y, layer, signal in rows:
+            pins.append(component, pin_name, pins.to_nm(x), pins.to_nm(y), layer, signal)
+        return pins
+    return make
@@ -0,0 +1,66 @@
+"""
+Tests for batch processing of several boards, sequentially and in parallel.
+"""
+
+import os
+import shutil
+
+from gencad import cli
+from gencad.batch import expand_input_files, process_file
+
+
+def _copy_boards(directory, reference_dir, revision_path):
+    paths = []
+    for source in (os.path.join(reference_dir, 'NIOKR.cad'), revision_path):
+        paths.append(str(directory / os.path.basename(source)))
+        shutil.copyfile(source, paths[-1])
+    return paths
+
+
+def _outputs(directory):
+    contents = {}
+    for entry in sorted(directory.iterdir()):
+        if entry.suffix == '.csv':
+            contents[entry.name] = entry.read_bytes()
+    return contents
+
+
+def test_expand_input_files_sorts_matches_and_keeps_missing_paths(tmp_path):
+    for name in ('b.cad', 'a.cad', 'c.dsn'):
+        (tmp_path / name).write_text('')
+    pattern = str(tmp_path / '*.cad')
+    missing = str(tmp_path / 'missing.cad')
+    
+    files = expand_input_files([pattern, missing, str(tmp_path / 'a.cad'), str(tmp_path / 'none*.cad')])
+    
+    assert files == [str(tmp_path / 'a.cad'), str(tmp_path / 'b.cad'), missing]
+
+
+def test_process_file_reports_errors_in_the_summary(tmp_path):
+    broken = tmp_path / 'broken.dsn'
+    broken.write_text('(pcb (structure')
+    
+    missing = process_file(str(tmp_path / 'missing.cad'))
+    malformed = process_file(str(broken))
+    
+    assert missing['error'].startswith('Input file not found')
+    assert malformed['error'] and malformed['outputs'] == []
+
+
+def test_parallel_batch_writes_the_same_outputs_as_sequential_runs(tmp_path, reference_dir, revision_path,
+                                                                    monkeypatch):
+    sequential, parallel = tmp_path / 'sequential', tmp_path / 'parallel'
+    sequential.mkdir()
+    parallel.mkdir()
+    summaries = [process_file(path) for path in _copy_boards(sequential, reference_dir, revision_path)]
+    inputs = _copy_boards(parallel, reference_dir, revision_path)
+    inputs.append(str(parallel / 'missing.cad'))
+    
+    monkeypatch.setattr('sys.argv', ['gencad_parser.py', '--jobs', '3', '--no-cache'] + inputs)
+    cli.main()
+    
+    assert [summary['error'] for summary in summaries] == [None, None]
+    assert [summary['pins'] for summary in summaries] == [241, 241]
+    expected = _outputs(sequential)
+    assert len(expected) == 2 * len(summaries[0]['outputs'])
+    assert _outputs(parallel) == expected
@@ -0,0 +1,86 @@
+"""
+Tests for the on-disk cache of parsed GENCAD sections.
+"""
+
+import os
+import shutil
+
+import pytest
+
+import gencad
+from gencad.parser import CACHED_SECTIONS
+
+
+@pytest.fixture
+def board_copy(tmp_path, reference_dir):
+    path = str(tmp_path / 'NIOKR.cad')
+    shutil.copyfile(os.path.join(reference_dir, 'NIOKR.cad'), path)
+    return path
+
+
+def _assert_same_board(board, expected):
+    assert board.pins.x_nm == expected.pins.x_nm
+    assert board.pins.y_nm == expected.pins.y_nm
+    assert board.pins.column('signal') == expected.pins.column('signal')
+    assert board.board_outline == expected.board_outline
+    assert dict(board.signals) == dict(expected.signals)
+
+
+def test_second_load_restores_every_cached_section(board_copy, tmp_path):
+    cache = gencad.ParseCache(str(tmp_path / 'cache'))
+    
+    first = gencad.load(board_copy, cache=cache)
+    assert (cache.hits, cache.misses) == (0, len(CACHED_SECTIONS))
+    second = gencad.load(board_copy, cache=cache)
+    
+    assert (cache.hits, cache.misses) == (len(CACHED_SECTIONS), len(CACHED_SECTIONS))
+    assert len(first.pins) == 241
+    _assert_same_board(second, first)
+    _assert_same_board(second, gencad.load(board_copy))
+
+
+def test_edited_section_is_parsed_again(board_copy, tmp_path):
+    cache = gencad.ParseCache(str(tmp_path / 'cache'))
+    gencad.load(board_copy, cache=cache)
+    with open(board_copy) as f:
+        text = f.read()
+    with open(board_copy, 'w') as f:
+        f.write(text.replace('SIGNAL "Net-(L-D0-A)"', 'SIGNAL "Net-(L-D0-K)"'))
+    cache.hits = cache.misses = 0
+    
+    board = gencad.load(board_copy, cache=cache)
+    
+    assert (cache.hits, cache.misses) == (len(CACHED_SECTIONS) - 1, 1)
+    assert board.get_signal('L-D0', '2') == 'Net-(L-D0-K)'
+    _assert_same_board(board, gencad.load(board_copy))
+
+
+def test_unreadable_entries_are_parsed_again(board_copy, tmp_path):
+    directory = tmp_path / 'cache'
+    gencad.load(board_copy, cache=gencad.ParseCache(str(directory)))
+    for entry in directory.iterdir():
+        entry.write_bytes(b'not a pickle')
+    cache = gencad.ParseCache(str(directory))
+    
+    board = gencad.load(board_copy, cache=cache)
+    
+    assert (cache.hits, cache.misses) == (0, len(CACHED_SECTIONS))
+    _assert_same_board(board, gencad.load(board_copy))
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = gencad.ParseCache(str(tmp_path))
+    value = 'x' * 1000
+    cache.store('a', value)
+    cache.store('b', value)
+    size = os.path.getsize(tmp_path / 'a.pickle')
+    os.utime(tmp_path / 'a.pickle', (1000, 1000))
+    os.utime(tmp_path / 'b.pickle', (2000, 2000))
+    assert cache.load('a') == value  # Touches a, so b is now the oldest entry
+    
+    cache.max_bytes = 2 * size
+    cache.store('c', value)
+    
+    assert sorted(entry.name for entry in tmp_path.iterdir()) == ['a.pickle', 'c.pickle']
+    assert cache.load('b') is None
+    assert (cache.hits, cache.misses) == (1, 1)
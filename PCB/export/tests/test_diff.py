@@ -0,0 +1,70 @@
+"""
+Tests for the comparison of two board revisions.
+"""
+
+import csv
+import os
+
+import gencad
+from gencad.diff import PIN_CHANGES, diff_boards, diff_files
+from gencad.parser import HOUDINI_FIELDS
+
+
+def _load(path, **kwargs):
+    return gencad.load(path, stages=[], **kwargs)
+
+
+def test_identical_boards_have_no_changes(reference_dir):
+    path = os.path.join(reference_dir, 'NIOKR.cad')
+    
+    diff = diff_boards(_load(path), _load(path))
+    
+    assert (diff['components'], diff['pins'], diff['nets']) == ([], [], [])
+
+
+def test_boards_in_different_units_compare_equal(reference_dir):
+    path = os.path.join(reference_dir, 'NIOKR.cad')
+    
+    diff = diff_boards(_load(path), _load(path, output_units='MM'))
+    
+    assert (diff['components'], diff['pins'], diff['nets']) == ([], [], [])
+
+
+def test_moved_pin_respects_the_tolerance(reference_dir):
+    path = os.path.join(reference_dir, 'NIOKR.cad')
+    old, new = _load(path), _load(path)
+    new.pins.x_nm[0] += 1000
+    
+    assert [row['change'] for row in diff_boards(old, new)['pins']] == ['moved']
+    assert diff_boards(old, new, tolerance=1000)['pins'] == []
+
+
+def test_revision_diff_report(reference_dir, revision_path, tmp_path):
+    diff, paths = diff_files(os.path.join(reference_dir, 'NIOKR.cad'), revision_path, output_dir=str(tmp_path))
+    
+    assert (len(diff['components']), len(diff['pins']), len(diff['nets'])) == (3, 11, 12)
+    assert {row['change'] for row in diff['pins']} == {'net'}
+    assert [os.path.basename(path) for path in paths] == ['NIOKR_vs_NIOKR2_diff.csv',
+                                                          'NIOKR_vs_NIOKR2_delta_houdini.csv',
+                                                          'NIOKR_vs_NIOKR2_delta_houdini_stages.csv']
+    with open(paths[0], newline='') as f:
+        report = list(csv.DictReader(f))
+    assert len(report) == 3 + 11 + 12
+    assert {row['kind'] for row in report} == {'component', 'pin', 'net'}
+
+
+def test_delta_rows_match_the_houdini_export_of_the_new_board(reference_dir, revision_path, tmp_path):
+    diff, paths = diff_files(os.path.join(reference_dir, 'NIOKR.cad'), revision_path, output_dir=str(tmp_path))
+    houdini = str(tmp_path / 'NIOKR2_houdini.csv')
+    gencad.load(revision_path).export_houdini_csv(houdini)
+    
+    with open(paths[1], newline='') as f:
+        header, *delta = list(csv.reader(f))
+    with open(houdini, newline='') as f:
+        rows = {row[0]: row for row in csv.reader(f)}
+    
+    assert tuple(header) == HOUDINI_FIELDS + ('old_id', 'change')
+    assert len(delta) == len(diff['pins'])
+    for row in delta:
+        assert row[:len(HOUDINI_FIELDS)] == rows[row[0]]
+        assert set(row[-1].split('|')) <= set(PIN_CHANGES)
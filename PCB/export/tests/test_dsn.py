@@ -0,0 +1,134 @@
+"""
+Tests for reading Specctra DSN files into the pin and net model.
+"""
+
+import os
+
+import pytest
+
+import gencad
+from gencad.dsn import DsnParser
+
+BOARD = """(pcb "test board"
+  (parser (string_quote ")(host_cad "KiCad's Pcbnew"))
+  (resolution um 10)
+  (unit um)
+  (structure
+    (layer F.Cu (type signal))
+    (layer B.Cu (type signal))
+    (boundary (path pcb 0  0 0  10000 0  10000 5000  0 5000  0 0))
+  )
+  (placement
+    (component R_0805
+      (place R1 2000 1000 front 90 (PN 10k))
+      (place R2 5000 1000 back 0 (PN 10k))
+    )
+    (component "Conn-01"
+      (place J-1 8000 3000 front 0)
+    )
+  )
+  (library
+    (image R_0805
+      (pin Rect[T]Pad 1 -1000 0)
+      (pin Rect[T]Pad 2 1000 0)
+    )
+    (image "Conn-01"
+      (pin Round[A]Pad 1 0 0)
+      (pin Round[A]Pad (rotate 90) 2 0 2540)
+    )
+    (padstack Rect[T]Pad (shape (rect F.Cu -500 -600 500 600)) (attach off))
+    (padstack Round[A]Pad (shape (circle F.Cu 1700)) (shape (circle B.Cu 1700)) (attach off))
+  )
+  (network
+    (net GND (pins R1-1 J-1-1))
+    (net "Net-(R1-Pad2)" (pins R1-2 R2-1))
+  )
+  (wiring
+    (wire (path F.Cu 250  1000 1000  1000 2000  1500 2000) (net GND) (type protect))
+    (via "Via[0-1]_600:300_um" 3000 2000 (net GND))
+  )
+)
+"""
+
+
+@pytest.fixture
+def dsn_path(tmp_path):
+    path = tmp_path / 'test.dsn'
+    path.write_text(BOARD)
+    return str(path)
+
+
+def _pins(board):
+    pins = board.pins
+    return {key: (pins.x[row], pins.y[row], pins.strings[pins.layer_ids[row]], pins.strings[pins.signal_ids[row]])
+            for key, row in board.pin_index.items()}
+
+
+def test_dsn_placement_images_and_nets_fill_the_board_model(dsn_path):
+    board = gencad.load(dsn_path)
+    
+    assert isinstance(board, DsnParser)
+    assert (board.units, board.pin_units, board.layers) == ('UM', 'UM', ['F.Cu', 'B.Cu'])
+    assert _pins(board) == {
+        ('R1', '1'): (2000.0, 0.0, 'TOP', 'GND'),
+        ('R1', '2'): (2000.0, 2000.0, 'TOP', 'Net-(R1-Pad2)'),
+        # Back side: mirrored in X and flipped
+        ('R2', '1'): (6000.0, 1000.0, 'BOTTOM', 'Net-(R1-Pad2)'),
+        ('R2', '2'): (4000.0, 1000.0, 'BOTTOM', 'unconnected'),
+        ('J-1', '1'): (8000.0, 3000.0, 'TOP', 'GND'),
+        ('J-1', '2'): (8000.0, 5540.0, 'TOP', 'unconnected'),
+    }
+    assert dict(board.signals) == {'GND': [('R1', '1'), ('J-1', '1')], 'Net-(R1-Pad2)': [('R1', '2'), ('R2', '1')]}
+    assert board.components['R2']['device'] == '10k'
+    assert board.shapes['Conn-01']['pins'][1]['rotation'] == 90.0
+    assert len(board.board_outline) == 4
+    assert board.pads['Round[A]Pad']['geometry'] == [('CIRCLE', (1700.0,)), ('CIRCLE', (1700.0,))]
+
+
+def test_dsn_output_units_and_no_default_stages(dsn_path):
+    board = gencad.load(dsn_path, output_units='MM')
+    
+    assert board.pipeline.stages == []
+    assert _pins(board)['R1', '1'][:2] == (2.0, 0.0)
+    assert board.board_outline[0] == (0.0, 0.0, 10.0, 0.0)
+
+
+def test_dsn_wiring_is_read_on_first_access(dsn_path):
+    board = gencad.load(dsn_path)
+    assert board._routes is None
+    
+    route = board.routes['GND']
+    
+    assert [segment['coords'] for segment in route['segments']] == [(1000.0, 1000.0, 1000.0, 2000.0),
+                                                                    (1000.0, 2000.0, 1500.0, 2000.0)]
+    assert {segment['layer'] for segment in route['segments']} == {'F.Cu'}
+    assert route['vias'] == [{'padstack': 'Via[0-1]_600:300_um', 'x': 3000.0, 'y': 2000.0, 'layer': 'ALL',
+                              'drill': 0.0}]
+
+
+def test_dsn_exports_like_a_gencad_board(dsn_path, tmp_path):
+    board = gencad.load(dsn_path)
+    
+    paths = board.export_all(str(tmp_path), 'test', ('pins', 'netlist', 'houdini'))
+    
+    with open(paths['pins']) as f:
+        assert f.read().splitlines()[1] == 'R1,1,2000.0,0.0,TOP,GND'
+    with open(paths['netlist']) as f:
+        assert f.read().splitlines()[1:] == ['GND,2,"R1:1, J-1:1"', 'Net-(R1-Pad2),2,"R1:2, R2:1"']
+
+
+def test_non_dsn_file_is_rejected(tmp_path):
+    path = tmp_path / 'other.dsn'
+    path.write_text('(kicad_pcb (version 4))')
+    
+    with pytest.raises(ValueError):
+        gencad.load(str(path))
+
+
+def test_committed_dsn_boards_place_every_net_pin(reference_dir):
+    board = gencad.load(os.path.join(reference_dir, 'NIOKR-prod.dsn'))
+    
+    nodes = [node for members in board.signals.values() for node in members]
+    assert (len(board.pins), len(board.signals), len(nodes)) == (300, 76, 292)
+    assert all(node in board.pin_index for node in nodes)
+    assert all(board.get_signal(*node) == signal for signal, members in board.signals.items() for node in members)
@@ -0,0 +1,127 @@
+"""
+Tests for the streaming DXF writer and the DXF export of a board.
+
+Written drawings are read back as group code pairs, so the tests check the
+structure a DXF reader sees rather than the exact text.
+"""
+
+import io
+import os
+from collections import Counter
+
+import pytest
+
+import gencad
+from gencad.dxf import DxfWriter, dxf_layer_name
+
+
+def _pairs(text):
+    lines = text.split('\n')
+    return [(int(code), value) for code, value in zip(lines[0::2], lines[1::2])]
+
+
+def _section(pairs, name):
+    start = pairs.index((2, name))
+    return pairs[start + 1:pairs.index((0, 'ENDSEC'), start)]
+
+
+def _entities(pairs):
+    """
+    Split the ENTITIES section into (type, {group code: [values]}) items.
+    """
+    entities = []
+    for code, value in _section(pairs, 'ENTITIES'):
+        if code == 0:
+            entities.append((value, {}))
+        else:
+            entities[-1][1].setdefault(code, []).append(value)
+    return entities
+
+
+def _draw(version):
+    handle = io.StringIO(newline='')
+    with DxfWriter(handle, version, {'PINS': 1}, 'MM') as drawing:
+        drawing.point(1.0, 2.0, 'PINS')
+        drawing.circle(3.0, 4.0, 0.5, 'PINS')
+        drawing.line(0.0, 0.0, 1.0, 1.0, '0')
+        drawing.polyline([(0.0, 0.0), (2.0, 0.0), (2.0, 2.0)], '0', closed=True)
+    return drawing, _pairs(handle.getvalue())
+
+
+def test_dxf_layer_name_per_version():
+    assert dxf_layer_name('PINS_TOP_Net-(D1-A)') == 'PINS_TOP_Net-(D1-A)'
+    assert dxf_layer_name('PINS_TOP_Net-(D1-A)', 'R12') == 'PINS_TOP_NET-_D1-A_'
+    assert dxf_layer_name('a/b:c', 'R2000') == 'a_b_c'
+    assert dxf_layer_name('  ') == '_'
+
+
+def test_r2000_drawing_has_unique_handles_and_a_final_handle_seed():
+    drawing, pairs = _draw('R2000')
+    header = _section(pairs, 'HEADER')
+    
+    assert header[header.index((9, '$ACADVER')) + 1] == (1, 'AC1015')
+    assert header[header.index((9, '$INSUNITS')) + 1] == (70, '4')
+    entities = _entities(pairs)
+    assert [kind for kind, _ in entities] == ['POINT', 'CIRCLE', 'LINE', 'LWPOLYLINE']
+    assert drawing.entities == 4
+    assert entities[3][1][90] == ['3'] and entities[3][1][70] == ['1']
+    body = pairs[pairs.index((2, 'TABLES')):]
+    handles = [int(value, 16) for code, value in body if code in (5, 105)]
+    assert len(handles) == len(set(handles))
+    seed = int(header[header.index((9, '$HANDSEED')) + 1][1], 16)
+    assert seed == max(handles) + 1
+    assert pairs[-1] == (0, 'EOF')
+
+
+def test_r12_drawing_has_no_handles_and_old_style_polylines():
+    drawing, pairs = _draw('R12')
+    
+    assert _section(pairs, 'HEADER')[:2] == [(9, '$ACADVER'), (1, 'AC1009')]
+    assert not any(code == 5 for code, _ in pairs)
+    assert (2, 'OBJECTS') not in pairs
+    assert [kind for kind, _ in _entities(pairs)] == ['POINT', 'CIRCLE', 'LINE', 'POLYLINE', 'VERTEX', 'VERTEX',
+                                                      'VERTEX', 'SEQEND']
+    assert drawing.entities == 4
+
+
+def test_unknown_version_is_rejected():
+    with pytest.raises(ValueError):
+        DxfWriter(io.StringIO(), 'R14')
+
+
+@pytest.mark.parametrize('version', ['R12', 'R2000'])
+def test_export_dxf_writes_every_pin_connection_and_outline_loop(reference_dir, tmp_path, version):
+    board = gencad.load(os.path.join(reference_dir, 'NIOKR.cad'))
+    path = str(tmp_path / 'board.dxf')
+    
+    board.export_dxf(path, version)
+    
+    with open(path, newline='') as f:
+        pairs = _pairs(f.read())
+    entities = _entities(pairs)
+    kinds = Counter(kind for kind, _ in entities)
+    assert kinds['POINT'] == len(board.pins)
+    assert kinds['LINE'] == len(list(board.iter_connections('mst')))
+    assert kinds['LWPOLYLINE' if version == 'R2000' else 'POLYLINE'] == len(board.outline_loops())
+    
+    # Pins are on PINS_<side>_<signal> layers, all of them in the layer table
+    layer_table = {value for code, value in _section(pairs, 'TABLES') if code == 2}
+    points = [data for kind, data in entities if kind == 'POINT']
+    pins = board.pins
+    for row in (0, len(pins) // 2, len(pins) - 1):
+        pin = pins[row]
+        assert points[row][8] == [dxf_layer_name(f"PINS_{pin.layer}_{pin.signal}", version)]
+        assert (float(points[row][10][0]), float(points[row][20][0])) == (pin.x, pin.y)
+    assert {data[8][0] for data in points} <= layer_table
+
+
+def test_export_dxf_pin_radius_writes_circles(reference_dir, tmp_path):
+    board = gencad.load(os.path.join(reference_dir, 'NIOKR.cad'))
+    path = str(tmp_path / 'board.dxf')
+    
+    board.export_dxf(path, pin_radius=0.01, topology='star')
+    
+    with open(path, newline='') as f:
+        kinds = Counter(kind for kind, _ in _entities(_pairs(f.read())))
+    assert (kinds['POINT'], kinds['CIRCLE']) == (0, len(board.pins))
+    assert kinds['LINE'] == len(list(board.iter_connections('star')))
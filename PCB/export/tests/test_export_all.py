@@ -0,0 +1,108 @@
+"""
+Tests for the single-pass export of all formats and its row writer.
+
+The reference round trip parses both committed boards and compares every
+export with the committed <board>_*.csv files.
+"""
+
+import io
+import os
+import csv
+import shutil
+
+import pytest
+
+import gencad
+from gencad.writers import RowWriter
+
+REFERENCE_OUTPUTS = ('pins', 'connections', 'netlist', 'board_outline', 'houdini')
+
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read().replace(b'\r\n', b'\n')
+
+
+@pytest.fixture
+def board_copy(tmp_path, reference_dir):
+    path = str(tmp_path / 'NIOKR.cad')
+    shutil.copyfile(os.path.join(reference_dir, 'NIOKR.cad'), path)
+    return path
+
+
+@pytest.mark.parametrize('base_name', ['NIOKR', 'NIOKR2'])
+def test_exports_match_the_committed_reference_outputs(base_name, reference_dir, revision_path, tmp_path):
+    source = os.path.join(reference_dir, 'NIOKR.cad') if base_name == 'NIOKR' else revision_path
+    board = gencad.load(source)
+    
+    paths = board.export_all(str(tmp_path), base_name, REFERENCE_OUTPUTS)
+    
+    for fmt, path in paths.items():
+        assert _read(path) == _read(os.path.join(reference_dir, f"{base_name}_{fmt}.csv")), fmt
+
+
+@pytest.mark.parametrize('threads', [False, True])
+def test_export_all_writes_what_the_single_format_exports_write(board_copy, tmp_path, threads):
+    board = gencad.load(board_copy, output_units='MM')
+    formats = ('pins', 'connections', 'netlist', 'board_outline', 'houdini', 'outline_loops', 'net_metrics',
+               'houdini_net_pins', 'houdini_nets', 'dxf', 'ply')
+    
+    (tmp_path / 'all').mkdir()
+    
+    paths = board.export_all(str(tmp_path / 'all'), 'board', formats, topology='mst', simplify=0.05,
+                             threads=threads)
+    single = {fmt: str(tmp_path / os.path.basename(path)) for fmt, path in paths.items()}
+    board.export_to_csv(single['pins'])
+    board.export_connections_to_csv(single['connections'], topology='mst')
+    board.export_netlist_to_csv(single['netlist'])
+    board.export_board_outline_to_csv(single['board_outline'])
+    board.export_houdini_csv(single['houdini'])
+    board.export_outline_loops_to_csv(single['outline_loops'], simplify=0.05)
+    board.export_net_metrics_csv(single['net_metrics'])
+    board.export_houdini_net_csv(single['houdini_net_pins'], single['houdini_nets'])
+    board.export_dxf(single['dxf'], topology='mst', simplify=0.05)
+    board.export_houdini_ply(single['ply'], topology='mst')
+    
+    assert list(paths) == list(formats)
+    for fmt in formats:
+        assert _read(paths[fmt]) == _read(single[fmt]), fmt
+    assert _read(gencad.applied_stages_path(paths['houdini'])) == \
+        _read(gencad.applied_stages_path(single['houdini']))
+
+
+def test_export_all_rejects_unknown_formats_and_topologies(board_copy):
+    board = gencad.load(board_copy)
+    
+    with pytest.raises(ValueError):
+        board.export_all(formats=('pins', 'svg'))
+    with pytest.raises(ValueError):
+        board.export_all(topology='ring')
+
+
+@pytest.mark.parametrize('threaded', [False, True])
+def test_row_writer_writes_every_row_in_order(threaded):
+    rows = [(i, f"name {i}", i / 3) for i in range(1000)]
+    out = io.StringIO(newline='')
+    
+    with RowWriter(out, threaded=threaded, batch_size=64) as writer:
+        writer.writerow(('id', 'name', 'value'))
+        writer.writerows(iter(rows[:500]))
+        for row in rows[500:]:
+            writer.writerow(row)
+    
+    expected = io.StringIO(newline='')
+    csv.writer(expected).writerows([('id', 'name', 'value')] + rows)
+    assert out.getvalue() == expected.getvalue()
+    assert writer.rows == 1001
+
+
+class _FailingFile(io.StringIO):
+    def write(self, text):
+        raise OSError('disk full')
+
+
+@pytest.mark.parametrize('threaded', [False, True])
+def test_row_writer_reraises_write_errors(threaded):
+    with pytest.raises(OSError, match='disk full'):
+        with RowWriter(_FailingFile(), threaded=threaded, batch_size=2) as writer:
+            writer.writerows([(i,) for i in range(100)])
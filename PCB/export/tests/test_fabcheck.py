@@ -0,0 +1,115 @@
+"""
+Tests for cross-checking placed pins against Excellon drill and Gerber copper files.
+
+The committed gerbers/ directory holds the fabrication outputs of the
+production board NIOKR-prod.dsn, every pin of which must match.
+"""
+
+import csv
+import os
+
+import pytest
+
+import gencad
+from gencad.fabcheck import (FAB_STATUSES, cross_check, export_fab_check, find_fab_files, gerber_side,
+                             read_excellon, read_gerber)
+
+
+def _write_gerber(path, side, pads):
+    with open(path, 'w') as f:
+        f.write(f"%TF.FileFunction,Copper,L1,{side}*%\n%FSLAX46Y46*%\n%MOMM*%\n%ADD10C,0.500000*%\nD10*\n")
+        for x, y in pads:
+            f.write(f"X{round(x * 1e6)}Y{round(y * 1e6)}D03*\n")
+        f.write("M02*\n")
+
+
+@pytest.fixture
+def prod_board(reference_dir):
+    return gencad.load(os.path.join(reference_dir, 'NIOKR-prod.dsn'))
+
+
+@pytest.fixture
+def fab_files(reference_dir):
+    return find_fab_files(os.path.join(reference_dir, 'gerbers'))
+
+
+def test_find_fab_files_picks_drill_and_copper_files(fab_files):
+    drill_files, copper_files = fab_files
+    
+    assert [os.path.basename(path) for path in drill_files] == ['NIOKR-NPTH.drl', 'NIOKR-PTH.drl']
+    assert [os.path.basename(path) for path in copper_files] == ['NIOKR-B_Cu.gbl', 'NIOKR-F_Cu.gtl']
+    assert [gerber_side(path) for path in copper_files] == ['BOTTOM', 'TOP']
+
+
+def test_read_excellon_reads_plating_and_hole_functions(fab_files):
+    npth, pth = (read_excellon(path) for path in fab_files[0])
+    
+    assert (len(npth), len(pth)) == (322, 73)
+    assert npth[0] == (185.0, -122.439, 0.6, False, 'ComponentDrill')
+    assert all(plated for _, _, _, plated, _ in pth)
+    assert {function for _, _, _, _, function in pth} == {'ComponentDrill', 'ViaDrill'}
+
+
+def test_read_excellon_inch_leading_zeros_and_slots(tmp_path):
+    path = str(tmp_path / 'board.xln')
+    with open(path, 'w') as f:
+        f.write("M48\nINCH,LZ\nT1C0.0400\n%\nT1\nX01Y02\nX1.5Y-0.5G85X2.5Y-0.5\nM30\n")
+    
+    hits = read_excellon(path)
+    
+    assert [(round(x, 4), round(y, 4)) for x, y, _, _, _ in hits] == [(25.4, 50.8), (50.8, -12.7)]
+    assert hits[0][2] == pytest.approx(1.016)
+    assert hits[0][3] is True
+
+
+def test_read_gerber_flashes_and_side(tmp_path):
+    path = str(tmp_path / 'pads.gbr')
+    _write_gerber(path, 'Bot', [(1.5, -2.25), (10.0, 0.0)])
+    
+    assert read_gerber(path) == [(1.5, -2.25, 'flash'), (10.0, 0.0, 'flash')]
+    assert gerber_side(path) == 'BOTTOM'
+    unknown = str(tmp_path / 'unknown.gbr')
+    open(unknown, 'w').close()
+    with pytest.raises(ValueError):
+        gerber_side(unknown)
+
+
+def test_production_board_matches_committed_fab_files(prod_board, fab_files, tmp_path):
+    rows, counts = cross_check(prod_board, *fab_files)
+    
+    assert rows == []
+    assert counts['pins'] == counts['checked'] == counts['ok'] == 300
+    assert all(counts[status] == 0 for status in FAB_STATUSES)
+    
+    output = str(tmp_path / 'fab_check.csv')
+    assert export_fab_check(prod_board, output, *fab_files) == counts
+    with open(output, newline='') as f:
+        assert list(csv.reader(f)) == [['status', 'component', 'pin_name', 'layer', 'side', 'x', 'y']]
+
+
+def test_moved_pin_is_reported_and_unmatched_within_tolerance(prod_board, fab_files):
+    prod_board.pins.x_nm[0] += 1000000
+    
+    rows, counts = cross_check(prod_board, *fab_files)
+    
+    assert (counts['ok'], counts['missing_pad']) == (299, 1)
+    assert [(row['status'], row['component'], row['pin_name'], row['side']) for row in rows] == \
+        [('missing_pad', 'L-S0', '1', 'BOTTOM')]
+    
+    # Within a tolerance above the offset the pin matches again
+    _, counts = cross_check(prod_board, *fab_files, tolerance=1.1)
+    assert counts['missing_pad'] == 0
+
+
+def test_pad_on_the_other_side_is_wrong_side(prod_board, tmp_path):
+    pin = prod_board.pins[0]
+    assert pin.layer == 'BOTTOM'
+    top, bottom = str(tmp_path / 'top.gbr'), str(tmp_path / 'bottom.gbr')
+    _write_gerber(top, 'Top', [(prod_board.pins.x_nm[0] / 1e6, prod_board.pins.y_nm[0] / 1e6)])
+    _write_gerber(bottom, 'Bot', [])
+    
+    rows, counts = cross_check(prod_board, copper_files=[top, bottom])
+    
+    assert counts['wrong_side'] == 1
+    assert [(row['component'], row['pin_name']) for row in rows if row['status'] == 'wrong_side'] == \
+        [(pin.component, pin.pin_name)]
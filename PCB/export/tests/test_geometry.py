@@ -0,0 +1,65 @@
+"""
+Tests for the outline loop chaining and polyline simplification.
+"""
+
+import os
+
+import pytest
+
+import gencad
+from gencad.geometry import chain_segments, polygon_area, simplify_polyline
+
+
+def test_chain_segments_joins_shuffled_segments_into_a_closed_loop():
+    square = [(0, 0), (10, 0), (10, 10), (0, 10)]
+    segments = [[square[i], square[(i + 1) % 4]] for i in range(4)]
+    # Out of order and one reversed, with endpoints that only match within the tolerance
+    segments = [segments[2], segments[0][::-1], segments[3], [(10.0004, 0.0), (10, 10)]]
+    
+    chains = chain_segments(segments, tolerance=0.001)
+    
+    assert len(chains) == 1
+    points, closed = chains[0]
+    assert closed
+    assert len(points) == 4
+    assert abs(polygon_area(points)) == pytest.approx(100, abs=0.01)
+
+
+def test_chain_segments_extends_open_chains_at_both_ends():
+    segments = [[(1, 0), (2, 0)], [(0, 0), (1, 0)], [(2, 0), (3, 0)], [(5, 5), (6, 5)]]
+    
+    chains = chain_segments(segments, tolerance=0.01)
+    
+    assert chains == [([(0, 0), (1, 0), (2, 0), (3, 0)], False), ([(5, 5), (6, 5)], False)]
+
+
+def test_simplify_polyline_drops_points_within_the_tolerance():
+    points = [(0, 0), (1, 0.01), (2, -0.01), (3, 0), (3, 1), (3, 2)]
+    
+    assert simplify_polyline(points, 0.05) == [(0, 0), (3, 0), (3, 2)]
+    assert simplify_polyline(points, 0.005) == points[:4] + points[5:]
+    assert simplify_polyline(points, 0) == points
+
+
+def test_simplify_closed_polyline_keeps_both_halves_anchored():
+    # A square with extra points on every edge
+    points = [(0, 0), (5, 0), (10, 0), (10, 5), (10, 10), (5, 10), (0, 10), (0, 5)]
+    
+    simplified = simplify_polyline(points, 0.1, closed=True)
+    
+    assert simplified == [(0, 0), (10, 0), (10, 10), (0, 10)]
+
+
+def test_reference_outline_chains_into_one_outer_loop_and_its_cutouts(reference_dir):
+    path = os.path.join(reference_dir, 'NIOKR.cad')
+    board = gencad.load(path)
+    
+    loops = board.outline_loops()
+    
+    assert all(loop['closed'] for loop in loops)
+    assert sum(len(loop['points']) for loop in loops) == len(board.board_outline)
+    assert [loop['kind'] for loop in loops].count('outer') == 1
+    areas = [polygon_area(loop['points']) for loop in loops]
+    assert all((area > 0) == (loop['kind'] == 'outer') for loop, area in zip(loops, areas))
+    mm_areas = [polygon_area(loop['points']) for loop in gencad.load(path, output_units='MM').outline_loops()]
+    assert mm_areas == pytest.approx([area * 25.4 ** 2 for area in areas])
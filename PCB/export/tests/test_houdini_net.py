@@ -0,0 +1,97 @@
+"""
+Tests for the net-indexed Houdini schema: pins sorted by net and the nets table.
+
+Both files are checked against the per-pin connection lists of the regular
+Houdini export of the same board.
+"""
+
+import csv
+import os
+import shutil
+
+import pytest
+
+import gencad
+from gencad.batch import process_file
+
+
+def _read(path):
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
+
+@pytest.fixture(params=['reference', 'synthetic'])
+def board(request, reference_dir, synthetic_board):
+    if request.param == 'reference':
+        return gencad.load(os.path.join(reference_dir, 'NIOKR.cad'))
+    return gencad.load(synthetic_board)
+
+
+def test_net_order_groups_pins_by_net_in_signal_order(board):
+    order, nets, connected = board.net_order()
+    pins = board.pins
+    
+    assert sorted(order) == list(range(len(pins)))
+    names = [name for name, _, _ in nets]
+    assert names == [signal for signal in board.signals if signal in names]
+    assert 'unconnected' not in names
+    position = 0
+    for name, first, count in nets:
+        rows = order[first:first + count]
+        assert (first, rows) == (position, sorted(rows))
+        assert {pins[row].signal for row in rows} == {name}
+        position += count
+    assert position == connected
+    assert all(pins[row].signal not in names for row in order[connected:])
+
+
+def test_net_schema_matches_the_connection_lists(board, tmp_path):
+    pins_path, nets_path = str(tmp_path / 'net_pins.csv'), str(tmp_path / 'nets.csv')
+    houdini_path = str(tmp_path / 'houdini.csv')
+    
+    board.export_houdini_net_csv(pins_path, nets_path)
+    board.export_houdini_csv(houdini_path)
+    
+    net_pins, nets, houdini = _read(pins_path), _read(nets_path), _read(houdini_path)
+    assert [int(row['id']) for row in net_pins] == list(range(len(houdini)))
+    assert sorted(int(row['pin_id']) for row in net_pins) == list(range(len(houdini)))
+    for row in net_pins:
+        pin = houdini[int(row['pin_id'])]
+        assert all(row[key] == pin[key] for key in ('x', 'y', 'z', 'component', 'pin_name', 'layer', 'signal'))
+    
+    # Every net is the contiguous id range of its table row, in net_index order
+    assert [int(net['net_id']) for net in nets] == list(range(len(nets)))
+    for net in nets:
+        first, last = int(net['first_id']), int(net['last_id'])
+        members = net_pins[first:last + 1]
+        assert last - first + 1 == int(net['pin_count'])
+        assert {row['signal'] for row in members} == {net['name']}
+        assert [(row['net_id'], int(row['net_index'])) for row in members] == \
+            [(net['net_id'], i) for i in range(len(members))]
+        
+        # The net range holds exactly the pins connected_ids lists for each member
+        ids = {int(row['pin_id']) for row in members}
+        for pin_id in ids:
+            connected = houdini[pin_id]['connected_ids'].strip('[]')
+            assert {int(other) for other in connected.split(',') if other} == ids - {pin_id}
+    
+    loose = net_pins[sum(int(net['pin_count']) for net in nets):]
+    assert all((row['net_id'], row['net_index']) == ('-1', '-1') for row in loose)
+    assert all(houdini[int(row['pin_id'])]['connected_ids'] == '[]' for row in loose)
+
+
+def test_houdini_schema_option_selects_the_outputs(reference_dir, tmp_path):
+    outputs = {}
+    for schema in ('connections', 'net', 'both'):
+        path = str(tmp_path / schema / 'NIOKR.cad')
+        os.mkdir(os.path.dirname(path))
+        shutil.copyfile(os.path.join(reference_dir, 'NIOKR.cad'), path)
+        summary = process_file(path, houdini_schema=schema)
+        assert summary['error'] is None
+        outputs[schema] = {os.path.basename(output) for output in summary['outputs']}
+    
+    net_files = {'NIOKR_houdini_net_pins.csv', 'NIOKR_houdini_nets.csv', 'NIOKR_houdini_net_pins_stages.csv'}
+    connection_files = {'NIOKR_houdini.csv', 'NIOKR_houdini_stages.csv'}
+    assert not net_files & outputs['connections'] and connection_files <= outputs['connections']
+    assert net_files <= outputs['net'] and not connection_files & outputs['net']
+    assert outputs['both'] == outputs['connections'] | net_files
@@ -0,0 +1,86 @@
+"""
+Tests for the sections parsed on first access.
+"""
+
+import os
+
+import pytest
+
+import gencad
+from gencad.parser import LAZY_SECTIONS
+
+ROUTES = """$TRACKS
+TRACK "T10" 0.01
+$ENDTRACKS
+
+$ROUTES
+ROUTE "GND"
+TRACK "T10"
+LAYER TOP
+LINE 1.0 2.0 1.5 2.0
+VIA "PAD1" 1.5 2.0 ALL 0.012
+LAYER BOTTOM
+LINE 1.5 2.0 1.5 3.0
+$ENDROUTES
+"""
+
+
+@pytest.fixture
+def routed_board(tmp_path, reference_dir):
+    with open(os.path.join(reference_dir, 'NIOKR.cad')) as f:
+        text = f.read()
+    path = tmp_path / 'routed.cad'
+    path.write_text(text.replace('$TRACKS\n$ENDTRACKS\n\n$ROUTES\n$ENDROUTES\n', ROUTES))
+    return str(path)
+
+
+def test_lazy_sections_are_only_parsed_on_first_access(routed_board, monkeypatch):
+    calls = []
+    parse_pad_start = gencad.GencadParser._parse_pad_start
+    monkeypatch.setattr(gencad.GencadParser, '_parse_pad_start',
+                        lambda self, rest: calls.append(rest) or parse_pad_start(self, rest))
+    board = gencad.load(routed_board)
+    
+    assert [getattr(board, attr) for attr in LAZY_SECTIONS.values()] == [None] * len(LAZY_SECTIONS)
+    assert set(LAZY_SECTIONS) <= set(board.section_offsets)
+    assert calls == []
+    
+    pads = board.pads
+    
+    assert len(calls) == len(pads) == 8
+    assert pads['P1'] == {'shape': 'ROUND', 'drill': 0.0492126, 'geometry': [('CIRCLE', (0.0, 0.0, 0.0492126))]}
+    assert board.pads is pads and len(calls) == 8
+    assert board._padstacks is None
+
+
+def test_lazy_sections_read_their_byte_ranges(routed_board):
+    board = gencad.load(routed_board)
+    
+    assert board.tracks == {'T10': 0.01}
+    route = board.routes['GND']
+    assert [(segment['layer'], segment['track'], segment['coords']) for segment in route['segments']] == [
+        ('TOP', 'T10', (1.0, 2.0, 1.5, 2.0)), ('BOTTOM', 'T10', (1.5, 2.0, 1.5, 3.0))]
+    assert route['vias'] == [{'padstack': 'PAD1', 'x': 1.5, 'y': 2.0, 'layer': 'ALL', 'drill': 0.012}]
+    assert board.padstacks['PAD1']['drill'] == 0.0492126
+    assert board.devices['DEV_Diode_SMD:D_SOD-123'] == {'part': 'Diode', 'package': 'Diode_SMD:D_SOD-123'}
+
+
+def test_requested_sections_are_parsed_eagerly(routed_board):
+    board = gencad.load(routed_board, sections=('header', 'board', 'routes'))
+    
+    assert board._routes is not None and 'GND' in board._routes
+    assert board._pads is None
+    assert len(board.board_outline) > 0
+    assert (len(board.shapes), len(board.pins)) == (0, 0)
+
+
+def test_lazy_section_access_before_parse_indexes_the_file(routed_board):
+    board = gencad.GencadParser(routed_board)
+    
+    assert board.tracks == {'T10': 0.01}
+    assert len(board.pins) == 0
+
+
+def test_unknown_section_is_rejected(routed_board):
+    with pytest.raises(ValueError):
+        gencad.load(routed_board, sections=('HEADER', 'VIAS'))
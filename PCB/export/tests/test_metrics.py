@@ -0,0 +1,65 @@
+"""
+Tests for the per-net wirelength metrics.
+"""
+
+import os
+
+import pytest
+
+import gencad
+from gencad.metrics import _group_numpy, _group_scalar, net_metrics
+
+
+class _Board:
+    """
+    The parts of a parsed board that net_metrics reads.
+    """
+    
+    def __init__(self, pins, signals):
+        self.pins = pins
+        self.signals = signals
+
+
+PIN_ROWS = [
+    ('U1', '1', 0.0, 0.0, 'TOP', 'A'),
+    ('U2', '1', 3.0, 0.0, 'TOP', 'A'),
+    ('U3', '1', 3.0, 4.0, 'TOP', 'A'),
+    ('U1', '2', 0.0, 0.0, 'TOP', 'B'),
+    ('U2', '2', 0.0, 1.0, 'BOTTOM', 'B'),
+    ('U3', '2', 7.0, 7.0, 'TOP', 'C'),
+    ('U3', 'M', 9.0, 9.0, 'TOP', 'unconnected'),
+]
+
+
+def test_net_metrics_rows_and_totals(make_pins):
+    board = _Board(make_pins(PIN_ROWS), ['A', 'B', 'C', 'EMPTY', 'unconnected'])
+    
+    rows, totals = net_metrics(board)
+    
+    assert [row['signal'] for row in rows] == ['A', 'B', 'C']
+    a, b, c = rows
+    assert (a['pin_count'], a['width'], a['height'], a['hpwl'], a['mst_length']) == (3, 3.0, 4.0, 7.0, 7.0)
+    assert (b['layer_count'], b['layers'], b['mst_length']) == (2, 'BOTTOM|TOP', 1.0)
+    assert (c['pin_count'], c['hpwl'], c['mst_length']) == (1, 0.0, 0.0)
+    assert totals == {'nets': 3, 'routed_nets': 2, 'pins': 6, 'hpwl': 8.0, 'mst_length': 8.0, 'max_pin_count': 3,
+                      'multi_layer_nets': 1}
+
+
+def test_numpy_grouping_matches_the_scalar_grouping(make_pins):
+    np = pytest.importorskip('numpy')
+    pins = make_pins(PIN_ROWS * 3)
+    
+    assert _group_numpy(np, pins) == _group_scalar(pins)
+
+
+def test_metrics_of_the_reference_board_agree_across_units(reference_dir):
+    path = os.path.join(reference_dir, 'NIOKR.cad')
+    
+    rows, totals = net_metrics(gencad.load(path))
+    mm_rows, mm_totals = net_metrics(gencad.load(path, output_units='MM'))
+    
+    assert totals['nets'] == len(rows) == len(mm_rows)
+    assert totals['pins'] == sum(row['pin_count'] for row in rows)
+    assert [row['signal'] for row in rows] == [row['signal'] for row in mm_rows]
+    assert mm_totals['hpwl'] == pytest.approx(totals['hpwl'] * 25.4)
+    assert mm_totals['mst_length'] == pytest.approx(totals['mst_length'] * 25.4)
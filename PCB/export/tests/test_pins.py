@@ -0,0 +1,91 @@
+"""
+Tests for the pin table and its spatial index queries.
+"""
+
+import os
+import math
+
+import pytest
+
+import gencad
+from gencad.pins import PinSpatialIndex
+
+
+def test_pin_table_interns_strings_and_decodes_rows(make_pins):
+    pins = make_pins([('U1', '1', 1.0, 2.0, 'TOP', 'GND'), ('U1', '2', 3.0, 4.0, 'TOP', 'VCC')])
+    
+    assert len(pins) == 2
+    assert pins.component_ids[0] == pins.component_ids[1]
+    assert pins.column('signal') == ['GND', 'VCC']
+    assert dict(pins[1]) == {'id': 1, 'component': 'U1', 'pin_name': '2', 'x': 3.0, 'y': 4.0, 'layer': 'TOP',
+                             'signal': 'VCC'}
+    assert pins[-1].pin_name == '2'
+    assert pins.string_id('missing') is None
+
+
+def test_query_radius_returns_sorted_pins_on_the_layer(make_pins):
+    pins = make_pins([
+        ('U1', '1', 0.0, 0.0, 'TOP', 'A'),
+        ('U1', '2', 1.0, 0.0, 'TOP', 'B'),
+        ('U1', '3', 0.0, 2.5, 'TOP', 'C'),
+        ('U2', '1', 0.5, 0.0, 'BOTTOM', 'A'),
+    ])
+    index = PinSpatialIndex(pins, cell_size=0.7)
+    
+    assert index.query_radius(0.1, 0.0, 1.0, layer='TOP') == [(0.1, 0), (0.9, 1)]
+    assert [row for _, row in index.query_radius(0.0, 0.0, 1.0)] == [0, 3, 1]
+    assert index.query_radius(0.0, 0.0, 1.0, layer='INNER') == []
+
+
+def test_nearest_matches_a_brute_force_search(make_pins):
+    points = [(x * 0.37 % 5, x * 0.91 % 7) for x in range(60)]
+    pins = make_pins([('U1', str(i), x, y, 'TOP', 'N%d' % i) for i, (x, y) in enumerate(points)])
+    index = PinSpatialIndex(pins)
+    
+    for qx, qy in ((0.0, 0.0), (2.5, 3.5), (10.0, -4.0)):
+        expected = sorted((math.hypot(x - qx, y - qy), i) for i, (x, y) in enumerate(points))[:3]
+        found = index.nearest(qx, qy, k=3)
+        assert [row for _, row in found] == [row for _, row in expected]
+        assert [distance for distance, _ in found] == pytest.approx([distance for distance, _ in expected])
+
+
+def test_clearance_violations_skip_same_net_and_own_unconnected_pins(make_pins):
+    pins = make_pins([
+        ('U1', '1', 0.0, 0.0, 'TOP', 'A'),
+        ('U1', '2', 0.2, 0.0, 'TOP', 'A'),
+        ('U1', '3', 0.0, 0.3, 'TOP', 'B'),
+        ('U1', 'M', 0.1, 0.1, 'TOP', 'unconnected'),
+        ('U2', 'M', 5.0, 5.0, 'TOP', 'unconnected'),
+        ('U3', 'M', 5.1, 5.0, 'TOP', 'unconnected'),
+        ('U4', '1', 0.0, 0.1, 'BOTTOM', 'C'),
+    ])
+    index = PinSpatialIndex(pins)
+    
+    violations = index.clearance_violations(0.5)
+    
+    assert [(a, b) for a, b, _ in violations] == [(0, 2), (1, 2), (4, 5)]
+    assert violations[0][2] == 0.3
+    assert index.clearance_violations(0) == []
+
+
+def test_clearance_violations_match_a_brute_force_search_on_the_reference_board(reference_dir):
+    board = gencad.load(os.path.join(reference_dir, 'NIOKR.cad'))
+    pins = board.pins
+    min_dist = 0.1
+    
+    expected = []
+    for a in range(len(pins)):
+        for b in range(a + 1, len(pins)):
+            first, second = pins[a], pins[b]
+            if first.layer != second.layer:
+                continue
+            if first.signal == second.signal != 'unconnected':
+                continue
+            if first.component == second.component and 'unconnected' in (first.signal, second.signal):
+                continue
+            distance = math.hypot(pins.x_nm[a] - pins.x_nm[b], pins.y_nm[a] - pins.y_nm[b]) / pins.nm_per_unit
+            if distance < min_dist:
+                expected.append((a, b, distance))
+    
+    assert len(expected) > 1
+    assert board.spatial_index().clearance_violations(min_dist) == expected
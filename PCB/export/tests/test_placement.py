@@ -0,0 +1,32 @@
+"""
+Tests for the NumPy and pure Python pin placement paths.
+"""
+
+import os
+
+import pytest
+
+import gencad
+from gencad import parser
+
+
+def _place(path, monkeypatch, min_placements):
+    monkeypatch.setattr(parser, 'NUMPY_MIN_PLACEMENTS', min_placements)
+    return gencad.load(path)
+
+
+@pytest.mark.parametrize('board', ['synthetic', 'reference'])
+def test_numpy_placement_matches_the_scalar_placement(board, synthetic_board, reference_dir, monkeypatch):
+    pytest.importorskip('numpy')
+    path = synthetic_board if board == 'synthetic' else os.path.join(reference_dir, 'NIOKR.cad')
+    
+    vectorized = _place(path, monkeypatch, 0)
+    scalar = _place(path, monkeypatch, float('inf'))
+    
+    assert vectorized._numpy is not None and scalar._numpy is None
+    assert len(vectorized.pins) == len(scalar.pins) > 0
+    assert vectorized.pins.x_nm == scalar.pins.x_nm
+    assert vectorized.pins.y_nm == scalar.pins.y_nm
+    for column in ('component', 'pin_name', 'layer', 'signal'):
+        assert vectorized.pins.column(column) == scalar.pins.column(column)
+    assert vectorized.pin_index == scalar.pin_index
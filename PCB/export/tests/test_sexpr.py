@@ -0,0 +1,58 @@
+"""
+Tests for the streaming S-expression reader.
+"""
+
+import io
+
+import pytest
+
+from gencad.sexpr import CLOSE, OPEN, child, children, loads, read_list, skip_list, tokenize
+
+
+def test_loads_builds_nested_lists_and_joins_quoted_atoms():
+    tree = loads('(pcb "my board" (net "L-S5"-2 (pins A-1 "B-(2)")) (net GND))')
+    
+    assert tree == ['pcb', 'my board', ['net', 'L-S5-2', ['pins', 'A-1', 'B-(2)']], ['net', 'GND']]
+    assert [node[1] for node in children(tree, 'net')] == ['L-S5-2', 'GND']
+    assert child(tree, 'pins') is None
+
+
+def test_quoted_parentheses_are_atoms_not_delimiters():
+    tokens = list(tokenize(io.StringIO('(a ")" "(")')))
+    
+    assert tokens == [OPEN, 'a', ')', '(', CLOSE]
+
+
+def test_string_quote_directive_changes_the_quote_character():
+    text = "(pcb (parser (string_quote ')) (net 'A B' \"x\"))"
+    
+    assert loads(text) == ['pcb', ['parser', ['string_quote', "'"]], ['net', 'A B', '"x"']]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 7])
+def test_tokens_split_across_chunks(chunk_size):
+    text = '(pcb "long quoted name" (string_quote \') (x \'y z\' 12.5))'
+    
+    tokens = list(tokenize(io.StringIO(text), chunk_size=chunk_size))
+    
+    assert tokens == list(tokenize(io.StringIO(text)))
+    assert 'long quoted name' in tokens and 'y z' in tokens
+
+
+def test_skip_list_consumes_a_nested_list():
+    tokens = tokenize(io.StringIO('(a (b (c)) d) (e)'))
+    assert next(tokens) is OPEN
+    
+    skip_list(tokens)
+    
+    assert next(tokens) is OPEN
+    assert read_list(tokens) == ['e']
+
+
+def test_malformed_input_raises_value_error():
+    with pytest.raises(ValueError):
+        loads('(a (b)')
+    with pytest.raises(ValueError):
+        loads('a b')
+    with pytest.raises(ValueError):
+        loads('(a "unterminated)')
@@ -0,0 +1,110 @@
+"""
+Tests for the pin stage pipeline and swap_diode_pins.py.
+"""
+
+import json
+import logging
+import os
+import shutil
+
+import pytest
+
+import gencad
+from gencad.stages import (
+    ExcludeComponents, OffsetPins, PinPipeline, RemapLayers, SwapDiodePins, applied_stages_path, load_stages,
+    make_stage, parse_stage, read_applied_stages
+)
+from swap_diode_pins import swap_diode_pins
+
+
+@pytest.fixture
+def board_copy(tmp_path, reference_dir):
+    path = str(tmp_path / 'NIOKR.cad')
+    shutil.copyfile(os.path.join(reference_dir, 'NIOKR.cad'), path)
+    return path
+
+
+def _positions(board):
+    pins = board.pins
+    return {key: (pins.x_nm[row], pins.y_nm[row]) for key, row in board.pin_index.items()}
+
+
+def test_parse_stage_forms(tmp_path):
+    assert parse_stage('swap-diodes').spec() == ('swap-diodes', 'L-D*')
+    assert parse_stage('remap-layers:*:TOP=F.Cu,BOTTOM=B.Cu').mapping == {'TOP': 'F.Cu', 'BOTTOM': 'B.Cu'}
+    assert parse_stage('offset:U*:10,-5').spec() == ('offset', 'U*', 10.0, -5.0)
+    with pytest.raises(ValueError):
+        parse_stage('exclude:*:1')
+    with pytest.raises(ValueError):
+        make_stage({'stage': 'rotate'})
+    config = tmp_path / 'stages.json'
+    config.write_text(json.dumps([{'stage': 'exclude', 'pattern': 'H*'}, {'stage': 'offset', 'dx': 1}]))
+    assert [stage.spec() for stage in load_stages(str(config))] == [('exclude', 'H*'), ('offset', '*', 1.0, 0.0)]
+
+
+def test_pipeline_drops_duplicate_stages_and_records_what_changed():
+    pipeline = PinPipeline([SwapDiodePins(), SwapDiodePins('L-D*'), RemapLayers(mapping={'TOP': 'F.Cu'})])
+    
+    pins = pipeline.apply('L-D1', [['2', 20, 0, 'TOP'], ['1', 10, 0, 'BOTTOM']])
+    
+    assert len(pipeline.stages) == 2
+    assert pins == [['1', 20, 0, 'BOTTOM'], ['2', 10, 0, 'F.Cu']]
+    assert pipeline.applied == {'L-D1': 'swap-diodes[L-D*]|remap-layers[*]'}
+    assert pipeline.apply('L-D2', [['1', 0, 0, 'TOP']], skip={'remap-layers[*]'}) == [['1', 0, 0, 'TOP']]
+
+
+def test_default_stage_swaps_the_diode_pins_of_the_reference_board(board_copy):
+    swapped, unswapped = gencad.load(board_copy), gencad.load(board_copy, stages=[])
+    before, after = _positions(unswapped), _positions(swapped)
+    diodes = {component for component, _ in before if component.startswith('L-D')}
+    
+    assert swapped.pipeline.stages[0].count == len(diodes) == 21
+    for diode in diodes:
+        assert after[diode, '1'] == before[diode, '2'] and after[diode, '2'] == before[diode, '1']
+    assert {key: value for key, value in after.items() if key[0] not in diodes} == \
+        {key: value for key, value in before.items() if key[0] not in diodes}
+
+
+def test_offset_is_in_the_output_units_and_exact(board_copy):
+    board = gencad.load(board_copy, stages=[OffsetPins('L-S*', 1, -0.5), ExcludeComponents('H*'),
+                                            RemapLayers(mapping={'TOP': 'F.Cu'})], output_units='MM')
+    plain = gencad.load(board_copy, stages=[], output_units='MM')
+    before, after = _positions(plain), _positions(board)
+    
+    moved = [key for key in before if key[0].startswith('L-S')]
+    assert moved and all(after[key] == (before[key][0] + 1000000, before[key][1] - 500000) for key in moved)
+    assert not any(component.startswith('H') for component in board.pins.column('component'))
+    assert set(board.pins.column('layer')) == {'F.Cu'}
+
+
+@pytest.mark.parametrize('units', [None, 'MM'])
+def test_swap_diode_pins_matches_the_stages_of_the_parser(board_copy, tmp_path, units):
+    staged = gencad.load(board_copy, output_units=units)
+    staged.export_houdini_csv(str(tmp_path / 'staged.csv'))
+    unstaged = gencad.load(board_copy, stages=[], output_units=units)
+    unstaged.export_houdini_csv(str(tmp_path / 'unstaged.csv'))
+    
+    pipeline = swap_diode_pins(str(tmp_path / 'unstaged.csv'), str(tmp_path / 'fixed.csv'), units=units or 'INCH')
+    
+    assert pipeline.stages[0].count == 21
+    assert (tmp_path / 'fixed.csv').read_bytes() == (tmp_path / 'staged.csv').read_bytes()
+    assert read_applied_stages(applied_stages_path(str(tmp_path / 'fixed.csv'))) == \
+        read_applied_stages(applied_stages_path(str(tmp_path / 'staged.csv')))
+
+
+def test_swap_diode_pins_skips_stages_recorded_in_the_sidecar(board_copy, tmp_path, caplog):
+    board = gencad.load(board_copy)
+    board.export_houdini_csv(str(tmp_path / 'staged.csv'))
+    
+    pipeline = swap_diode_pins(str(tmp_path / 'staged.csv'), str(tmp_path / 'again.csv'))
+    
+    assert pipeline.stages[0].count == 0
+    assert (tmp_path / 'again.csv').read_bytes() == (tmp_path / 'staged.csv').read_bytes()
+    
+    os.remove(applied_stages_path(str(tmp_path / 'staged.csv')))
+    with caplog.at_level(logging.WARNING, logger='GencadParser'):
+        pipeline = swap_diode_pins(str(tmp_path / 'staged.csv'), str(tmp_path / 'twice.csv'))
+    assert pipeline.stages[0].count == 21
+    assert 'staged_stages.csv not found' in caplog.text
+    with pytest.raises(ValueError):
+        swap_diode_pins(str(tmp_path / 'twice.csv'), str(tmp_path / 'twice.csv'))
@@ -0,0 +1,68 @@
+"""
+Tests for the shape transform cache used by pin placement.
+"""
+
+import math
+
+import gencad
+from gencad.cache import TransformCache
+
+
+def test_transform_cache_evicts_the_least_recently_used_entry():
+    cache = TransformCache(max_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    
+    cache.put('c', 3)
+    
+    assert len(cache) == 2
+    assert (cache.get('b'), cache.get('a'), cache.get('c')) == (None, 1, 3)
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def _naive_positions(board):
+    """
+    Place every pin from scratch: mirror, rotate and translate, without any cache.
+    """
+    positions = []
+    for comp_name, comp in board.components.items():
+        angle = math.radians(comp.get('rotation', 0))
+        for pin in board.shapes[comp['shape']]['pins']:
+            x = -pin['x'] if comp.get('mirror_x') else pin['x']
+            y = -pin['y'] if comp.get('mirror_y') else pin['y']
+            x, y = x * math.cos(angle) - y * math.sin(angle), x * math.sin(angle) + y * math.cos(angle)
+            layer = pin.get('layer', 'TOP')
+            if comp.get('flip'):
+                layer = 'BOTTOM' if layer == 'TOP' else 'TOP'
+            scale = board.nm_per_file_unit
+            positions.append((comp_name, pin['name'], round((comp['x'] + x) * scale),
+                              round((comp['y'] + y) * scale), layer))
+    return positions
+
+
+def test_cached_placement_matches_placing_every_pin_from_scratch(synthetic_board):
+    board = gencad.load(synthetic_board, stages=[])
+    pins = board.pins
+    
+    placed = list(zip(pins.column('component'), pins.column('pin_name'), pins.x_nm, pins.y_nm,
+                      pins.column('layer')))
+    
+    assert placed == _naive_positions(board)
+    assert any(comp.get('mirror_x') and comp.get('rotation') for comp in board.components.values())
+    keys = {(comp['shape'], comp.get('rotation', 0), comp.get('mirror_x', False), comp.get('mirror_y', False),
+             comp.get('flip', False)) for comp in board.components.values()}
+    assert board.transform_cache.misses == len(keys) < len(board.components)
+    assert board.transform_cache.hits == len(board.components) - len(keys)
+
+
+def test_a_tiny_transform_cache_gives_the_same_pins(synthetic_board):
+    board = gencad.load(synthetic_board)
+    tiny = gencad.GencadParser(synthetic_board, transform_cache_size=1)
+    tiny.parse()
+    
+    assert len(tiny.transform_cache) == 1
+    assert tiny.transform_cache.misses > board.transform_cache.misses
+    assert tiny.pins.x_nm == board.pins.x_nm
+    assert tiny.pins.y_nm == board.pins.y_nm
+    assert tiny.pins.column('layer') == board.pins.column('layer')
@@ -0,0 +1,116 @@
+"""
+Tests for the integer nanometre pin coordinates and the output units derived from them.
+"""
+
+import csv
+import os
+import sys
+
+import pytest
+
+import gencad
+import swap_diode_pins
+from gencad.geometry import NM_PER_UNIT, nm_per_unit
+from gencad.pins import PinTable
+
+
+def test_nm_per_unit_supports_user_units():
+    assert nm_per_unit('INCH') == NM_PER_UNIT['INCH'] == 25400000
+    assert nm_per_unit('mm') == 1000000
+    assert nm_per_unit('USER 1000') == 25400
+    assert nm_per_unit('USERMM 100') == 10000
+    for units in ('FURLONG', 'USER', 'USER 0', 'USER x', ''):
+        with pytest.raises(ValueError):
+            nm_per_unit(units)
+
+
+@pytest.mark.parametrize('units, decimals', [('INCH', 7), ('MM', 6), ('MILS', 4), ('UM', 3)])
+def test_decimals_keep_file_values_and_the_nanometres_within_a_step(units, decimals):
+    pins = PinTable(NM_PER_UNIT[units])
+    step = NM_PER_UNIT[units] / 10 ** decimals
+    
+    assert pins.decimals == decimals
+    assert 1 <= step < 10
+    values = [round(n / 10 ** decimals, decimals) for n in (1, -7, 1234567, -98765432)]
+    assert [pins.from_nm(pins.to_nm(value)) for value in values] == values
+    assert all(abs(pins.to_nm(pins.from_nm(n)) - n) <= step / 2 for n in (1, -1, 12345, 987654321))
+
+
+def test_float_columns_are_derived_from_the_nanometre_columns():
+    pins = PinTable(NM_PER_UNIT['INCH'])
+    pins.append('J1', '1', 2540000, -1270001, 'TOP', 'A')
+    
+    assert (list(pins.x_nm), list(pins.y_nm)) == ([2540000], [-1270001])
+    assert (list(pins.x), list(pins.y)) == ([0.1], [-0.05])
+    
+    pins.nm_per_unit = NM_PER_UNIT['MM']
+    assert (list(pins.x), list(pins.y)) == ([2.54], [-1.270001])
+    assert list(pins.x_nm) == [2540000]
+
+
+def test_pin_row_setters_write_nanometres_and_refresh_the_floats():
+    pins = PinTable(NM_PER_UNIT['MM'])
+    pins.append('J1', '1', 0, 0, 'TOP', 'A')
+    assert pins[0].x == 0.0
+    
+    pins[0].x = 1.25
+    pins[0].y = -0.0000004
+    
+    assert (pins.x_nm[0], pins.y_nm[0]) == (1250000, 0)
+    assert (pins[0].x, pins.x[0], pins[0].y) == (1.25, 1.25, 0.0)
+
+
+def test_boards_in_every_unit_share_the_nanometre_coordinates(reference_dir, tmp_path):
+    path = os.path.join(reference_dir, 'NIOKR.cad')
+    boards = {units: gencad.load(path, output_units=units) for units in ('INCH', 'MM', 'UM')}
+    inch = boards['INCH']
+    
+    for units, board in boards.items():
+        assert (board.pin_units, board.pins.nm_per_unit) == (units, NM_PER_UNIT[units])
+        assert (board.pins.x_nm, board.pins.y_nm) == (inch.pins.x_nm, inch.pins.y_nm)
+        
+        # Exported coordinates convert back to the same nanometres, up to the last decimal
+        output = str(tmp_path / f'{units}_pins.csv')
+        board.export_houdini_csv(output)
+        with open(output, newline='') as f:
+            rows = list(csv.DictReader(f))
+        pins = board.pins
+        step = pins.nm_per_unit / 10 ** pins.decimals
+        assert len(rows) == len(pins)
+        for row, x_nm, y_nm in zip(rows, pins.x_nm, pins.y_nm):
+            assert abs(pins.to_nm(float(row['x'])) - x_nm) <= step / 2
+            assert abs(pins.to_nm(float(row['y'])) - y_nm) <= step / 2
+    
+    assert boards['MM'].bottom_z == pytest.approx(inch.bottom_z * 25.4)
+
+
+def test_swap_diode_pins_units_option(reference_dir, tmp_path, monkeypatch):
+    path = os.path.join(reference_dir, 'NIOKR.cad')
+    staged, unstaged, fixed = (str(tmp_path / name) for name in ('staged.csv', 'unstaged.csv', 'fixed.csv'))
+    gencad.load(path, output_units='MM').export_houdini_csv(staged)
+    gencad.load(path, stages=[], output_units='MM').export_houdini_csv(unstaged)
+    
+    monkeypatch.setattr(sys, 'argv', ['swap_diode_pins.py', unstaged, fixed, '--units', 'mm'])
+    swap_diode_pins.main()
+    
+    with open(staged, 'rb') as a, open(fixed, 'rb') as b:
+        assert a.read() == b.read()
+    
+    monkeypatch.setattr(sys, 'argv', ['swap_diode_pins.py', unstaged, fixed, '--units', 'FURLONG'])
+    with pytest.raises(SystemExit):
+        swap_diode_pins.main()
+
+
+def test_swap_diode_pins_keeps_the_text_of_unchanged_coordinates(tmp_path):
+    source, output = str(tmp_path / 'pins.csv'), str(tmp_path / 'fixed.csv')
+    with open(source, 'w', newline='') as f:
+        f.write("component,pin_name,x,y,layer\n"
+                "L-D1,1,0.10,2.000,TOP\n"
+                "L-D1,2,0.20,2.000,TOP\n"
+                "R1,1,1.5000,-0.25,TOP\n")
+    
+    swap_diode_pins.swap_diode_pins(source, output, units='MM')
+    
+    with open(output, newline='') as f:
+        rows = [(row['component'], row['pin_name'], row['x'], row['y']) for row in csv.DictReader(f)]
+    assert rows == [('L-D1', '1', '0.2', '2.000'), ('L-D1', '2', '0.1', '2.000'), ('R1', '1', '1.5000', '-0.25')]
@@ -0,0 +1,95 @@
+"""
+Tests for watch mode and the atomic, write-if-changed outputs.
+"""
+
+import os
+import shutil
+
+import pytest
+
+import gencad
+from gencad import batch
+from gencad.stages import default_stages
+
+
+@pytest.fixture
+def board_copy(tmp_path, reference_dir):
+    path = str(tmp_path / 'NIOKR.cad')
+    shutil.copyfile(os.path.join(reference_dir, 'NIOKR.cad'), path)
+    return path
+
+
+def test_unchanged_outputs_are_not_rewritten(board_copy, tmp_path):
+    first = batch.process_file(board_copy)
+    pins_path = str(tmp_path / 'NIOKR_pins.csv')
+    os.utime(pins_path, ns=(1000, 1000))
+    
+    second = batch.process_file(board_copy, topology='mst')
+    
+    assert sorted(first['changed_outputs']) == sorted(first['outputs'])
+    assert second['changed_outputs'] == [str(tmp_path / 'NIOKR_connections.csv')]
+    assert os.stat(pins_path).st_mtime_ns == 1000
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+
+
+def test_failed_export_keeps_the_previous_output(board_copy, tmp_path):
+    board = gencad.load(board_copy)
+    output = tmp_path / 'out.csv'
+    output.write_text('previous\n')
+    
+    with pytest.raises(RuntimeError):
+        with board._open_output(str(output)) as f:
+            f.write('partial')
+            raise RuntimeError('export failed')
+    
+    assert output.read_text() == 'previous\n'
+    assert sorted(os.listdir(tmp_path)) == ['NIOKR.cad', 'out.csv']
+    assert board.changed_outputs == []
+
+
+def test_stage_counts_start_from_zero_on_every_run(board_copy):
+    stages = default_stages()
+    
+    runs = [batch.process_file(board_copy, stages=stages) for _ in range(2)]
+    
+    assert [run['profile']['counters']['swap-diodes[L-D*]'] for run in runs] == [21, 21]
+    assert stages[0].count == 0
+
+
+def test_watch_only_reprocesses_settled_content_changes(board_copy, monkeypatch, capsys):
+    with open(board_copy) as f:
+        text = f.read()
+    processed = []
+    run = batch.process_file
+    
+    def process_file(input_file, **options):
+        processed.append(input_file)
+        return run(input_file, **options)
+    
+    def edit():
+        with open(board_copy, 'w') as f:
+            f.write(text.replace('"Net-(L-D0-A)"', '"Net-(L-D0-K)"'))
+    
+    # Each poll is followed by one of these edits, made while the watcher sleeps
+    edits = [
+        lambda: os.utime(board_copy, ns=(1000, 1000)),  # Touched, same content
+        lambda: None,  # Settled: hashed, not processed
+        edit,
+        lambda: None,  # Settled: processed
+    ]
+    
+    def sleep(interval):
+        if not edits:
+            raise KeyboardInterrupt
+        edits.pop(0)()
+    
+    monkeypatch.setattr(batch, 'process_file', process_file)
+    monkeypatch.setattr(batch.time, 'sleep', sleep)
+    
+    batch.watch([board_copy], interval=0)
+    
+    assert processed == [board_copy, board_copy]
+    output = capsys.readouterr().out
+    assert output.startswith('Watching 1 file(s)') and output.rstrip().endswith('Stopped watching')
+    with open(os.path.join(os.path.dirname(board_copy), 'NIOKR_netlist.csv')) as f:
+        assert 'Net-(L-D0-K)' in f.read()